@@ -0,0 +1,447 @@
+"""Static content for the Streamlit UI: CSS, pipeline diagram and agent directory.
+
+Kept out of app.py so the large literals are built once per process on import
+instead of on every Streamlit rerun.
+"""
+from html import escape
+
+# ── Custom CSS ────────────────────────────────────────────────────────────────
+APP_CSS = """
+<style>
+  .main .block-container { max-width: 1100px; padding-top: 1.5rem; }
+  .invest-badge, .watch-badge, .pass-badge, .na-badge {
+      padding:14px 40px; border-radius:14px;
+      font-size:2.2rem; font-weight:900; letter-spacing:0.08em;
+      display:inline-block; margin-bottom:6px;
+  }
+  .invest-badge { background:#dcfce7; color:#15803d; }
+  .watch-badge  { background:#fef3c7; color:#b45309; }
+  .pass-badge   { background:#fee2e2; color:#b91c1c; }
+  .na-badge     { background:#f1f5f9; color:#64748b; }
+  .agent-grid { display:grid; grid-template-columns:repeat(2, minmax(0, 1fr)); gap:0 16px; }
+  .agent-card {
+      background:#f8fafc; border:1px solid #e2e8f0;
+      border-radius:10px; padding:14px 16px; margin-bottom:10px;
+  }
+  .agent-card details { margin-top:8px; font-size:0.88rem; }
+  .agent-card summary, .agent-sources summary { cursor:pointer; color:#334155; }
+  .agent-sources { font-size:0.88rem; margin:4px 0 12px; }
+  .source-tag {
+      display:inline-block; background:#e0e7ff; color:#3730a3;
+      border-radius:99px; padding:2px 10px; font-size:0.75rem;
+      margin:2px 2px 2px 0;
+  }
+  .lang-toggle { font-size:0.8rem !important; padding:3px 10px !important; }
+</style>
+"""
+
+# ── Pipeline graphviz diagram ─────────────────────────────────────────────────
+PIPELINE_GRAPH = """
+digraph pipeline {
+    rankdir=LR;
+    node [fontname="Helvetica" fontsize=9 style="rounded,filled" shape=box margin=0.15];
+    edge [arrowsize=0.6 color="#94a3b8"];
+
+    START [label="START" shape=circle fillcolor="#6366f1" fontcolor=white
+           style=filled width=0.45 height=0.45 fontsize=8];
+    END   [label="END"   shape=circle fillcolor="#059669" fontcolor=white
+           style=filled width=0.45 height=0.45 fontsize=8];
+
+    inp [label="Input\nProcessor" fillcolor="#e0e7ff" color="#6366f1" fontcolor="#3730a3"];
+
+    subgraph cluster_p1 {
+        label="Phase 1  —  Parallel (6 agents)" fontsize=9 color="#2563eb"
+        fillcolor="#eff6ff" style="rounded,filled";
+        mkt  [label="Market\nAnalysis"   fillcolor="#bfdbfe" color="#1d4ed8" fontcolor="#1e3a8a"];
+        comp [label="Competitor\nAnalysis" fillcolor="#bfdbfe" color="#1d4ed8" fontcolor="#1e3a8a"];
+        fin  [label="Financial\nAnalysis"  fillcolor="#bfdbfe" color="#1d4ed8" fontcolor="#1e3a8a"];
+        tec  [label="Tech\nAnalysis"      fillcolor="#bfdbfe" color="#1d4ed8" fontcolor="#1e3a8a"];
+        leg  [label="Legal &\nRegulatory" fillcolor="#bfdbfe" color="#1d4ed8" fontcolor="#1e3a8a"];
+        team [label="Team\nAnalysis"      fillcolor="#bfdbfe" color="#1d4ed8" fontcolor="#1e3a8a"];
+    }
+
+    cp1 [label="👤 Human\nReview 1" fillcolor="#fce7f3" color="#db2777" fontcolor="#831843"
+         shape=octagon fontsize=8];
+
+    subgraph cluster_p2 {
+        label="Phase 2  —  Synthesis" fontsize=9 color="#7c3aed"
+        fillcolor="#f5f3ff" style="rounded,filled";
+        ras  [label="R&A\nSynthesis" fillcolor="#ddd6fe" color="#7c3aed" fontcolor="#4c1d95"];
+        risk [label="Risk\nAssessment" fillcolor="#ddd6fe" color="#7c3aed" fontcolor="#4c1d95"];
+        si   [label="Strategic\nInsight" fillcolor="#ddd6fe" color="#7c3aed" fontcolor="#4c1d95"];
+    }
+
+    cp2 [label="👤 Human\nReview 2" fillcolor="#fce7f3" color="#db2777" fontcolor="#831843"
+         shape=octagon fontsize=8];
+
+    subgraph cluster_p3 {
+        label="Phase 3  —  Review & Critique" fontsize=9 color="#d97706"
+        fillcolor="#fffbeb" style="rounded,filled";
+        rev  [label="Review\nAgent"    fillcolor="#fde68a" color="#b45309" fontcolor="#78350f"];
+        crit [label="Critique\nAgent"  fillcolor="#fde68a" color="#b45309" fontcolor="#78350f"];
+        ddq  [label="DD\nQuestions"    fillcolor="#fde68a" color="#b45309" fontcolor="#78350f"];
+    }
+
+    router [label="Critique\nRouter" fillcolor="#a7f3d0" color="#059669" fontcolor="#064e3b"
+            shape=diamond fontsize=8];
+
+    cp3 [label="👤 Human\nReview 3" fillcolor="#fce7f3" color="#db2777" fontcolor="#831843"
+         shape=octagon fontsize=8];
+
+    subgraph cluster_p4 {
+        label="Phase 4  —  Report" fontsize=9 color="#1e40af"
+        fillcolor="#eff6ff" style="rounded,filled";
+        rstr [label="Report\nStructure" fillcolor="#bfdbfe" color="#1d4ed8" fontcolor="#1e3a8a"];
+        rwrt [label="Report\nWriter"    fillcolor="#bfdbfe" color="#1d4ed8" fontcolor="#1e3a8a"];
+    }
+
+    START -> inp;
+    inp -> mkt; inp -> comp; inp -> fin; inp -> tec; inp -> leg; inp -> team;
+    mkt -> cp1; comp -> cp1; fin -> cp1; tec -> cp1; leg -> cp1; team -> cp1;
+    cp1 -> ras; cp1 -> risk;
+    ras -> si; risk -> si;
+    si -> cp2;
+    cp2 -> rev;
+    rev -> crit;
+    crit -> router;
+    router -> ddq [label=" pass " fontsize=7 color="#059669"];
+    ddq -> cp3;
+    cp3 -> rstr;
+    rstr -> rwrt;
+    rwrt -> END;
+
+    // Feedback loop edges (dashed)
+    edge [style=dashed color="#dc2626" arrowsize=0.5];
+    router -> rev  [label="conditional\n(selective rerun)" fontsize=6 color="#dc2626"];
+    router -> mkt  [label="fail\n(full restart)" fontsize=6 color="#dc2626"];
+}
+"""
+
+# ── Agent directory data (English) ────────────────────────────────────────────
+AGENT_PHASES = [
+    {
+        "label": "Phase 1 — Parallel Research",
+        "color": "#1d4ed8",
+        "bg": "#eff6ff",
+        "description": "6 specialist agents run **simultaneously**. Each independently researches a different dimension of the company. **Human review required** before proceeding to synthesis.",
+        "agents": [
+            {
+                "icon": "🌍",
+                "name": "Market Analysis",
+                "role": "TAM/SAM/SOM for ALL markets, CAGR, trends, and market drivers.",
+                "methodology": [
+                    "Estimates TAM/SAM/SOM for each business line with specific dollar figures",
+                    "Calculates historical and projected 5-year CAGR",
+                    "Maps key market trends, drivers, and geographic breakdown",
+                    "Identifies macro tailwinds/headwinds and demand-side dynamics",
+                    "Cross-verifies all figures with 3+ sources",
+                ],
+                "sources": ["Web search", "News search", "Yahoo Finance", "Google Trends", "FRED macroeconomic data"],
+            },
+            {
+                "icon": "🏢",
+                "name": "Competitor Analysis",
+                "role": "Competitor ID across all business lines, comparison matrix.",
+                "methodology": [
+                    "Identifies direct and indirect competitors across all business lines",
+                    "Builds comparison matrix (product, pricing, financials, market share, talent)",
+                    "Analyzes market share trends and competitive positioning",
+                    "Assesses competitive gaps and pricing power dynamics",
+                    "Includes actual revenue/market cap for public competitors",
+                ],
+                "sources": ["Web search", "News search", "Yahoo Finance", "Google Trends"],
+            },
+            {
+                "icon": "💰",
+                "name": "Financial Analysis",
+                "role": "5-year financials, ratios, cash flow + DCF/Market-based/Asset-based valuation.",
+                "methodology": [
+                    "Pulls live financial data: revenue, margins, balance sheet, cash flow",
+                    "Performs DCF with explicit WACC and terminal growth assumptions",
+                    "Runs market-based valuation (P/E, EV/EBITDA, P/S) with domestic + international comps",
+                    "Calculates fair value range (low/mid/high) with methodology",
+                    "Flags accounting red flags and revenue concentration risks",
+                ],
+                "sources": ["Yahoo Finance (yfinance)", "SEC EDGAR (10-K, 10-Q)", "Web search", "Uploaded PDFs"],
+            },
+            {
+                "icon": "🔬",
+                "name": "Tech Analysis",
+                "role": "Core tech inventory, IP/patents, tech maturity vs. competitors.",
+                "methodology": [
+                    "Inventories core technologies powering each business line",
+                    "Assesses IP and patent portfolio (count, key patents, pending)",
+                    "Evaluates tech maturity and moat strength vs. competitors",
+                    "Reviews R&D investment levels and engineering capacity",
+                    "Translates technical details into investor-friendly language",
+                ],
+                "sources": ["Web search", "News search", "GitHub API", "USPTO PatentsView"],
+            },
+            {
+                "icon": "⚖️",
+                "name": "Legal & Regulatory",
+                "role": "Investment structure risks + business regulatory risks.",
+                "methodology": [
+                    "Evaluates investment structure risks (fund carry, exit, reputation)",
+                    "Reviews business regulatory compliance across jurisdictions",
+                    "Searches for active litigation, settlements, and enforcement actions",
+                    "Assesses IP risks, data privacy posture, and ESG exposure",
+                    "Flags corporate governance issues and related-party transactions",
+                ],
+                "sources": ["Web search", "News search", "USPTO PatentsView", "Uploaded PDFs"],
+            },
+            {
+                "icon": "👥",
+                "name": "Team Analysis",
+                "role": "Leadership profiles, capability analysis, departure history.",
+                "methodology": [
+                    "Profiles CEO/founder, C-suite, and key executives",
+                    "Assesses team capabilities vs. next growth phase requirements",
+                    "Reviews departure history and succession planning",
+                    "Evaluates board composition and advisory quality",
+                    "Surfaces culture signals from Glassdoor, press, and social media",
+                ],
+                "sources": ["Web search", "News search", "LinkedIn (via web)"],
+            },
+        ],
+    },
+    {
+        "label": "Phase 2 — Synthesis",
+        "color": "#7c3aed",
+        "bg": "#f5f3ff",
+        "description": "R&A Synthesis + Risk Assessment run **in parallel**, then Strategic Insight runs **sequentially** (needs both). **Human review required** before proceeding to critique.",
+        "agents": [
+            {
+                "icon": "📊",
+                "name": "R&A Synthesis",
+                "role": "Synthesizes Phase 1 into 3-5 core investment arguments + CDD/LDD/FDD scorecard.",
+                "methodology": [
+                    "Distills 6 reports into 3-5 core investment arguments ranked by conviction",
+                    "Builds attractiveness scorecard: CDD, LDD, FDD (each 1-10)",
+                    "Checks cross-report consistency and flags contradictions",
+                    "Identifies key findings and information gaps",
+                ],
+                "sources": ["All Phase 1 reports", "Web search", "Yahoo Finance"],
+            },
+            {
+                "icon": "⚠️",
+                "name": "Risk Assessment",
+                "role": "ALL risks with probability/impact/severity matrix + mitigation strategies.",
+                "methodology": [
+                    "Identifies risks across 6 categories: legal, business, financial, reputation, tech, operational",
+                    "Scores each risk: probability (1-5) × impact (1-5) = severity",
+                    "Proposes specific mitigation strategies with feasibility rating",
+                    "Determines overall risk level and risk-adjusted assessment",
+                ],
+                "sources": ["All Phase 1 reports", "Web search", "News search"],
+            },
+            {
+                "icon": "🎯",
+                "name": "Strategic Insight",
+                "role": "INVEST/WATCH/PASS decision + detailed rationale + synergy analysis.",
+                "methodology": [
+                    "Renders preliminary investment recommendation with detailed rationale",
+                    "Analyzes portfolio fit and strategic synergies",
+                    "Identifies key conditions that would change the recommendation",
+                    "Outlines investment timeline and exit strategy considerations",
+                    "Anti-bias: does NOT default to WATCH — decisive recommendation required",
+                ],
+                "sources": ["All Phase 1 + Phase 2 reports", "Web search", "Yahoo Finance"],
+            },
+        ],
+    },
+    {
+        "label": "Phase 3 — Review & Critique",
+        "color": "#b45309",
+        "bg": "#fffbeb",
+        "description": "Sequential: **Review** (verify claims) → **Critique** (score 5 criteria) → **DD Questions**. The Critique agent triggers a **feedback loop** if quality is insufficient (max 2 iterations). **Human review required** before generating the final report.",
+        "agents": [
+            {
+                "icon": "🔎",
+                "name": "Review Agent",
+                "role": "Source verification, quantitative accuracy, logical consistency.",
+                "methodology": [
+                    "Verifies material claims using live tool calls",
+                    "Checks quantitative accuracy of financial figures and market sizes",
+                    "Assesses qualitative backing and logical consistency",
+                    "Identifies stale data and cross-report inconsistencies",
+                    "Classifies claims as VERIFIED / UNVERIFIED / CONTRADICTED / STALE",
+                ],
+                "sources": ["Web search", "News search", "Yahoo Finance"],
+            },
+            {
+                "icon": "📋",
+                "name": "Critique Agent",
+                "role": "Scores 5 criteria (1-10): Logic, Completeness, Accuracy, Narrative Bias, Insight Effectiveness.",
+                "methodology": [
+                    "Scores Logic (1-10): Are investment arguments logically sound?",
+                    "Scores Completeness (1-10): Does the analysis cover all material dimensions?",
+                    "Scores Accuracy (1-10): Are facts and figures correct and current?",
+                    "Scores Narrative Bias (1-10): Is the analysis balanced and objective?",
+                    "Scores Insight Effectiveness (1-10): Does it provide actionable insights?",
+                    "Total >= 35 AND all >= 7: PASS | < 30 or 3+ items < 5: FAIL | Otherwise: CONDITIONAL (selective rerun)",
+                ],
+                "sources": ["All prior agent outputs (no tools — pure evaluation)"],
+            },
+            {
+                "icon": "❓",
+                "name": "DD Questions",
+                "role": "Unresolved issues list + structured DD Questionnaire.",
+                "methodology": [
+                    "Lists all unresolved issues remaining after analysis",
+                    "Creates structured DD Questionnaire with target, priority, and expected scenarios",
+                    "Recommends next steps for the investment team",
+                    "Only runs after critique passes quality threshold",
+                ],
+                "sources": ["All prior agent outputs (no tools)"],
+            },
+        ],
+    },
+    {
+        "label": "Phase 4 — Report",
+        "color": "#1e40af",
+        "bg": "#eff6ff",
+        "description": "**Report Structure** designs the Why/What/How/Risk/Recommendations framework, then **Report Writer** produces the final polished memo.",
+        "agents": [
+            {
+                "icon": "📐",
+                "name": "Report Structure",
+                "role": "Designs Why/What/How/Risk/Recommendations TOC with 20-30 page target.",
+                "methodology": [
+                    "Designs report following Why/What/How/Risk/Recommendations framework",
+                    "Specifies data sources and key data points for each section",
+                    "Sets target page counts and narrative arcs",
+                    "Outlines executive summary and appendix sections",
+                ],
+                "sources": ["All prior agent outputs (no tools)"],
+            },
+            {
+                "icon": "📝",
+                "name": "Report Writer",
+                "role": "Writes insight-driven final report with INVEST/WATCH/PASS recommendation.",
+                "methodology": [
+                    "Follows report structure to write comprehensive Markdown memo",
+                    "Includes specific numbers, data points, and inline source citations",
+                    "Balances bull and bear cases with evidence-based reasoning",
+                    "Renders final INVEST/WATCH/PASS recommendation with confidence level",
+                    "Includes DD Questionnaire and next steps",
+                ],
+                "sources": ["All prior agent outputs + Report Structure"],
+            },
+        ],
+    },
+]
+
+
+def _build_ko_phases() -> list:
+    """Build the Korean AGENT_PHASES (names/roles/descriptions translated)."""
+    # Korean overrides — methodology/sources stay in English (technical content)
+    ko_meta = [
+        {
+            "label": "1단계 — 병렬 리서치",
+            "description": "6개의 전문 에이전트가 **동시에** 실행됩니다. 각각 기업의 다른 차원을 독립적으로 리서치합니다. 종합 단계 진행 전 **사람의 리뷰**가 필요합니다.",
+            "agents": [
+                ("🌍", "시장 분석",          "TAM/SAM/SOM, CAGR, 시장 트렌드를 분석합니다."),
+                ("🏢", "경쟁사 분석",        "모든 사업 라인의 경쟁사를 파악하고 비교 매트릭스를 구축합니다."),
+                ("💰", "재무 분석",          "5년 재무제표, 비율, 현금흐름 + DCF/시장기반/자산기반 밸류에이션"),
+                ("🔬", "기술 분석",          "핵심 기술, IP/특허, 기술 성숙도를 경쟁사와 비교 분석합니다."),
+                ("⚖️", "법률·규제 분석",     "투자 구조 리스크 + 비즈니스 규제 리스크를 분석합니다."),
+                ("👥", "팀 분석",            "리더십 프로필, 역량 분석, 이탈 이력을 평가합니다."),
+            ],
+        },
+        {
+            "label": "2단계 — 종합",
+            "description": "R&A 종합 + 리스크 평가가 **병렬**로 실행되고, 전략적 인사이트가 **순차적**으로 실행됩니다. 비평 단계 진행 전 **사람의 리뷰**가 필요합니다.",
+            "agents": [
+                ("📊", "R&A 종합",           "1단계를 3-5개 핵심 투자 논거 + CDD/LDD/FDD 스코어카드로 종합합니다."),
+                ("⚠️", "리스크 평가",         "모든 리스크를 확률/영향/심각도 매트릭스로 분석합니다."),
+                ("🎯", "전략적 인사이트",     "INVEST/WATCH/PASS 결정 + 상세 근거 + 시너지 분석"),
+            ],
+        },
+        {
+            "label": "3단계 — 검토 & 비평",
+            "description": "순차: **검토** (주장 검증) → **비평** (5개 기준 채점) → **DD 질문서**. 비평 에이전트가 품질 미달 시 **피드백 루프**를 실행합니다 (최대 2회). 최종 보고서 생성 전 **사람의 리뷰**가 필요합니다.",
+            "agents": [
+                ("🔎", "검토 에이전트",       "출처 검증, 정량적 정확도, 논리적 일관성을 확인합니다."),
+                ("📋", "비평 에이전트",       "5개 기준 채점(1-10): 논리, 완성도, 정확도, 서술 편향, 인사이트 실효성"),
+                ("❓", "DD 질문서",           "미해결 이슈 목록 + 구조화된 DD 질문서를 작성합니다."),
+            ],
+        },
+        {
+            "label": "4단계 — 보고서",
+            "description": "**보고서 구조** 에이전트가 Why/What/How/Risk/Recommendations 프레임워크를 설계하고, **보고서 작성자**가 최종 메모를 작성합니다.",
+            "agents": [
+                ("📐", "보고서 구조",        "Why/What/How/Risk/Recommendations TOC를 설계합니다."),
+                ("📝", "보고서 작성자",       "인사이트 중심의 최종 보고서를 작성합니다."),
+            ],
+        },
+    ]
+
+    return [
+        {
+            **phase_en,
+            "label":       phase_ko["label"],
+            "description": phase_ko["description"],
+            "agents": [
+                {**agent_en, "icon": icon_ko, "name": name_ko, "role": role_ko}
+                for agent_en, (icon_ko, name_ko, role_ko) in zip(phase_en["agents"], phase_ko["agents"])
+            ],
+        }
+        for phase_en, phase_ko in zip(AGENT_PHASES, ko_meta)
+    ]
+
+
+_CARD_LABELS = {
+    "en": {"details": "Methodology &amp; Sources", "how": "How it works:", "sources": "Sources:"},
+    "ko": {"details": "방법론 &amp; 소스", "how": "분석 방법:", "sources": "데이터 소스:"},
+}
+_CARD_HTML = (
+    "<div class='agent-card'>"
+    "<b>{icon} {name}</b><br>"
+    "<span style='color:#475569;font-size:0.88rem'>{role}</span>"
+    "<details><summary>{details}</summary>"
+    "<p><b>{how}</b></p><ul>{methodology}</ul>"
+    "<p><b>{sources_label}</b></p>{sources}"
+    "</details>"
+    "</div>"
+)
+_SOURCE_TAG_HTML = "<span class='source-tag'>{}</span>"
+
+
+def _prerender_cards(phases: list, lang: str) -> None:
+    """Attach each phase's agent cards as one static HTML grid (``cards_html``).
+
+    Methodology/sources sit in a native <details> element, so the whole phase
+    is a single st.markdown call instead of a card + st.expander per agent.
+    """
+    labels = _CARD_LABELS[lang]
+    for phase in phases:
+        cards = "".join(
+            _CARD_HTML.format(
+                icon=agent["icon"],
+                name=escape(agent["name"]),
+                role=escape(agent["role"]),
+                details=labels["details"],
+                how=labels["how"],
+                methodology="".join(f"<li>{escape(step)}</li>" for step in agent["methodology"]),
+                sources_label=labels["sources"],
+                sources="".join(_SOURCE_TAG_HTML.format(escape(src)) for src in agent["sources"]),
+            )
+            for agent in phase["agents"]
+        )
+        phase["cards_html"] = f"<div class='agent-grid'>{cards}</div>"
+
+
+# The translation input is static, so both languages are built (and their
+# card HTML rendered) once at import.
+AGENT_PHASES_KO = _build_ko_phases()
+_prerender_cards(AGENT_PHASES, "en")
+_prerender_cards(AGENT_PHASES_KO, "ko")
+
+
+def get_agent_phases(lang: str) -> list:
+    """Return AGENT_PHASES with names/descriptions translated for the given language.
+
+    Shared module-level data — callers must treat the result as read-only.
+    """
+    return AGENT_PHASES if lang == "en" else AGENT_PHASES_KO
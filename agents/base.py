@@ -4,12 +4,14 @@ from __future__ import annotations
 import json
 import threading
 import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Any
 
 import anthropic
 
-from config import ANTHROPIC_API_KEY, MODEL_NAME, MAX_TOKENS
+from config import ANTHROPIC_API_KEY, ANTHROPIC_TIMEOUT_SEC, MODEL_NAME, MAX_TOKENS
 from tools.executor import execute_tool_call
 
 # ── Context-window safety ─────────────────────────────────────────────────────
@@ -22,28 +24,95 @@ _PDF_TOOLS = frozenset({"extract_pdf_text", "extract_pdf_tables"})
 
 _client: anthropic.Anthropic | None = None
 
-# ── Per-thread token usage accumulator ───────────────────────────────────────
-_tl = threading.local()
+# Prompt caching: the system prompt (which follows the tool definitions in the
+# cache prefix) and the conversation tail are marked so each agentic-loop turn
+# re-reads the previous turn's prefix from cache instead of re-billing it.
+_CACHE_CONTROL = {"type": "ephemeral"}
 
+# ── Per-context token usage accumulator ──────────────────────────────────────
+# A ContextVar rather than threading.local: each worker thread (and each
+# asyncio task / to_thread call, which copy the context) sees its own counter.
+_USAGE_KEYS = ("input_tokens", "output_tokens",
+               "cache_creation_input_tokens", "cache_read_input_tokens")
+_usage_var: ContextVar[dict | None] = ContextVar("dd_token_usage", default=None)
 
-def _accum_usage(inp: int, out: int) -> None:
-    _tl.input_tokens  = getattr(_tl, "input_tokens",  0) + inp
-    _tl.output_tokens = getattr(_tl, "output_tokens", 0) + out
+
+def _accum_usage(inp: int, out: int, cache_write: int = 0, cache_read: int = 0) -> None:
+    """`inp` is the total prompt size; cache_write/cache_read are the parts of it
+    written to / served from the prompt cache (billed at 1.25× / 0.1×)."""
+    usage = _usage_var.get()
+    if usage is None:
+        usage = dict.fromkeys(_USAGE_KEYS, 0)
+        _usage_var.set(usage)
+    usage["input_tokens"]  += inp
+    usage["output_tokens"] += out
+    usage["cache_creation_input_tokens"] += cache_write
+    usage["cache_read_input_tokens"]     += cache_read
 
 
 def get_and_reset_usage() -> dict:
-    """Return accumulated token counts for this thread and reset to zero."""
-    inp = getattr(_tl, "input_tokens",  0)
-    out = getattr(_tl, "output_tokens", 0)
-    _tl.input_tokens  = 0
-    _tl.output_tokens = 0
-    return {"input_tokens": inp, "output_tokens": out}
+    """Return accumulated token counts for the current context and reset to zero."""
+    usage = _usage_var.get()
+    if usage is None:
+        return dict.fromkeys(_USAGE_KEYS, 0)
+    snapshot = dict(usage)
+    usage.update(dict.fromkeys(_USAGE_KEYS, 0))
+    return snapshot
+
+
+@contextmanager
+def usage_scope():
+    """Give the enclosed calls a fresh usage counter; yields the dict they fill."""
+    usage = dict.fromkeys(_USAGE_KEYS, 0)
+    token = _usage_var.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage_var.reset(token)
+
+
+# ── Cooperative cancellation ─────────────────────────────────────────────────
+# A worker thread can't be killed, so a dispatcher that gives up on an agent
+# sets its Event and run_agent stops before the next API or tool call.
+_cancel_var: ContextVar[threading.Event | None] = ContextVar("dd_agent_cancel", default=None)
 
 
-def _get_client() -> anthropic.Anthropic:
+class AgentCancelled(Exception):
+    """Raised inside run_agent once the enclosing cancel_scope's Event is set."""
+
+
+@contextmanager
+def cancel_scope(event: threading.Event):
+    """Make run_agent calls in the enclosed block stop once `event` is set."""
+    token = _cancel_var.set(event)
+    try:
+        yield event
+    finally:
+        _cancel_var.reset(token)
+
+
+def _check_cancelled() -> None:
+    event = _cancel_var.get()
+    if event is not None and event.is_set():
+        raise AgentCancelled("agent cancelled by dispatcher")
+
+
+_client_lock = threading.Lock()
+
+
+def get_client() -> anthropic.Anthropic:
+    """Process-wide Anthropic client shared by every agent and node.
+
+    One client means one httpx connection pool, so parallel agents reuse
+    warm keep-alive connections instead of each opening its own TLS session.
+    """
     global _client
     if _client is None:
-        _client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+        with _client_lock:  # agents start on several pool threads at once
+            if _client is None:
+                _client = anthropic.Anthropic(
+                    api_key=ANTHROPIC_API_KEY, timeout=ANTHROPIC_TIMEOUT_SEC,
+                )
     return _client
 
 
@@ -107,7 +176,12 @@ def _create_with_retry(client: anthropic.Anthropic, max_retries: int = 5, **kwar
             if attempt >= max_retries:
                 raise
             wait = min(60, 10 * (2 ** attempt))  # 10 20 40 60 60 …
-            time.sleep(wait)
+            event = _cancel_var.get()
+            if event is not None:
+                event.wait(wait)  # wakes early if the agent is cancelled
+                _check_cancelled()
+            else:
+                time.sleep(wait)
 
 
 def run_agent(
@@ -219,11 +293,15 @@ def run_agent(
                 f"Local news breaks stories days before English media."
             )
 
-    client = _get_client()
-    messages: list[dict] = [{"role": "user", "content": user_message}]
+    client = get_client()
+    messages: list[dict] = [{"role": "user", "content": [
+        {"type": "text", "text": user_message, "cache_control": _CACHE_CONTROL},
+    ]}]
+    cached_tail: dict = messages[0]["content"][0]  # only the newest turn keeps a breakpoint
     _pdf_tool_ids: set[str] = set()  # track PDF tool_use_ids for trim protection
 
     for _ in range(max_iterations):
+        _check_cancelled()
         # Safety net: trim OLD tool results if context is too large.
         # This only truncates previous tool results (search data etc.),
         # never the user's initial message, agent output, or PDF results.
@@ -232,7 +310,7 @@ def run_agent(
         kwargs: dict[str, Any] = {
             "model":      MODEL_NAME,
             "max_tokens": max_tokens or MAX_TOKENS,
-            "system":     system_prompt,
+            "system":     [{"type": "text", "text": system_prompt, "cache_control": _CACHE_CONTROL}],
             "messages":   messages,
         }
         if tools:
@@ -242,7 +320,12 @@ def run_agent(
 
         # Accumulate token usage for this API call
         if hasattr(response, "usage") and response.usage:
-            _accum_usage(response.usage.input_tokens, response.usage.output_tokens)
+            u = response.usage
+            cache_write = getattr(u, "cache_creation_input_tokens", 0) or 0
+            cache_read  = getattr(u, "cache_read_input_tokens", 0) or 0
+            # API input_tokens excludes the cached parts — report the full prompt
+            _accum_usage(u.input_tokens + cache_write + cache_read, u.output_tokens,
+                         cache_write, cache_read)
 
         tool_use_blocks = []
         text_blocks = []
@@ -257,6 +340,7 @@ def run_agent(
         if tool_use_blocks:
             tool_results = []
             for tb in tool_use_blocks:
+                _check_cancelled()  # don't spend search credits for an abandoned agent
                 try:
                     result = execute_tool_call(tb.name, tb.input)
                 except Exception as exc:
@@ -275,6 +359,10 @@ def run_agent(
                 })
                 if is_pdf:
                     _pdf_tool_ids.add(tb.id)  # protect from safety-net trimming
+            # Move the cache breakpoint to the new tail (API allows at most 4)
+            cached_tail.pop("cache_control", None)
+            cached_tail = tool_results[-1]
+            cached_tail["cache_control"] = _CACHE_CONTROL
             messages.append({"role": "user", "content": tool_results})
             continue
 
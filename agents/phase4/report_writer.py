@@ -7,6 +7,8 @@ from __future__ import annotations
 from pathlib import Path
 
 import json
+import string
+import time
 from datetime import date
 
 from graph.state import DueDiligenceState
@@ -85,9 +87,40 @@ _MODE_INSTRUCTIONS = {
 }
 
 
+# Single user-message template for every mode; optional blocks are passed in
+# as empty strings when they don't apply.
+_USER_TEMPLATE = string.Template(
+    "Company: $company\n"
+    "Analysis Mode: $mode\n"
+    "Report Type: $report_type\n"
+    "Today's Date: $today\n\n"
+    "$benchmark_note"
+    "$private_disclaimer"
+    "Report Structure:\n$structure\n\n"
+    "$sources_section"
+    "Full Analysis Package:\n$package\n\n"
+    "$instructions"
+)
+
+
+# (hour bucket, ISO date) — keeps the date line byte-identical across runs
+# within the same hour so the prompt prefix stays cache-friendly.
+_today_cache: tuple[int, str] = (-1, "")
+
+
+def _cached_today() -> str:
+    """Return today's ISO date, recomputed at most once per hour."""
+    global _today_cache
+    bucket = int(time.time() // 3600)
+    if _today_cache[0] != bucket:
+        _today_cache = (bucket, date.today().isoformat())
+    return _today_cache[1]
+
+
 def _build_mode_context(state: DueDiligenceState) -> dict:
     """Build rich context dict from agents that ran for the current mode."""
-    mode = state.get("mode", "due-diligence")
+    get = state.get
+    mode = get("mode", "due-diligence")
     cfg = MODE_REGISTRY[mode]
 
     ctx = {}
@@ -95,13 +128,13 @@ def _build_mode_context(state: DueDiligenceState) -> dict:
     for agent_name in cfg["phase1_agents"]:
         if agent_name in _RICH_MAP:
             key, fn = _RICH_MAP[agent_name]
-            ctx[key] = fn(state.get(agent_name))
+            ctx[key] = fn(get(agent_name))
 
     # Phase 2 agents
     for agent_name in cfg["phase2_parallel"] + cfg.get("phase2_sequential", []):
         if agent_name in _RICH_MAP:
             key, fn = _RICH_MAP[agent_name]
-            ctx[key] = fn(state.get(agent_name))
+            ctx[key] = fn(get(agent_name))
 
     # Phase 3 agents
     phase3_state_keys = {
@@ -113,14 +146,15 @@ def _build_mode_context(state: DueDiligenceState) -> dict:
         state_key = phase3_state_keys.get(agent_name, agent_name)
         if state_key in _RICH_MAP:
             key, fn = _RICH_MAP[state_key]
-            ctx[key] = fn(state.get(state_key))
+            ctx[key] = fn(get(state_key))
 
     return ctx
 
 
 def _collect_all_sources(state: DueDiligenceState) -> list[dict]:
     """Deduplicate sources by URL from all agent reports."""
-    mode = state.get("mode", "due-diligence")
+    get = state.get
+    mode = get("mode", "due-diligence")
     cfg = MODE_REGISTRY[mode]
 
     # Collect from all agents that ran
@@ -138,7 +172,7 @@ def _collect_all_sources(state: DueDiligenceState) -> list[dict]:
     seen_urls: set[str] = set()
     all_sources: list[dict] = []
     for key in report_keys:
-        report = state.get(key)
+        report = get(key)
         if not isinstance(report, dict):
             continue
         for src in report.get("sources", []):
@@ -152,7 +186,8 @@ def _collect_all_sources(state: DueDiligenceState) -> list[dict]:
 
 
 def run(state: DueDiligenceState) -> dict:
-    mode = state.get("mode", "due-diligence")
+    get = state.get
+    mode = get("mode", "due-diligence")
     cfg = MODE_REGISTRY[mode]
     # For thread-safe custom keys like "custom-abc123", look up "custom" fallback
     lookup_mode = "custom" if mode.startswith("custom") else mode
@@ -160,13 +195,13 @@ def run(state: DueDiligenceState) -> dict:
 
     full_package = compact(_build_mode_context(state))
 
-    report_structure = state.get("report_structure") or {}
+    report_structure = get("report_structure") or {}
     if report_structure:
         structure_json = compact(_deep_trim(report_structure, max_str=400, max_list=8))
     else:
         structure_json = "No structure provided."
 
-    today = date.today().isoformat()
+    today = _cached_today()
 
     # Aggregated sources (cap at 20)
     all_sources = _collect_all_sources(state)[:20]
@@ -180,7 +215,7 @@ def run(state: DueDiligenceState) -> dict:
             f"and inline [N] citations):\n{source_lines}\n\n"
         )
 
-    is_public = state.get("is_public", True)
+    is_public = get("is_public", True)
     private_disclaimer = ""
     if is_public is False:
         private_disclaimer = (
@@ -193,22 +228,22 @@ def run(state: DueDiligenceState) -> dict:
     # Benchmark mode: include vs_company context
     benchmark_note = ""
     if mode == "benchmark":
-        vs = state.get("vs_company") or "industry average"
+        vs = get("vs_company") or "industry average"
         benchmark_note = f"Benchmark Target: {vs}\n\n"
 
     write_instructions = _MODE_INSTRUCTIONS.get(lookup_mode, _MODE_INSTRUCTIONS["custom"])
 
-    user_message = (
-        f"Company: {state['company_name']}\n"
-        f"Analysis Mode: {mode}\n"
-        f"Report Type: {report_type}\n"
-        f"Today's Date: {today}\n\n"
-        f"{benchmark_note}"
-        f"{private_disclaimer}"
-        f"Report Structure:\n{structure_json}\n\n"
-        f"{sources_section}"
-        f"Full Analysis Package:\n{full_package}\n\n"
-        f"{write_instructions}"
+    user_message = _USER_TEMPLATE.substitute(
+        company=state["company_name"],
+        mode=mode,
+        report_type=report_type,
+        today=today,
+        benchmark_note=benchmark_note,
+        private_disclaimer=private_disclaimer,
+        structure=structure_json,
+        sources_section=sources_section,
+        package=full_package,
+        instructions=write_instructions,
     )
 
     result = run_agent(
@@ -218,11 +253,14 @@ def run(state: DueDiligenceState) -> dict:
         tools=get_tools_for_agent("report_writer"),  # no tools
         max_iterations=5,
         max_tokens=32000,
-        language=state.get("language", "English"),
+        language=get("language", "English"),
         return_raw_text=True,  # Don't parse as JSON — output is markdown
     )
 
-    memo_text = result.get("raw", "")
+    memo_text = result.pop("raw", None)
+    if memo_text is None:
+        memo_text = json.dumps(result, indent=2, ensure_ascii=False)
+    del result  # drop the response dict before the recommendation scan
 
     output: dict = {
         "final_report": memo_text,
@@ -231,13 +269,46 @@ def run(state: DueDiligenceState) -> dict:
 
     # Only extract recommendation for modes that have one
     if cfg.get("has_recommendation"):
-        output["recommendation"] = _extract_recommendation(memo_text)
+        # Structured JSON block first; the regex scan only runs if the memo
+        # skipped it, and Strategic Insight's JSON verdict is the last resort.
+        rec = _structured_recommendation(memo_text) or _extract_recommendation(memo_text)
+        if not rec:
+            si = get("strategic_insight")
+            si_rec = str(si.get("recommendation", "")).upper() if isinstance(si, dict) else ""
+            rec = si_rec if si_rec in _REC_TOKENS else None
+        # None (not a WATCH default) also clears a verdict from an earlier pass
+        output["recommendation"] = rec
+        if not rec:
+            # Don't mask a memo that ignored the schema as a WATCH call;
+            # consumers render the missing verdict as N/A.
+            output["errors"] = [
+                "report_writer: no INVEST/WATCH/PASS recommendation found in memo"
+            ]
 
     return output
 
 
-def _extract_recommendation(text: str) -> str:
-    """Pull INVEST / WATCH / PASS from the memo text."""
+_REC_TOKENS = ("INVEST", "WATCH", "PASS")
+
+
+def _structured_recommendation(text: str) -> str | None:
+    """Read the memo's closing ``{"recommendation": ...}`` JSON block, or None."""
+    idx = text.rfind('{"recommendation"')
+    if idx == -1:
+        return None
+    try:
+        block, _ = json.JSONDecoder().raw_decode(text, idx)
+    except ValueError:
+        return None
+    if isinstance(block, dict):
+        rec = str(block.get("recommendation", "")).upper()
+        if rec in _REC_TOKENS:
+            return rec
+    return None
+
+
+def _extract_recommendation(text: str) -> str | None:
+    """Pull INVEST / WATCH / PASS from free-form memo text, or None."""
     import re
 
     m = re.search(r'\{"recommendation":\s*"(INVEST|WATCH|PASS)"', text, re.IGNORECASE)
@@ -252,8 +323,31 @@ def _extract_recommendation(text: str) -> str:
     if m:
         return m.group(1).upper()
 
-    m = re.search(r'[Rr]ecommendation.{0,100}(INVEST|WATCH|PASS)', text)
-    if m:
-        return m.group(1).upper()
-
-    return "WATCH"
+    return _scan_recommendation_mentions(text)
+
+
+def _scan_recommendation_mentions(text: str) -> str | None:
+    """Find INVEST/WATCH/PASS within 100 chars after "Recommendation".
+
+    Plain substring scan instead of a backtracking regex — memos can mention
+    "recommendation" many times. Like the old pattern, the window stops at a
+    newline and the tokens are matched case-sensitively.
+    """
+    i = 0
+    while (i := text.find("ecommendation", i)) != -1:
+        start = i + 13
+        if i > 0 and text[i - 1] in "Rr":
+            window = text[start:start + 106]
+            nl = window.find("\n")
+            if nl != -1:
+                window = window[:nl]
+            best: tuple[int, str] | None = None
+            for tok in _REC_TOKENS:
+                # Last occurrence wins, mirroring the greedy .{0,100}
+                pos = window.rfind(tok, 0, 100 + len(tok))
+                if pos != -1 and (best is None or pos > best[0]):
+                    best = (pos, tok)
+            if best:
+                return best[1]
+        i = start
+    return None
@@ -1,30 +1,38 @@
 """Streamlit web UI for the Due Diligence Agent."""
+import copy
+import hmac
 import json
 import os
 import logging
+import re
 import shutil
 import tempfile
 import threading
 import time
 import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from html import escape
 from pathlib import Path
+from types import MappingProxyType
 
 from supabase_storage import (
     read_job,
+    read_job_status,
     update_job,
     load_history,
     load_queue,
     save_history_entry,
     upload_pdf,
     upload_file,
-    download_pdf,
     download_file,
     cleanup_stale_jobs,
+    report_files_pending,
 )
 
 # Max concurrent analyses. Additional submissions wait in queue.
-_ANALYSIS_SEMAPHORE = threading.Semaphore(2)
+_MAX_CONCURRENT_ANALYSES = 2
 
 
 # ── Token cost tracking ────────────────────────────────────────────────────────
@@ -32,9 +40,14 @@ _ANALYSIS_SEMAPHORE = threading.Semaphore(2)
 # claude-sonnet-4-6 pricing (USD per 1M tokens)
 _PRICE_INPUT_PER_M  = 3.00
 _PRICE_OUTPUT_PER_M = 15.00
+_IN_RATE_PER_TOKEN  = _PRICE_INPUT_PER_M / 1_000_000
+_OUT_RATE_PER_TOKEN = _PRICE_OUTPUT_PER_M / 1_000_000
+# Prompt-cache writes/reads, as multiples of the base input rate
+_CACHE_WRITE_RATE_PER_TOKEN = _IN_RATE_PER_TOKEN * 1.25
+_CACHE_READ_RATE_PER_TOKEN  = _IN_RATE_PER_TOKEN * 0.10
 
 # Human-readable labels for each agent key
-_AGENT_LABELS_EN = {
+_AGENT_LABELS_EN = MappingProxyType({
     "market_analysis":     "Market Analysis",
     "competitor_analysis": "Competitor Analysis",
     "financial_analysis":  "Financial Analysis",
@@ -53,9 +66,9 @@ _AGENT_LABELS_EN = {
     "dd_questions":        "DD Questions",
     "report_structure":    "Report Structure",
     "report_writer":       "Report Writer",
-}
+})
 
-_AGENT_LABELS_KO = {
+_AGENT_LABELS_KO = MappingProxyType({
     "market_analysis":     "시장 분석",
     "competitor_analysis": "경쟁사 분석",
     "financial_analysis":  "재무 분석",
@@ -74,10 +87,10 @@ _AGENT_LABELS_KO = {
     "dd_questions":        "DD 질문서",
     "report_structure":    "보고서 구조",
     "report_writer":       "보고서 작성자",
-}
+})
 
 # Display order
-_AGENT_ORDER = list(_AGENT_LABELS_EN.keys())
+_AGENT_ORDER = tuple(_AGENT_LABELS_EN)
 
 # Keys to collect from pipeline state as agent outputs
 _AGENT_OUTPUT_KEYS = [
@@ -131,22 +144,132 @@ _AGENT_OUTPUT_PHASES = [
 ]
 
 
-def _cost_usd(inp: int, out: int) -> float:
-    return inp / 1_000_000 * _PRICE_INPUT_PER_M + out / 1_000_000 * _PRICE_OUTPUT_PER_M
+def _cost_usd(inp: int, out: int, cache_write: int = 0, cache_read: int = 0) -> float:
+    """`inp` is the full prompt size; the cached parts of it are billed at their own rates."""
+    return ((inp - cache_write - cache_read) * _IN_RATE_PER_TOKEN
+            + cache_write * _CACHE_WRITE_RATE_PER_TOKEN
+            + cache_read * _CACHE_READ_RATE_PER_TOKEN
+            + out * _OUT_RATE_PER_TOKEN)
+
+
+def _usage_entry(usage: dict) -> dict:
+    """token_usage row for one agent/node from an agents.base usage dict."""
+    return {
+        "input_tokens":  usage["input_tokens"],
+        "output_tokens": usage["output_tokens"],
+        "cost_usd":      _cost_usd(
+            usage["input_tokens"], usage["output_tokens"],
+            usage.get("cache_creation_input_tokens", 0), usage.get("cache_read_input_tokens", 0),
+        ),
+    }
+
+
+def _usage_totals(token_usage: dict) -> tuple[int, int, float]:
+    """(input tokens, output tokens, cost USD) summed in a single pass."""
+    total_in = total_out = 0
+    total_cost = 0.0
+    for v in token_usage.values():
+        total_in   += v.get("input_tokens", 0)
+        total_out  += v.get("output_tokens", 0)
+        total_cost += v.get("cost_usd", 0)
+    return total_in, total_out, total_cost
 
 
 # ── Background worker ──────────────────────────────────────────────────────────
 
-def _analysis_worker(job_id: str, initial_state: dict, company: str, tmp_dir: str) -> None:
-    """Daemon thread — waits for a semaphore slot, then runs the full pipeline."""
-    # Wait for a free slot (max 2 concurrent analyses)
-    update_job(job_id, {"status": "queued"})
-    _ANALYSIS_SEMAPHORE.acquire()
-    try:
+class _DebouncedWriter:
+    """Coalesce bursts of progress writes for one job into a single upsert.
+
+    Updates arriving within ``interval`` seconds of the last write are merged
+    and flushed by a timer. Status transitions flush immediately, together
+    with anything still pending.
+    """
+
+    def __init__(self, job_id: str, interval: float = 0.25) -> None:
+        self._job_id = job_id
+        self._interval = interval
+        self._pending: dict = {}
+        self._last_write = 0.0
+        self._timer: threading.Timer | None = None
+        # Held across the write so a timer flush can't land after a newer one
+        self._lock = threading.Lock()
+
+    def schedule(self, updates: dict) -> None:
+        with self._lock:
+            if "status" not in updates:
+                wait = self._interval - (time.monotonic() - self._last_write)
+                if self._timer is not None or wait > 0:
+                    # Deferred writes run on the timer thread while the caller
+                    # keeps mutating its lists/dicts — snapshot them first.
+                    self._pending.update({k: copy.copy(v) for k, v in updates.items()})
+                    if self._timer is None:
+                        self._timer = threading.Timer(wait, self.flush)
+                        self._timer.daemon = True
+                        self._timer.start()
+                    return
+            self._pending.update(updates)
+            self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        updates, self._pending = self._pending, {}
+        if updates:
+            self._last_write = time.monotonic()
+            update_job(self._job_id, updates)
+
+
+class _AnalysisQueue:
+    """Bounded worker pool for analyses plus the FIFO of jobs waiting for a slot.
+
+    Queued jobs sit in the pool's work queue instead of each parking an OS
+    thread on a semaphore, and the waiting deque gives the UI a real position.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix="analysis")
+        self._waiting: deque[str] = deque()
+        self._lock = threading.Lock()
+
+    def submit(self, job_id: str, fn, *args) -> None:
+        with self._lock:
+            self._waiting.append(job_id)
+        self._pool.submit(self._run, job_id, fn, args)
+
+    def _run(self, job_id: str, fn, args: tuple) -> None:
+        with self._lock:
+            try:
+                self._waiting.remove(job_id)
+            except ValueError:
+                pass
+        fn(*args)
+
+    def position(self, job_id: str) -> int | None:
+        """1-based place in line, or None if the job isn't waiting."""
+        with self._lock:
+            try:
+                return self._waiting.index(job_id) + 1
+            except ValueError:
+                return None
+
+
+def _analysis_worker(job_id: str, initial_state: dict, company: str,
+                     workdir: tempfile.TemporaryDirectory) -> None:
+    """Pool task — runs once a worker slot is free (max 2 concurrent analyses).
+
+    Owns the job's scratch dir: it is removed when this returns, however it exits.
+    """
+    with workdir as tmp_dir:
+        if read_job_status(job_id) == "cancelled":  # cancelled while waiting in line
+            return
         update_job(job_id, {"status": "running", "start_time": time.time()})
         _run_pipeline(job_id, initial_state, company, tmp_dir)
-    finally:
-        _ANALYSIS_SEMAPHORE.release()
 
 
 def _run_pipeline(job_id: str, initial_state: dict, company: str, tmp_dir: str) -> None:
@@ -155,21 +278,8 @@ def _run_pipeline(job_id: str, initial_state: dict, company: str, tmp_dir: str)
     Human checkpoints pause after Phase 1, Phase 2, and Phase 3.
     The pipeline thread sleeps until the user approves via the UI.
     """
+    writer = _DebouncedWriter(job_id)
     try:
-        import pdf_report
-        import pptx_report
-        from agents.base import get_and_reset_usage
-        from config import MAX_COST_PER_ANALYSIS
-        from config import MODE_REGISTRY
-        from graph.workflow import (
-            input_processor, phase1_parallel, phase1_aggregator,
-            phase2_parallel, strategic_insight_node, phase2_aggregator,
-            review_agent_node, critique_agent_node, critique_router,
-            selective_rerun, phase1_restart,
-            dd_questions_node, report_structure_node, report_writer_node,
-        )
-        from agents.phase5 import codex_verification
-
         state: dict = dict(initial_state)
         progress: list[str] = []
         token_usage: dict = {}
@@ -188,8 +298,7 @@ def _run_pipeline(job_id: str, initial_state: dict, company: str, tmp_dir: str)
             pass
 
         def _check_cancelled() -> None:
-            job = read_job(job_id)
-            if job and job.get("status") == "cancelled":
+            if read_job_status(job_id) == "cancelled":
                 raise _Cancelled()
 
         def _collect_agent_outputs() -> dict:
@@ -212,31 +321,28 @@ def _run_pipeline(job_id: str, initial_state: dict, company: str, tmp_dir: str)
 
             # Persist current agent outputs so the UI can display them
             agent_outputs = _collect_agent_outputs()
-            update_job(job_id, {
+            writer.schedule({
                 "status":             "checkpoint",
                 "checkpoint_phase":   phase_name,
                 "checkpoint_feedback": None,
                 "agent_outputs":      agent_outputs,
-                "progress":           progress.copy(),
-                "token_usage":        token_usage.copy(),
+                "progress":           progress,
+                "token_usage":        token_usage,
             })
 
             # Poll until user acts
             while True:
                 time.sleep(3)
-                job = read_job(job_id)
-                if not job:
-                    raise _Cancelled()
-                status = job.get("status", "")
+                status = read_job_status(job_id)
                 if status == "cancelled":
                     raise _Cancelled()
                 if status == "approved":
                     # Read back any user feedback
-                    feedback = job.get("checkpoint_feedback") or ""
+                    feedback = read_job(job_id).get("checkpoint_feedback") or ""
                     if feedback:
                         state["checkpoint_feedback"] = feedback
                     # Resume — set status back to running
-                    update_job(job_id, {
+                    writer.schedule({
                         "status": "running",
                         "checkpoint_phase": None,
                         "checkpoint_feedback": None,
@@ -248,26 +354,32 @@ def _run_pipeline(job_id: str, initial_state: dict, company: str, tmp_dir: str)
             result = fn(state)
             state.update(result)
             progress.append(node_name)
+            # Only resend token_usage when this step actually added to it —
+            # aggregators, restarts and empty phases just extend progress.
+            updates: dict = {"progress": progress}
 
             if node_name in ("phase1_parallel", "phase2_parallel"):
                 for agent_key, usage in (state.pop("__agent_usage__", {}) or {}).items():
-                    token_usage[agent_key] = {
-                        "input_tokens":  usage["input_tokens"],
-                        "output_tokens": usage["output_tokens"],
-                        "cost_usd":      _cost_usd(usage["input_tokens"], usage["output_tokens"]),
-                    }
+                    updates["token_usage"] = token_usage
+                    token_usage[agent_key] = _usage_entry(usage)
             elif node_name not in _NO_LLM_NODES:
                 usage = get_and_reset_usage()
-                token_usage[node_name] = {
-                    "input_tokens":  usage["input_tokens"],
-                    "output_tokens": usage["output_tokens"],
-                    "cost_usd":      _cost_usd(usage["input_tokens"], usage["output_tokens"]),
-                }
-
-            update_job(job_id, {
-                "progress":    progress.copy(),
-                "token_usage": token_usage.copy(),
-            })
+                # Nodes that fan agents out to the pool (selective_rerun)
+                # report that usage in-band; book it under the node
+                for fanned in (state.pop("__agent_usage__", {}) or {}).values():
+                    for k, v in fanned.items():
+                        usage[k] = usage.get(k, 0) + v
+                updates["token_usage"] = token_usage
+                token_usage[node_name] = _usage_entry(usage)
+
+            # No defensive copies: progress/token_usage are only mutated on
+            # this thread, and the writer snapshots them itself if it has to
+            # defer the write to its timer.
+            writer.schedule(updates)
+
+            # e.g. invalid API key — every later agent would fail the same way
+            if state.get("fatal_error"):
+                raise RuntimeError(state["fatal_error"])
 
         # ── Resolve mode config ───────────────────────────────────────────────
         mode = state.get("mode", "due-diligence")
@@ -286,7 +398,7 @@ def _run_pipeline(job_id: str, initial_state: dict, company: str, tmp_dir: str)
             result = run_fn(state)
             state.update(result)
             progress.append(f"codex_verify_{phase_name}")
-            update_job(job_id, {"progress": progress.copy()})
+            writer.schedule({"progress": progress})
 
             v = state.get(verify_key) or {}
             if v.get("overall") == "FAIL" and rerun_fn and not _over_budget():
@@ -300,7 +412,7 @@ def _run_pipeline(job_id: str, initial_state: dict, company: str, tmp_dir: str)
                     result2[verify_key]["_retried"] = True
                 state.update(result2)
                 progress.append(f"codex_verify_{phase_name}_retry")
-                update_job(job_id, {"progress": progress.copy()})
+                writer.schedule({"progress": progress})
 
         # ── Phase 1: Research ────────────────────────────────────────────────
         _step(input_processor,        "input_processor")
@@ -338,6 +450,9 @@ def _run_pipeline(job_id: str, initial_state: dict, company: str, tmp_dir: str)
         _wait_for_checkpoint("phase2")
 
         # ── Phase 3: Review + critique ───────────────────────────────────────
+        # Nothing to review when every Phase 1/2 agent came back empty
+        if not has_phase3_input(state):
+            has_review = has_critique = has_dd_q = False
         if has_review:
             _step(review_agent_node,   "review_agent")
         if has_critique:
@@ -346,7 +461,7 @@ def _run_pipeline(job_id: str, initial_state: dict, company: str, tmp_dir: str)
             if has_loop:
                 route = critique_router(state)
                 progress.append(f"critique_router:{route}")
-                update_job(job_id, {"progress": progress.copy()})
+                writer.schedule({"progress": progress})
 
                 if route != "pass" and not _over_budget():
                     if route == "conditional":
@@ -366,7 +481,7 @@ def _run_pipeline(job_id: str, initial_state: dict, company: str, tmp_dir: str)
                     _step(critique_agent_node, "critique_agent")
                     route2 = critique_router(state)
                     progress.append(f"critique_router:{route2}")
-                    update_job(job_id, {"progress": progress.copy()})
+                    writer.schedule({"progress": progress})
 
         if has_dd_q:
             _step(dd_questions_node,      "dd_questions")
@@ -396,9 +511,38 @@ def _run_pipeline(job_id: str, initial_state: dict, company: str, tmp_dir: str)
         _codex_verify(codex_verification.run_final, "verification_result",
                       "final", lambda: _step(report_writer_node, "report_writer"))
 
-        # Generate PDF
-        pdf_path = pdf_report.generate_pdf(state, job_id, output_dir=tmp_dir)
-        pdf_storage = upload_pdf(job_id, pdf_path)
+        # Mark job complete as soon as the memo exists (critical — must not
+        # fail) so the UI can show the report; the PDF/PPTX/DOCX are rendered
+        # afterwards and announced through pdf_status.
+        recommendation = (state.get("recommendation") or "N/A").upper()
+        writer.flush()
+        update_job(job_id, {
+            "status":         "complete",
+            "recommendation": recommendation,
+            "final_report":   state.get("final_report") or "",
+            "token_usage":    token_usage,
+            "pdf_status":     "rendering",
+        }, durable=True)
+
+        # Persist agent outputs separately (best-effort — large payload)
+        try:
+            agent_outputs = {}
+            for key in _AGENT_OUTPUT_KEYS:
+                val = state.get(key)
+                if val is not None:
+                    agent_outputs[key] = val
+            if agent_outputs:
+                update_job(job_id, {"agent_outputs": agent_outputs})
+        except Exception as exc:
+            logging.warning("Agent outputs persist failed for %s: %s", job_id, exc)
+
+        # Generate PDF + upload to Supabase
+        pdf_storage = None
+        try:
+            pdf_path = pdf_report.generate_pdf(state, job_id, output_dir=tmp_dir)
+            pdf_storage = upload_pdf(job_id, pdf_path)
+        except Exception as exc:
+            logging.warning("PDF generation failed for %s: %s", job_id, exc)
 
         # Generate PPTX + upload to Supabase
         pptx_storage = None
@@ -411,260 +555,135 @@ def _run_pipeline(job_id: str, initial_state: dict, company: str, tmp_dir: str)
         # Generate DOCX + upload to Supabase
         docx_storage = None
         try:
-            import docx_report
+            if docx_report is None:
+                raise RuntimeError("python-docx is not installed")
             docx_path = docx_report.generate_docx(state, job_id, output_dir=tmp_dir)
             docx_storage = upload_file(job_id, docx_path, folder="docx")
         except Exception as exc:
             logging.warning("DOCX generation failed for %s: %s", job_id, exc)
 
-        save_history_entry({
-            "id": job_id,
-            "company": company,
-            "recommendation": (state.get("recommendation") or "WATCH").upper(),
-            "date": datetime.now().strftime("%Y-%m-%d %H:%M"),
-            "pdf_path": pdf_storage,
-        })
-
-        # Mark job complete first (critical — must not fail)
-        job_update = {
-            "status":         "complete",
-            "pdf_path":       pdf_storage,
-            "recommendation": (state.get("recommendation") or "WATCH").upper(),
-            "final_report":   state.get("final_report") or "",
-            "token_usage":    token_usage,
+        files_update = {
+            "pdf_path":   pdf_storage,
+            "pdf_status": "ready" if pdf_storage else "failed",
         }
         if pptx_storage:
-            job_update["pptx_path"] = pptx_storage
+            files_update["pptx_path"] = pptx_storage
         if docx_storage:
-            job_update["docx_path"] = docx_storage
-        update_job(job_id, job_update)
+            files_update["docx_path"] = docx_storage
+        try:
+            update_job(job_id, files_update, durable=True)
+        except Exception as exc:
+            logging.warning("Report file paths persist failed for %s: %s", job_id, exc)
 
-        # Persist agent outputs separately (best-effort — large payload)
         try:
-            agent_outputs = {}
-            for key in _AGENT_OUTPUT_KEYS:
-                val = state.get(key)
-                if val is not None:
-                    agent_outputs[key] = val
-            if agent_outputs:
-                update_job(job_id, {"agent_outputs": agent_outputs})
+            save_history_entry({
+                "id": job_id,
+                "company": company,
+                "recommendation": recommendation,
+                "date": datetime.now().strftime("%Y-%m-%d %H:%M"),
+                "pdf_path": pdf_storage,
+            })
         except Exception as exc:
-            logging.warning("Agent outputs persist failed for %s: %s", job_id, exc)
+            logging.warning("History save failed for %s: %s", job_id, exc)
 
     except _Cancelled:
+        writer.flush()
         update_job(job_id, {"status": "cancelled"})
 
     except Exception as exc:
-        update_job(job_id, {"status": "error", "error": str(exc)})
+        writer.flush()
+        update_job(job_id, {"status": "error", "error": str(exc)}, durable=True)
 
     finally:
         # Clean up custom mode registration
         _mode = initial_state.get("mode", "")
         if _mode.startswith("custom-"):
-            from config import unregister_custom_mode
             unregister_custom_mode(_mode)
-        shutil.rmtree(tmp_dir, ignore_errors=True)
 
 import streamlit as st
 
+
 # Inject Streamlit Cloud secrets into os.environ so config.py's os.getenv() works.
-# This is a no-op when running locally with a .env file.
+# This is a no-op when running locally with a .env file. cache_resource makes it
+# run once per process rather than on every rerun.
+@st.cache_resource(show_spinner=False)
+def _seed_env() -> None:
+    try:
+        for _k in ["ANTHROPIC_API_KEY", "TAVILY_API_KEY", "EDGAR_USER_AGENT",
+                    "DART_API_KEY", "SUPABASE_URL", "SUPABASE_SERVICE_KEY"]:
+            if _k in st.secrets and not os.environ.get(_k):
+                os.environ[_k] = str(st.secrets[_k])
+    except Exception:
+        pass
+
+
+_seed_env()
+
+from config import (
+    MAX_COST_PER_ANALYSIS, MODE_REGISTRY, register_custom_mode,
+    unregister_custom_mode, validate_config,
+)
+from agent_directory import APP_CSS, PIPELINE_GRAPH, get_agent_phases
+from ui_strings import UI_NS, UI_STRINGS
+
+# Pipeline modules are imported once per process here (after the secrets are
+# in os.environ) rather than inside _run_pipeline on every job.
+import pdf_report
+import pptx_report
 try:
-    for _k in ["ANTHROPIC_API_KEY", "TAVILY_API_KEY", "EDGAR_USER_AGENT",
-                "DART_API_KEY", "SUPABASE_URL", "SUPABASE_SERVICE_KEY"]:
-        if _k in st.secrets and not os.environ.get(_k):
-            os.environ[_k] = str(st.secrets[_k])
-except Exception:
-    pass
+    import docx_report  # python-docx is optional — DOCX export is skipped without it
+except ImportError:
+    docx_report = None
+from agents.base import get_and_reset_usage
+from agents.phase5 import codex_verification
+from graph.workflow import (
+    input_processor, phase1_parallel, phase1_aggregator,
+    phase2_parallel, strategic_insight_node, phase2_aggregator,
+    review_agent_node, critique_agent_node, critique_router,
+    has_phase3_input, selective_rerun, phase1_restart,
+    dd_questions_node, report_structure_node, report_writer_node,
+)
 
-from config import validate_config
 
-# ── UI Translations ────────────────────────────────────────────────────────────
+# Per-job scratch dirs (uploads + rendered reports) live under one root so
+# anything a crashed or redeployed process left behind can be swept.
+_WORKDIR_ROOT = os.path.join(tempfile.gettempdir(), "dd-agent-jobs")
+_WORKDIR_MAX_AGE_SEC = 3 * 3600  # well past the 90-minute stale-job timeout
+
+
+@st.cache_resource(show_spinner=False)
+def _sweep_workdirs() -> None:
+    """Remove job dirs abandoned by earlier processes (runs once per process)."""
+    cutoff = time.time() - _WORKDIR_MAX_AGE_SEC
+    try:
+        entries = list(os.scandir(_WORKDIR_ROOT))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        except OSError:
+            pass
+
+
+def _job_workdir() -> tempfile.TemporaryDirectory:
+    """Create a fresh scratch dir for one job; the worker cleans it up when done."""
+    os.makedirs(_WORKDIR_ROOT, exist_ok=True)
+    return tempfile.TemporaryDirectory(prefix="job-", dir=_WORKDIR_ROOT)
 
-_UI = {
-    "en": {
-        "app_title":            "## 📊 Due Diligence Agent",
-        "app_subtitle":         "Submit a company → 15 AI agents analyze it in 4 phases → human review at every stage → full investment memo + PDF",
-        "history_btn":          "🕐 History",
-        "form_heading":         "#### Submit a Company",
-        "company_label":        "Company Name",
-        "company_placeholder":  "e.g. Apple, OpenAI, Stripe",
-        "url_label":            "Website URL *(optional — improves research quality)*",
-        "url_placeholder":      "https://example.com",
-        "report_lang_label":    "Report Language",
-        "docs_label":           "Supporting Documents *(optional)*",
-        "docs_help":            "Pitch decks, 10-Ks, annual reports, etc.",
-        "cost_caption":         "Typical cost: **$1 – $5 per analysis** · 15 agents · claude-sonnet-4-6 · $3/M input · $15/M output",
-        "run_btn":              "🔍  Run Due Diligence",
-        "pipeline_heading":     "#### Agent Pipeline Flow",
-        "pipeline_caption":     "Each phase pauses for **human review** (pink octagons) before proceeding. Orchestrator scores agents, revises weak ones (red dashed).",
-        "directory_heading":    "#### Agent Directory",
-        "directory_caption":    "Click any agent to see its methodology and data sources.",
-        "how_it_works":         "**How it works:**",
-        "sources_label":        "**Sources:**",
-        "methodology_expander": "Methodology & Sources",
-        "analyzing":            "## 📊 Analyzing {}…",
-        "running_caption":      "Running in the background — you can navigate away and come back at any time.",
-        "api_cost":             "**API cost so far: ${cost:.4f}**  ·  {inp:,} input tokens  ·  {out:,} output tokens  ·  Pricing: $3/M input · $15/M output (claude-sonnet-4-6)",
-        "queued_heading":       "## 📊 {} — Queued",
-        "queued_caption":       "Two analyses are already running. Yours will start automatically when a slot opens.",
-        "queued_info":          "**Your analysis is in the queue.**\n\nThe server allows 2 simultaneous analyses to avoid API rate limits. You're next in line — this page will update automatically when it starts.",
-        "waiting_caption":      "Waiting… {}s in queue",
-        "analysis_failed":      "**Analysis failed:** {}",
-        "try_again_btn":        "← Try Again",
-        "invest_desc":          "Strong investment opportunity with compelling fundamentals.",
-        "watch_desc":           "Interesting opportunity — monitor for further developments.",
-        "pass_desc":            "Risks outweigh opportunities at this time.",
-        "download_btn":         "⬇️  Download PDF Report",
-        "analyze_another_btn":  "🔄  Analyze Another Company",
-        "token_expander":       "Token Usage & Cost  —  **${:.4f} total**",
-        "token_caption":        "Pricing: claude-sonnet-4-6 · $3.00 / 1M input tokens · $15.00 / 1M output tokens",
-        "no_report":            "No report content was generated.",
-        "agent_col":            "Agent",
-        "input_tokens_col":     "Input tokens",
-        "output_tokens_col":    "Output tokens",
-        "cost_col":             "Cost (USD)",
-        "total_label":          "**TOTAL**",
-        "history_title":        "## 🕐 Analysis History",
-        "history_caption":      "All due diligence reports generated so far.",
-        "back_btn":             "← Back",
-        "back_running_btn":     "← Back to Running Analysis",
-        "no_history":           "No analyses yet. Submit a company on the main page to get started.",
-        "pdf_btn":              "⬇️ PDF",
-        "pdf_unavail":          "PDF unavailable",
-        "password_label":       "Password",
-        "password_placeholder": "Enter password to continue",
-        "unlock_btn":           "Unlock",
-        "wrong_password":       "Incorrect password.",
-        "lang_toggle":          "한국어",
-        "step_done":            "✓",
-        "step_running":         "⏳",
-        "progress_text":        "**{pct}%** — step {done} of {total}  ·  elapsed {elapsed}  ·  {eta}",
-        "eta_estimating":       "Estimating…",
-        "eta_remaining":        "~{} remaining",
-        "queue_heading":        "#### Active Analyses",
-        "queue_empty":          "No analyses running.",
-        "queue_status_running": "Running",
-        "queue_status_queued":  "Queued",
-        "queue_view_btn":       "View",
-        "queue_progress":       "{}%",
-        "queue_eta":            "~{} left",
-        "queue_started":        "Started {}s ago",
-        "back_to_form_btn":     "← Back to Form",
-        "job_picker_label":     "Switch analysis:",
-        "agent_outputs_heading":"📊 Agent Outputs",
-        "no_agent_outputs":     "No individual agent outputs available for this analysis.",
-        "view_details_btn":     "📄 Details",
-        "auto_approve_label":   "Skip human review (auto-approve all phases)",
-        "auto_approve_help":    "When checked, the pipeline runs straight through without pausing for review.",
-        "checkpoint_heading":   "🔍 {} — Review Required",
-        "checkpoint_phase1_title": "Phase 1 Complete: Research & Analysis",
-        "checkpoint_phase1_desc":  "6 research agents have finished. Review their outputs below before proceeding to synthesis.",
-        "checkpoint_phase2_title": "Phase 2 Complete: Synthesis",
-        "checkpoint_phase2_desc":  "R&A Synthesis, Risk Assessment, and Strategic Insight are complete. Review before proceeding to critique.",
-        "checkpoint_phase3_title": "Phase 3 Complete: Review & Critique",
-        "checkpoint_phase3_desc":  "Review, Critique, and DD Questions are complete. Review before generating the final report.",
-        "checkpoint_paused":       "⏸ Paused — awaiting review",
-        "checkpoint_feedback_label":      "Feedback (optional)",
-        "checkpoint_feedback_placeholder": "Add notes or adjustments for the next phase…",
-        "checkpoint_approve_btn":  "✅ Approve & Continue",
-        "checkpoint_cancel_btn":   "⛔ Cancel Analysis",
-    },
-    "ko": {
-        "app_title":            "## 📊 실사 에이전트",
-        "app_subtitle":         "기업을 입력하면 → AI 에이전트 15개가 4단계로 분석 → 매 단계 사람이 검토 → 투자 메모 + PDF 완성",
-        "history_btn":          "🕐 분석 기록",
-        "form_heading":         "#### 기업 분석 요청",
-        "company_label":        "기업명",
-        "company_placeholder":  "예: Apple, OpenAI, 카카오",
-        "url_label":            "공식 웹사이트 *(선택 — 분석 품질 향상)*",
-        "url_placeholder":      "https://example.com",
-        "report_lang_label":    "보고서 언어",
-        "docs_label":           "참고 문서 *(선택)*",
-        "docs_help":            "사업계획서, 10-K, 연간보고서 등 PDF",
-        "cost_caption":         "예상 비용: **분석당 $1 – $5** · 에이전트 15개 · claude-sonnet-4-6 · 입력 $3/M · 출력 $15/M",
-        "run_btn":              "🔍  실사 분석 시작",
-        "pipeline_heading":     "#### 에이전트 파이프라인",
-        "pipeline_caption":     "매 단계마다 **사람의 리뷰**(분홍 팔각형)를 거친 후 다음 단계로 진행. 오케스트레이터가 점수 평가 후 약한 에이전트 재실행(빨간 점선).",
-        "directory_heading":    "#### 에이전트 목록",
-        "directory_caption":    "에이전트를 클릭하면 분석 방법론과 데이터 소스를 확인할 수 있습니다.",
-        "how_it_works":         "**분석 방법:**",
-        "sources_label":        "**데이터 소스:**",
-        "methodology_expander": "방법론 & 소스",
-        "analyzing":            "## 📊 {} 분석 중…",
-        "running_caption":      "백그라운드에서 실행 중 — 페이지를 벗어났다가 언제든 돌아올 수 있습니다.",
-        "api_cost":             "**현재 API 비용: ${cost:.4f}**  ·  입력 토큰 {inp:,}개  ·  출력 토큰 {out:,}개  ·  가격: 입력 $3/M · 출력 $15/M (claude-sonnet-4-6)",
-        "queued_heading":       "## 📊 {} — 대기 중",
-        "queued_caption":       "현재 2개의 분석이 실행 중입니다. 슬롯이 열리면 자동으로 시작됩니다.",
-        "queued_info":          "**분석이 대기열에 있습니다.**\n\nAPI 속도 제한을 방지하기 위해 서버는 최대 2개의 동시 분석을 허용합니다. 다음 순서입니다 — 시작되면 이 페이지가 자동으로 업데이트됩니다.",
-        "waiting_caption":      "대기 중… {}초 경과",
-        "analysis_failed":      "**분석 실패:** {}",
-        "try_again_btn":        "← 다시 시도",
-        "invest_desc":          "강력한 투자 기회 — 탄탄한 펀더멘털을 보유하고 있습니다.",
-        "watch_desc":           "흥미로운 기회 — 추가 동향을 모니터링하세요.",
-        "pass_desc":            "현재 시점에서 리스크가 기회를 초과합니다.",
-        "download_btn":         "⬇️  PDF 보고서 다운로드",
-        "analyze_another_btn":  "🔄  다른 기업 분석",
-        "token_expander":       "토큰 사용량 & 비용  —  **총 ${:.4f}**",
-        "token_caption":        "가격: claude-sonnet-4-6 · 입력 $3.00 / 1M 토큰 · 출력 $15.00 / 1M 토큰",
-        "no_report":            "생성된 보고서 내용이 없습니다.",
-        "agent_col":            "에이전트",
-        "input_tokens_col":     "입력 토큰",
-        "output_tokens_col":    "출력 토큰",
-        "cost_col":             "비용 (USD)",
-        "total_label":          "**합계**",
-        "history_title":        "## 🕐 분석 기록",
-        "history_caption":      "지금까지 생성된 모든 실사 보고서",
-        "back_btn":             "← 뒤로",
-        "back_running_btn":     "← 진행 중인 분석으로 돌아가기",
-        "no_history":           "아직 분석 내역이 없습니다. 메인 페이지에서 기업을 입력하여 시작하세요.",
-        "pdf_btn":              "⬇️ PDF",
-        "pdf_unavail":          "PDF 없음",
-        "password_label":       "비밀번호",
-        "password_placeholder": "비밀번호를 입력하세요",
-        "unlock_btn":           "잠금 해제",
-        "wrong_password":       "비밀번호가 올바르지 않습니다.",
-        "lang_toggle":          "English",
-        "step_done":            "✓",
-        "step_running":         "⏳",
-        "progress_text":        "**{pct}%** — {done}/{total}단계  ·  경과 {elapsed}  ·  {eta}",
-        "eta_estimating":       "예상 중…",
-        "eta_remaining":        "~{} 남음",
-        "queue_heading":        "#### 진행 중인 분석",
-        "queue_empty":          "진행 중인 분석이 없습니다.",
-        "queue_status_running": "실행 중",
-        "queue_status_queued":  "대기 중",
-        "queue_view_btn":       "보기",
-        "queue_progress":       "{}%",
-        "queue_eta":            "~{} 남음",
-        "queue_started":        "{}초 전 시작",
-        "back_to_form_btn":     "← 입력 폼으로",
-        "job_picker_label":     "분석 전환:",
-        "agent_outputs_heading":"📊 에이전트 출력",
-        "no_agent_outputs":     "이 분석에 대한 개별 에이전트 출력이 없습니다.",
-        "view_details_btn":     "📄 상세",
-        "auto_approve_label":   "자동 승인 (단계별 리뷰 건너뛰기)",
-        "auto_approve_help":    "체크하면 리뷰 없이 전체 파이프라인이 자동으로 실행됩니다.",
-        "checkpoint_heading":   "🔍 {} — 리뷰 필요",
-        "checkpoint_phase1_title": "1단계 완료: 리서치 & 분석",
-        "checkpoint_phase1_desc":  "6개 리서치 에이전트가 완료되었습니다. 아래 결과를 검토한 후 종합 단계로 진행하세요.",
-        "checkpoint_phase2_title": "2단계 완료: 종합",
-        "checkpoint_phase2_desc":  "R&A 종합, 리스크 평가, 전략적 인사이트가 완료되었습니다. 비평 단계 진행 전 검토하세요.",
-        "checkpoint_phase3_title": "3단계 완료: 검토 & 비평",
-        "checkpoint_phase3_desc":  "검토, 비평, DD 질문서가 완료되었습니다. 최종 보고서 생성 전 검토하세요.",
-        "checkpoint_paused":       "⏸ 일시정지 — 리뷰 대기 중",
-        "checkpoint_feedback_label":      "피드백 (선택)",
-        "checkpoint_feedback_placeholder": "다음 단계를 위한 메모나 조정 사항을 입력하세요…",
-        "checkpoint_approve_btn":  "✅ 승인 & 계속",
-        "checkpoint_cancel_btn":   "⛔ 분석 취소",
-    },
-}
 
+@st.cache_resource
+def _analysis_queue() -> _AnalysisQueue:
+    """Process-wide analysis queue — shared across reruns and sessions."""
+    return _AnalysisQueue(_MAX_CONCURRENT_ANALYSES)
+
+
+# ── UI Translations ────────────────────────────────────────────────────────────
 
 def t(key: str, *args, **kwargs) -> str:
     """Return translated UI string for the current ui_lang session."""
-    lang = st.session_state.get("ui_lang", "en")
-    s = _UI.get(lang, _UI["en"]).get(key) or _UI["en"].get(key, key)
+    s = UI_STRINGS.get(st.session_state.get("ui_lang", "en"), UI_STRINGS["en"]).get(key, key)
     if args:
         return s.format(*args)
     if kwargs:
@@ -674,7 +693,7 @@ def t(key: str, *args, **kwargs) -> str:
 
 # ── Node labels (language-aware at render time) ────────────────────────────────
 
-_NODE_LABELS_EN = {
+_NODE_LABELS_EN = MappingProxyType({
     "input_processor":    "🔍 Processing inputs",
     "phase1_parallel":    "📊 Phase 1 — 6 research agents in parallel",
     "phase1_aggregator":  "✅ Phase 1 aggregated",
@@ -696,9 +715,9 @@ _NODE_LABELS_EN = {
     "report_writer":      "📝 Writing investment memo",
     "codex_verify_final": "🔒 Codex — Final verification",
     "codex_verify_final_retry": "🔄 Codex — Final re-verification",
-}
+})
 
-_NODE_LABELS_KO = {
+_NODE_LABELS_KO = MappingProxyType({
     "input_processor":    "🔍 입력 처리 중",
     "phase1_parallel":    "📊 1단계 — 리서치 에이전트 6개 병렬 실행",
     "phase1_aggregator":  "✅ 1단계 집계 완료",
@@ -720,10 +739,14 @@ _NODE_LABELS_KO = {
     "report_writer":      "📝 투자 메모 작성 중",
     "codex_verify_final": "🔒 Codex — 최종 검증",
     "codex_verify_final_retry": "🔄 Codex — 최종 재검증",
-}
+})
+
+# Every node name _run_pipeline records has an entry in both tables, so the
+# render loops resolve labels with one lookup on this map
+_NODE_LABELS = MappingProxyType({"en": _NODE_LABELS_EN, "ko": _NODE_LABELS_KO})
 
 # Weighted % of total runtime each node typically consumes (must sum to 100)
-NODE_WEIGHTS = {
+NODE_WEIGHTS = MappingProxyType({
     "input_processor":    2,
     "phase1_parallel":    36,
     "phase1_aggregator":  1,
@@ -737,368 +760,8 @@ NODE_WEIGHTS = {
     "dd_questions":       4,
     "report_structure":   4,
     "report_writer":      9,
-}
-
-# ── Pipeline graphviz diagram ─────────────────────────────────────────────────
-PIPELINE_GRAPH = """
-digraph pipeline {
-    rankdir=LR;
-    node [fontname="Helvetica" fontsize=9 style="rounded,filled" shape=box margin=0.15];
-    edge [arrowsize=0.6 color="#94a3b8"];
-
-    START [label="START" shape=circle fillcolor="#6366f1" fontcolor=white
-           style=filled width=0.45 height=0.45 fontsize=8];
-    END   [label="END"   shape=circle fillcolor="#059669" fontcolor=white
-           style=filled width=0.45 height=0.45 fontsize=8];
-
-    inp [label="Input\nProcessor" fillcolor="#e0e7ff" color="#6366f1" fontcolor="#3730a3"];
-
-    subgraph cluster_p1 {
-        label="Phase 1  —  Parallel (6 agents)" fontsize=9 color="#2563eb"
-        fillcolor="#eff6ff" style="rounded,filled";
-        mkt  [label="Market\nAnalysis"   fillcolor="#bfdbfe" color="#1d4ed8" fontcolor="#1e3a8a"];
-        comp [label="Competitor\nAnalysis" fillcolor="#bfdbfe" color="#1d4ed8" fontcolor="#1e3a8a"];
-        fin  [label="Financial\nAnalysis"  fillcolor="#bfdbfe" color="#1d4ed8" fontcolor="#1e3a8a"];
-        tec  [label="Tech\nAnalysis"      fillcolor="#bfdbfe" color="#1d4ed8" fontcolor="#1e3a8a"];
-        leg  [label="Legal &\nRegulatory" fillcolor="#bfdbfe" color="#1d4ed8" fontcolor="#1e3a8a"];
-        team [label="Team\nAnalysis"      fillcolor="#bfdbfe" color="#1d4ed8" fontcolor="#1e3a8a"];
-    }
-
-    cp1 [label="👤 Human\nReview 1" fillcolor="#fce7f3" color="#db2777" fontcolor="#831843"
-         shape=octagon fontsize=8];
-
-    subgraph cluster_p2 {
-        label="Phase 2  —  Synthesis" fontsize=9 color="#7c3aed"
-        fillcolor="#f5f3ff" style="rounded,filled";
-        ras  [label="R&A\nSynthesis" fillcolor="#ddd6fe" color="#7c3aed" fontcolor="#4c1d95"];
-        risk [label="Risk\nAssessment" fillcolor="#ddd6fe" color="#7c3aed" fontcolor="#4c1d95"];
-        si   [label="Strategic\nInsight" fillcolor="#ddd6fe" color="#7c3aed" fontcolor="#4c1d95"];
-    }
-
-    cp2 [label="👤 Human\nReview 2" fillcolor="#fce7f3" color="#db2777" fontcolor="#831843"
-         shape=octagon fontsize=8];
-
-    subgraph cluster_p3 {
-        label="Phase 3  —  Review & Critique" fontsize=9 color="#d97706"
-        fillcolor="#fffbeb" style="rounded,filled";
-        rev  [label="Review\nAgent"    fillcolor="#fde68a" color="#b45309" fontcolor="#78350f"];
-        crit [label="Critique\nAgent"  fillcolor="#fde68a" color="#b45309" fontcolor="#78350f"];
-        ddq  [label="DD\nQuestions"    fillcolor="#fde68a" color="#b45309" fontcolor="#78350f"];
-    }
-
-    router [label="Critique\nRouter" fillcolor="#a7f3d0" color="#059669" fontcolor="#064e3b"
-            shape=diamond fontsize=8];
-
-    cp3 [label="👤 Human\nReview 3" fillcolor="#fce7f3" color="#db2777" fontcolor="#831843"
-         shape=octagon fontsize=8];
-
-    subgraph cluster_p4 {
-        label="Phase 4  —  Report" fontsize=9 color="#1e40af"
-        fillcolor="#eff6ff" style="rounded,filled";
-        rstr [label="Report\nStructure" fillcolor="#bfdbfe" color="#1d4ed8" fontcolor="#1e3a8a"];
-        rwrt [label="Report\nWriter"    fillcolor="#bfdbfe" color="#1d4ed8" fontcolor="#1e3a8a"];
-    }
-
-    START -> inp;
-    inp -> mkt; inp -> comp; inp -> fin; inp -> tec; inp -> leg; inp -> team;
-    mkt -> cp1; comp -> cp1; fin -> cp1; tec -> cp1; leg -> cp1; team -> cp1;
-    cp1 -> ras; cp1 -> risk;
-    ras -> si; risk -> si;
-    si -> cp2;
-    cp2 -> rev;
-    rev -> crit;
-    crit -> router;
-    router -> ddq [label=" pass " fontsize=7 color="#059669"];
-    ddq -> cp3;
-    cp3 -> rstr;
-    rstr -> rwrt;
-    rwrt -> END;
-
-    // Feedback loop edges (dashed)
-    edge [style=dashed color="#dc2626" arrowsize=0.5];
-    router -> rev  [label="conditional\n(selective rerun)" fontsize=6 color="#dc2626"];
-    router -> mkt  [label="fail\n(full restart)" fontsize=6 color="#dc2626"];
-}
-"""
-
-# ── Agent directory data (English) ────────────────────────────────────────────
-AGENT_PHASES = [
-    {
-        "label": "Phase 1 — Parallel Research",
-        "color": "#1d4ed8",
-        "bg": "#eff6ff",
-        "description": "6 specialist agents run **simultaneously**. Each independently researches a different dimension of the company. **Human review required** before proceeding to synthesis.",
-        "agents": [
-            {
-                "icon": "🌍",
-                "name": "Market Analysis",
-                "role": "TAM/SAM/SOM for ALL markets, CAGR, trends, and market drivers.",
-                "methodology": [
-                    "Estimates TAM/SAM/SOM for each business line with specific dollar figures",
-                    "Calculates historical and projected 5-year CAGR",
-                    "Maps key market trends, drivers, and geographic breakdown",
-                    "Identifies macro tailwinds/headwinds and demand-side dynamics",
-                    "Cross-verifies all figures with 3+ sources",
-                ],
-                "sources": ["Web search", "News search", "Yahoo Finance", "Google Trends", "FRED macroeconomic data"],
-            },
-            {
-                "icon": "🏢",
-                "name": "Competitor Analysis",
-                "role": "Competitor ID across all business lines, comparison matrix.",
-                "methodology": [
-                    "Identifies direct and indirect competitors across all business lines",
-                    "Builds comparison matrix (product, pricing, financials, market share, talent)",
-                    "Analyzes market share trends and competitive positioning",
-                    "Assesses competitive gaps and pricing power dynamics",
-                    "Includes actual revenue/market cap for public competitors",
-                ],
-                "sources": ["Web search", "News search", "Yahoo Finance", "Google Trends"],
-            },
-            {
-                "icon": "💰",
-                "name": "Financial Analysis",
-                "role": "5-year financials, ratios, cash flow + DCF/Market-based/Asset-based valuation.",
-                "methodology": [
-                    "Pulls live financial data: revenue, margins, balance sheet, cash flow",
-                    "Performs DCF with explicit WACC and terminal growth assumptions",
-                    "Runs market-based valuation (P/E, EV/EBITDA, P/S) with domestic + international comps",
-                    "Calculates fair value range (low/mid/high) with methodology",
-                    "Flags accounting red flags and revenue concentration risks",
-                ],
-                "sources": ["Yahoo Finance (yfinance)", "SEC EDGAR (10-K, 10-Q)", "Web search", "Uploaded PDFs"],
-            },
-            {
-                "icon": "🔬",
-                "name": "Tech Analysis",
-                "role": "Core tech inventory, IP/patents, tech maturity vs. competitors.",
-                "methodology": [
-                    "Inventories core technologies powering each business line",
-                    "Assesses IP and patent portfolio (count, key patents, pending)",
-                    "Evaluates tech maturity and moat strength vs. competitors",
-                    "Reviews R&D investment levels and engineering capacity",
-                    "Translates technical details into investor-friendly language",
-                ],
-                "sources": ["Web search", "News search", "GitHub API", "USPTO PatentsView"],
-            },
-            {
-                "icon": "⚖️",
-                "name": "Legal & Regulatory",
-                "role": "Investment structure risks + business regulatory risks.",
-                "methodology": [
-                    "Evaluates investment structure risks (fund carry, exit, reputation)",
-                    "Reviews business regulatory compliance across jurisdictions",
-                    "Searches for active litigation, settlements, and enforcement actions",
-                    "Assesses IP risks, data privacy posture, and ESG exposure",
-                    "Flags corporate governance issues and related-party transactions",
-                ],
-                "sources": ["Web search", "News search", "USPTO PatentsView", "Uploaded PDFs"],
-            },
-            {
-                "icon": "👥",
-                "name": "Team Analysis",
-                "role": "Leadership profiles, capability analysis, departure history.",
-                "methodology": [
-                    "Profiles CEO/founder, C-suite, and key executives",
-                    "Assesses team capabilities vs. next growth phase requirements",
-                    "Reviews departure history and succession planning",
-                    "Evaluates board composition and advisory quality",
-                    "Surfaces culture signals from Glassdoor, press, and social media",
-                ],
-                "sources": ["Web search", "News search", "LinkedIn (via web)"],
-            },
-        ],
-    },
-    {
-        "label": "Phase 2 — Synthesis",
-        "color": "#7c3aed",
-        "bg": "#f5f3ff",
-        "description": "R&A Synthesis + Risk Assessment run **in parallel**, then Strategic Insight runs **sequentially** (needs both). **Human review required** before proceeding to critique.",
-        "agents": [
-            {
-                "icon": "📊",
-                "name": "R&A Synthesis",
-                "role": "Synthesizes Phase 1 into 3-5 core investment arguments + CDD/LDD/FDD scorecard.",
-                "methodology": [
-                    "Distills 6 reports into 3-5 core investment arguments ranked by conviction",
-                    "Builds attractiveness scorecard: CDD, LDD, FDD (each 1-10)",
-                    "Checks cross-report consistency and flags contradictions",
-                    "Identifies key findings and information gaps",
-                ],
-                "sources": ["All Phase 1 reports", "Web search", "Yahoo Finance"],
-            },
-            {
-                "icon": "⚠️",
-                "name": "Risk Assessment",
-                "role": "ALL risks with probability/impact/severity matrix + mitigation strategies.",
-                "methodology": [
-                    "Identifies risks across 6 categories: legal, business, financial, reputation, tech, operational",
-                    "Scores each risk: probability (1-5) × impact (1-5) = severity",
-                    "Proposes specific mitigation strategies with feasibility rating",
-                    "Determines overall risk level and risk-adjusted assessment",
-                ],
-                "sources": ["All Phase 1 reports", "Web search", "News search"],
-            },
-            {
-                "icon": "🎯",
-                "name": "Strategic Insight",
-                "role": "INVEST/WATCH/PASS decision + detailed rationale + synergy analysis.",
-                "methodology": [
-                    "Renders preliminary investment recommendation with detailed rationale",
-                    "Analyzes portfolio fit and strategic synergies",
-                    "Identifies key conditions that would change the recommendation",
-                    "Outlines investment timeline and exit strategy considerations",
-                    "Anti-bias: does NOT default to WATCH — decisive recommendation required",
-                ],
-                "sources": ["All Phase 1 + Phase 2 reports", "Web search", "Yahoo Finance"],
-            },
-        ],
-    },
-    {
-        "label": "Phase 3 — Review & Critique",
-        "color": "#b45309",
-        "bg": "#fffbeb",
-        "description": "Sequential: **Review** (verify claims) → **Critique** (score 5 criteria) → **DD Questions**. The Critique agent triggers a **feedback loop** if quality is insufficient (max 2 iterations). **Human review required** before generating the final report.",
-        "agents": [
-            {
-                "icon": "🔎",
-                "name": "Review Agent",
-                "role": "Source verification, quantitative accuracy, logical consistency.",
-                "methodology": [
-                    "Verifies material claims using live tool calls",
-                    "Checks quantitative accuracy of financial figures and market sizes",
-                    "Assesses qualitative backing and logical consistency",
-                    "Identifies stale data and cross-report inconsistencies",
-                    "Classifies claims as VERIFIED / UNVERIFIED / CONTRADICTED / STALE",
-                ],
-                "sources": ["Web search", "News search", "Yahoo Finance"],
-            },
-            {
-                "icon": "📋",
-                "name": "Critique Agent",
-                "role": "Scores 5 criteria (1-10): Logic, Completeness, Accuracy, Narrative Bias, Insight Effectiveness.",
-                "methodology": [
-                    "Scores Logic (1-10): Are investment arguments logically sound?",
-                    "Scores Completeness (1-10): Does the analysis cover all material dimensions?",
-                    "Scores Accuracy (1-10): Are facts and figures correct and current?",
-                    "Scores Narrative Bias (1-10): Is the analysis balanced and objective?",
-                    "Scores Insight Effectiveness (1-10): Does it provide actionable insights?",
-                    "Total >= 35 AND all >= 7: PASS | < 30 or 3+ items < 5: FAIL | Otherwise: CONDITIONAL (selective rerun)",
-                ],
-                "sources": ["All prior agent outputs (no tools — pure evaluation)"],
-            },
-            {
-                "icon": "❓",
-                "name": "DD Questions",
-                "role": "Unresolved issues list + structured DD Questionnaire.",
-                "methodology": [
-                    "Lists all unresolved issues remaining after analysis",
-                    "Creates structured DD Questionnaire with target, priority, and expected scenarios",
-                    "Recommends next steps for the investment team",
-                    "Only runs after critique passes quality threshold",
-                ],
-                "sources": ["All prior agent outputs (no tools)"],
-            },
-        ],
-    },
-    {
-        "label": "Phase 4 — Report",
-        "color": "#1e40af",
-        "bg": "#eff6ff",
-        "description": "**Report Structure** designs the Why/What/How/Risk/Recommendations framework, then **Report Writer** produces the final polished memo.",
-        "agents": [
-            {
-                "icon": "📐",
-                "name": "Report Structure",
-                "role": "Designs Why/What/How/Risk/Recommendations TOC with 20-30 page target.",
-                "methodology": [
-                    "Designs report following Why/What/How/Risk/Recommendations framework",
-                    "Specifies data sources and key data points for each section",
-                    "Sets target page counts and narrative arcs",
-                    "Outlines executive summary and appendix sections",
-                ],
-                "sources": ["All prior agent outputs (no tools)"],
-            },
-            {
-                "icon": "📝",
-                "name": "Report Writer",
-                "role": "Writes insight-driven final report with INVEST/WATCH/PASS recommendation.",
-                "methodology": [
-                    "Follows report structure to write comprehensive Markdown memo",
-                    "Includes specific numbers, data points, and inline source citations",
-                    "Balances bull and bear cases with evidence-based reasoning",
-                    "Renders final INVEST/WATCH/PASS recommendation with confidence level",
-                    "Includes DD Questionnaire and next steps",
-                ],
-                "sources": ["All prior agent outputs + Report Structure"],
-            },
-        ],
-    },
-]
-
-
-def _get_agent_phases(lang: str) -> list:
-    """Return AGENT_PHASES with names/descriptions translated for the given language."""
-    if lang == "en":
-        return AGENT_PHASES
-
-    # Korean overrides — methodology/sources stay in English (technical content)
-    ko_meta = [
-        {
-            "label": "1단계 — 병렬 리서치",
-            "description": "6개의 전문 에이전트가 **동시에** 실행됩니다. 각각 기업의 다른 차원을 독립적으로 리서치합니다. 종합 단계 진행 전 **사람의 리뷰**가 필요합니다.",
-            "agents": [
-                ("🌍", "시장 분석",          "TAM/SAM/SOM, CAGR, 시장 트렌드를 분석합니다."),
-                ("🏢", "경쟁사 분석",        "모든 사업 라인의 경쟁사를 파악하고 비교 매트릭스를 구축합니다."),
-                ("💰", "재무 분석",          "5년 재무제표, 비율, 현금흐름 + DCF/시장기반/자산기반 밸류에이션"),
-                ("🔬", "기술 분석",          "핵심 기술, IP/특허, 기술 성숙도를 경쟁사와 비교 분석합니다."),
-                ("⚖️", "법률·규제 분석",     "투자 구조 리스크 + 비즈니스 규제 리스크를 분석합니다."),
-                ("👥", "팀 분석",            "리더십 프로필, 역량 분석, 이탈 이력을 평가합니다."),
-            ],
-        },
-        {
-            "label": "2단계 — 종합",
-            "description": "R&A 종합 + 리스크 평가가 **병렬**로 실행되고, 전략적 인사이트가 **순차적**으로 실행됩니다. 비평 단계 진행 전 **사람의 리뷰**가 필요합니다.",
-            "agents": [
-                ("📊", "R&A 종합",           "1단계를 3-5개 핵심 투자 논거 + CDD/LDD/FDD 스코어카드로 종합합니다."),
-                ("⚠️", "리스크 평가",         "모든 리스크를 확률/영향/심각도 매트릭스로 분석합니다."),
-                ("🎯", "전략적 인사이트",     "INVEST/WATCH/PASS 결정 + 상세 근거 + 시너지 분석"),
-            ],
-        },
-        {
-            "label": "3단계 — 검토 & 비평",
-            "description": "순차: **검토** (주장 검증) → **비평** (5개 기준 채점) → **DD 질문서**. 비평 에이전트가 품질 미달 시 **피드백 루프**를 실행합니다 (최대 2회). 최종 보고서 생성 전 **사람의 리뷰**가 필요합니다.",
-            "agents": [
-                ("🔎", "검토 에이전트",       "출처 검증, 정량적 정확도, 논리적 일관성을 확인합니다."),
-                ("📋", "비평 에이전트",       "5개 기준 채점(1-10): 논리, 완성도, 정확도, 서술 편향, 인사이트 실효성"),
-                ("❓", "DD 질문서",           "미해결 이슈 목록 + 구조화된 DD 질문서를 작성합니다."),
-            ],
-        },
-        {
-            "label": "4단계 — 보고서",
-            "description": "**보고서 구조** 에이전트가 Why/What/How/Risk/Recommendations 프레임워크를 설계하고, **보고서 작성자**가 최종 메모를 작성합니다.",
-            "agents": [
-                ("📐", "보고서 구조",        "Why/What/How/Risk/Recommendations TOC를 설계합니다."),
-                ("📝", "보고서 작성자",       "인사이트 중심의 최종 보고서를 작성합니다."),
-            ],
-        },
-    ]
-
-    result = []
-    for phase_en, phase_ko in zip(AGENT_PHASES, ko_meta):
-        phase_new = dict(phase_en)
-        phase_new["label"]       = phase_ko["label"]
-        phase_new["description"] = phase_ko["description"]
-        new_agents = []
-        for agent_en, (icon_ko, name_ko, role_ko) in zip(phase_en["agents"], phase_ko["agents"]):
-            agent_new          = dict(agent_en)
-            agent_new["icon"]  = icon_ko
-            agent_new["name"]  = name_ko
-            agent_new["role"]  = role_ko
-            new_agents.append(agent_new)
-        phase_new["agents"] = new_agents
-        result.append(phase_new)
-    return result
+})
+_TOTAL_NODE_WEIGHT = sum(NODE_WEIGHTS.values())  # constant — not re-summed per poll
 
 
 # ── Page config ───────────────────────────────────────────────────────────────
@@ -1110,46 +773,21 @@ st.set_page_config(
 )
 
 # ── Custom CSS ────────────────────────────────────────────────────────────────
-st.markdown("""
-<style>
-  .main .block-container { max-width: 1100px; padding-top: 1.5rem; }
-  .invest-badge {
-      background:#dcfce7; color:#15803d;
-      padding:14px 40px; border-radius:14px;
-      font-size:2.2rem; font-weight:900; letter-spacing:0.08em;
-      display:inline-block; margin-bottom:6px;
-  }
-  .watch-badge {
-      background:#fef3c7; color:#b45309;
-      padding:14px 40px; border-radius:14px;
-      font-size:2.2rem; font-weight:900; letter-spacing:0.08em;
-      display:inline-block; margin-bottom:6px;
-  }
-  .pass-badge {
-      background:#fee2e2; color:#b91c1c;
-      padding:14px 40px; border-radius:14px;
-      font-size:2.2rem; font-weight:900; letter-spacing:0.08em;
-      display:inline-block; margin-bottom:6px;
-  }
-  .agent-card {
-      background:#f8fafc; border:1px solid #e2e8f0;
-      border-radius:10px; padding:14px 16px; margin-bottom:10px;
-  }
-  .source-tag {
-      display:inline-block; background:#e0e7ff; color:#3730a3;
-      border-radius:99px; padding:2px 10px; font-size:0.75rem;
-      margin:2px 2px 2px 0;
-  }
-  .lang-toggle { font-size:0.8rem !important; padding:3px 10px !important; }
-</style>
-""", unsafe_allow_html=True)
+# Re-emitted on every full rerun (Streamlit drops elements a rerun doesn't
+# send); the polling fragments don't re-execute this.
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 # ── Password gate ─────────────────────────────────────────────────────────────
-_app_password = ""
-try:
-    _app_password = str(st.secrets.get("APP_PASSWORD", ""))
-except Exception:
-    pass
+@st.cache_resource(show_spinner=False)
+def _get_app_password() -> str:
+    """APP_PASSWORD from Streamlit secrets, read once per process ("" = no gate)."""
+    try:
+        return str(st.secrets.get("APP_PASSWORD", ""))
+    except Exception:
+        return ""
+
+
+_app_password = _get_app_password()
 
 if _app_password:
     if not st.session_state.get("authenticated"):
@@ -1168,7 +806,7 @@ if _app_password:
             placeholder=t("password_placeholder"),
         )
         if st.button(t("unlock_btn"), type="primary"):
-            if pwd == _app_password:
+            if hmac.compare_digest(pwd.encode("utf-8"), _app_password.encode("utf-8")):
                 st.session_state.authenticated = True
                 st.rerun()
             else:
@@ -1190,18 +828,23 @@ if _missing:
     st.stop()
 
 # ── Session state defaults ─────────────────────────────────────────────────────
-for key, default in [
-    ("phase", "form"),
-    ("active_jobs", []),        # list of job_id strings submitted by this user
-    ("results", {}),            # {job_id: {result, pdf_bytes}}
-    ("viewing_job", None),      # which job the running/results screen is showing
-    ("company", ""),
-    ("history_pdf_cache", {}),
-    ("history_detail_job", None),
-    ("ui_lang", "ko"),
-]:
-    if key not in st.session_state:
-        st.session_state[key] = default
+# Re-evaluated on every script run, so each new session gets its own fresh
+# list/dict objects.
+_SESSION_DEFAULTS = {
+    "phase": "form",
+    "active_jobs": [],          # list of job_id strings submitted by this user
+    "results": {},              # {job_id: {result, pdf_path, ...}} — paths, not bytes
+    "viewing_job": None,        # which job the running/results screen is showing
+    "company": "",
+    "history_pdf_fetched": {},  # {job_id: bool} — PDF fetch attempted / succeeded
+    "history_detail_job": None,
+    "ui_lang": "ko",
+}
+for key, default in _SESSION_DEFAULTS.items():
+    st.session_state.setdefault(key, default)
+
+# UI strings for this rerun's language (every language toggle triggers a rerun)
+ui = UI_NS.get(st.session_state.ui_lang, UI_NS["en"])
 
 # On first load (fresh deploy/reboot), cancel any orphaned running/queued jobs
 if "startup_cleanup_done" not in st.session_state:
@@ -1224,24 +867,66 @@ def _lang_toggle(key_suffix: str = ""):
 # HELPERS
 # ─────────────────────────────────────────────────────────────────────────────
 
-def render_agent_card(agent: dict):
-    with st.container():
-        st.markdown(
-            f"<div class='agent-card'>"
-            f"<b>{agent['icon']} {agent['name']}</b><br>"
-            f"<span style='color:#475569;font-size:0.88rem'>{agent['role']}</span>"
-            f"</div>",
-            unsafe_allow_html=True,
-        )
-        with st.expander(t("methodology_expander")):
-            st.markdown(t("how_it_works"))
-            for step in agent["methodology"]:
-                st.markdown(f"- {step}")
-            st.markdown(t("sources_label"))
-            tags = "".join(
-                f"<span class='source-tag'>{s}</span>" for s in agent["sources"]
-            )
-            st.markdown(tags, unsafe_allow_html=True)
+@st.cache_resource(show_spinner=False)
+def _pipeline_svg() -> str | None:
+    """PIPELINE_GRAPH laid out once per process as a container-width SVG.
+
+    Returns None when the graphviz package or the ``dot`` executable is
+    unavailable — callers fall back to st.graphviz_chart (browser-side layout).
+    """
+    try:
+        import graphviz
+        svg = graphviz.Source(PIPELINE_GRAPH).pipe(format="svg").decode("utf-8")
+    except Exception:
+        return None
+    start = svg.find("<svg")
+    if start == -1:
+        return None  # unexpected dot output — use the fallback
+    svg = svg[start:]
+    # Drop the fixed pt size so the diagram scales with its column
+    return re.sub(r'<svg width="[^"]*" height="[^"]*"', '<svg width="100%"', svg, count=1)
+
+
+# cache_resource, not cache_data: bytes are immutable, so every session can
+# share the one object instead of unpickling its own copy per call.
+@st.cache_resource(show_spinner=False, ttl=24 * 3600, max_entries=32)
+def _report_file_bytes(storage_path: str) -> bytes:
+    data = download_file(storage_path)
+    if not data:
+        raise FileNotFoundError(storage_path)  # exceptions aren't cached — retry later
+    return data
+
+
+def _fetch_report_file(storage_path: str) -> bytes | None:
+    """Report PDF/PPTX/DOCX bytes from storage, cached across reruns and sessions.
+
+    Uploaded reports are immutable (one path per job), so the storage path is
+    a sufficient cache key. Session state keeps only the path and calls this
+    at render time, so no session holds report bytes of its own.
+    """
+    try:
+        return _report_file_bytes(storage_path)
+    except FileNotFoundError:
+        return None
+
+
+# Recommendation badges — a fixed set, so the HTML is built once
+_RESULT_BADGE_HTML = {
+    rec: f'<div class="{cls}-badge">{rec}</div>'
+    for rec, cls in (("INVEST", "invest"), ("WATCH", "watch"), ("PASS", "pass"), ("N/A", "na"))
+}
+_HISTORY_BADGE_HTML = {
+    rec: (
+        f"<span style='{style};padding:3px 12px;border-radius:8px;"
+        f"font-weight:700;font-size:0.85rem'>{rec}</span>"
+    )
+    for rec, style in (
+        ("INVEST", "background:#dcfce7;color:#15803d"),
+        ("WATCH",  "background:#fef3c7;color:#b45309"),
+        ("PASS",   "background:#fee2e2;color:#b91c1c"),
+        ("N/A",    "background:#f1f5f9;color:#64748b"),
+    )
+}
 
 
 def _render_nested_dict(d: dict, indent: int = 0) -> None:
@@ -1445,15 +1130,25 @@ def _render_agent_detail(key: str, data) -> None:
     # Sources at bottom
     sources = data.get("sources", [])
     if sources:
-        with st.expander("Sources"):
-            for src in sources:
-                if isinstance(src, dict):
-                    label = src.get("label", src.get("url", ""))
-                    url = src.get("url", "")
-                    tool = src.get("tool", "")
-                    st.markdown(f"- [{label}]({url}) ({tool})" if url else f"- {label} ({tool})")
+        # One native <details> block rather than an st.expander + a markdown
+        # element per source (agents commonly cite dozens)
+        items = []
+        for src in sources:
+            if isinstance(src, dict):
+                label = escape(str(src.get("label", src.get("url", ""))))
+                url = str(src.get("url") or "").strip()
+                tool = escape(str(src.get("tool", "")))
+                # URLs come from the LLM — only link http(s), never javascript:/data: etc.
+                if url.lower().startswith(("http://", "https://")):
+                    items.append(f'<li><a href="{escape(url)}" target="_blank" rel="noopener noreferrer">{label}</a> ({tool})</li>')
                 else:
-                    st.markdown(f"- {src}")
+                    items.append(f"<li>{label} ({tool})</li>")
+            else:
+                items.append(f"<li>{escape(str(src))}</li>")
+        st.markdown(
+            f"<details class='agent-sources'><summary>Sources</summary><ul>{''.join(items)}</ul></details>",
+            unsafe_allow_html=True,
+        )
 
 
 def _render_agent_outputs(agent_outputs, lang: str = "en") -> None:
@@ -1464,7 +1159,7 @@ def _render_agent_outputs(agent_outputs, lang: str = "en") -> None:
         except (json.JSONDecodeError, ValueError):
             pass
     if not agent_outputs or not isinstance(agent_outputs, dict):
-        st.info(t("no_agent_outputs"))
+        st.info(ui.no_agent_outputs)
         return
 
     labels = _AGENT_LABELS_KO if lang == "ko" else _AGENT_LABELS_EN
@@ -1479,12 +1174,168 @@ def _render_agent_outputs(agent_outputs, lang: str = "en") -> None:
 
         st.markdown(f"**{heading}**")
         for key, icon in phase_keys_with_data:
-            label = labels.get(key, key.replace("_", " ").title())
+            label = labels.get(key) or key.replace("_", " ").title()
             with st.expander(f"{icon} {label}"):
                 _render_agent_detail(key, agent_outputs[key])
         st.markdown("")
 
 
+# ── Live polling fragments ─────────────────────────────────────────────────────
+# Only the fragment body re-executes on each poll; the rest of the page (CSS,
+# headers, buttons) is left alone until the job changes state, at which point
+# the fragment triggers a full rerun so the screen can switch.
+
+_PHASE1_AGENTS = (
+    "market_analysis", "competitor_analysis", "financial_analysis",
+    "tech_analysis", "legal_regulatory", "team_analysis",
+)
+_PHASE2_AGENTS = ("ra_synthesis", "risk_assessment")
+
+# Map: after this node completes, what runs next?
+_NEXT_STEP = MappingProxyType({
+    "input_processor":    "phase1_parallel",
+    "phase1_parallel":    "phase1_aggregator",
+    "phase1_aggregator":  "phase2_parallel",
+    "phase2_parallel":    "strategic_insight",
+    "strategic_insight":  "phase2_aggregator",
+    "phase2_aggregator":  "review_agent",
+    "review_agent":       "critique_agent",
+    "critique_agent":     "dd_questions",       # default if pass
+    "selective_rerun":    "review_agent",       # second review
+    "phase1_restart":     "phase1_parallel",    # full restart
+    "dd_questions":       "report_structure",
+    "report_structure":   "report_writer",
+})
+
+
+@st.fragment(run_every=5.0)
+def _queued_status(job_id: str) -> None:
+    """Queue position + wait time for a job that hasn't started yet."""
+    job = read_job(job_id)
+    if job["status"] != "queued":
+        st.rerun()
+    # None once a worker has picked it up but before status flips to running
+    st.info(t("queued_info", _analysis_queue().position(job_id) or 1))
+    elapsed_sec = time.time() - (job.get("start_time") or time.time())
+    st.caption(t("waiting_caption", int(elapsed_sec)))
+
+
+@st.fragment(run_every=3.0)
+def _report_files_poll(job_id: str) -> None:
+    """Wait for a completed job's report files, then rerun to show the downloads."""
+    job = read_job(job_id)
+    if report_files_pending(job):
+        return
+    entry = st.session_state.results.get(job_id)
+    if entry is not None:
+        entry["pdf_path"] = job.get("pdf_path") or ""
+        # Stripped/expired status reads as failed so the results screen stops waiting
+        entry["pdf_status"] = job.get("pdf_status") or ("ready" if entry["pdf_path"] else "failed")
+        entry["pptx_path"] = job.get("pptx_path", "")
+        entry["docx_path"] = job.get("docx_path", "")
+        entry["agent_outputs"] = job.get("agent_outputs") or entry.get("agent_outputs") or {}
+    st.rerun()
+
+
+@st.fragment(run_every=3.0)
+def _running_progress(job_id: str) -> None:
+    """Progress bar, live cost, completed steps and current step of a running job."""
+    job = read_job(job_id)
+    if job["status"] in ("complete", "error", "cancelled", "checkpoint", "queued"):
+        st.rerun()
+    _node_labels = _NODE_LABELS.get(st.session_state.get("ui_lang"), _NODE_LABELS_EN)
+
+    progress    = job.get("progress") or []
+    start_time  = job.get("start_time") or time.time()
+    elapsed_sec = time.time() - start_time
+
+    # ── Progress calculation ───────────────────────────────────────────
+    # Use set so feedback-loop reruns don't double-count weights
+    unique_nodes = set(progress)
+    completed_weight = sum(NODE_WEIGHTS.get(n, 0) for n in unique_nodes)
+    pct = min(completed_weight / _TOTAL_NODE_WEIGHT, 1.0)  # cap at 100%
+
+    # Elapsed + estimated remaining
+    def _fmt_time(seconds: float) -> str:
+        seconds = int(seconds)
+        if seconds < 60:
+            return f"{seconds}s"
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+
+    elapsed_str = _fmt_time(elapsed_sec)
+    if pct > 0.02:
+        est_total  = elapsed_sec / pct
+        remaining  = max(0, est_total - elapsed_sec)
+        eta_str    = t("eta_remaining", _fmt_time(remaining))
+    else:
+        eta_str = ui.eta_estimating
+
+    # ── Progress bar + stats row ───────────────────────────────────────
+    steps_done  = len(progress)
+    steps_total = len(_node_labels)
+    st.progress(pct, text=t(
+        "progress_text",
+        pct=int(pct * 100),
+        done=steps_done,
+        total=steps_total,
+        elapsed=elapsed_str,
+        eta=eta_str,
+    ))
+
+    # ── Live cost tracker ──────────────────────────────────────────────
+    token_usage = job.get("token_usage") or {}
+    total_in, total_out, total_cost = _usage_totals(token_usage)
+    if token_usage:
+        st.caption(t("api_cost", cost=total_cost, inp=total_in, out=total_out))
+
+    st.markdown("")
+
+    # ── Completed steps ────────────────────────────────────────────────
+    # Per-phase costs don't depend on the node loop below — compute them once
+    _phase_costs = {
+        "phase1_parallel": sum(token_usage.get(a, {}).get("cost_usd", 0) for a in _PHASE1_AGENTS),
+        "phase2_parallel": sum(token_usage.get(a, {}).get("cost_usd", 0) for a in _PHASE2_AGENTS),
+    }
+
+    # Collected into one markdown element (instead of one st.write per step)
+    # so each poll sends a single delta; "$" is escaped so two costs can't be
+    # read as an inline-math span.
+    step_lines: list[str] = []
+    for node in progress:
+        # Skip non-node entries (critique_router:pass, budget_cap:*, etc.)
+        if ":" in node:
+            route_label = node.split(":", 1)[1]
+            step_lines.append(f"↳ {route_label}")
+            continue
+
+        # Fallback only for rows written by older builds with other node names
+        label = _node_labels.get(node) or node.replace("_", " ").title()
+        # Show per-phase cost for parallel steps
+        if node in _phase_costs:
+            step_lines.append(f"✓ {label}  —  \\${_phase_costs[node]:.4f}")
+        elif node not in ("input_processor", "phase1_aggregator", "phase2_aggregator", "phase1_restart"):
+            node_cost = token_usage.get(node, {}).get("cost_usd", 0)
+            if node_cost:
+                step_lines.append(f"✓ {label}  —  \\${node_cost:.4f}")
+            else:
+                step_lines.append(f"✓ {label}")
+        else:
+            step_lines.append(f"✓ {label}")
+
+    # ── Current step spinner ───────────────────────────────────────────
+    # Appended to the same block so the trail + spinner is one element per poll
+    # Last real node, skipping route markers like critique_router:conditional
+    last_real = next((n for n in reversed(progress) if ":" not in n), "")
+    next_node = _NEXT_STEP.get(last_real, "")
+    if next_node and next_node in _node_labels:
+        step_lines.append(f"⏳ {_node_labels[next_node]}…")
+    elif last_real == "report_writer":
+        step_lines.append("⏳ Generating documents…")
+    else:
+        step_lines.append("⏳ Processing…")
+    st.markdown("  \n".join(step_lines))
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # SCREEN 1 — FORM
 # ─────────────────────────────────────────────────────────────────────────────
@@ -1493,14 +1344,14 @@ if st.session_state.phase == "form":
     # ── Header ────────────────────────────────────────────────────────────────
     hdr_col, lang_col, hist_col = st.columns([5, 0.7, 0.8])
     with hdr_col:
-        st.markdown(t("app_title"))
-        st.caption(t("app_subtitle"))
+        st.markdown(ui.app_title)
+        st.caption(ui.app_subtitle)
     with lang_col:
         st.markdown("")
         _lang_toggle("form")
     with hist_col:
         st.markdown("")
-        if st.button(t("history_btn"), use_container_width=True):
+        if st.button(ui.history_btn, use_container_width=True):
             st.session_state.phase = "history"
             st.rerun()
     st.divider()
@@ -1509,17 +1360,17 @@ if st.session_state.phase == "form":
     col_form, col_pipeline = st.columns([1, 1.4], gap="large")
 
     with col_form:
-        st.markdown(t("form_heading"))
+        st.markdown(ui.form_heading)
         company = st.text_input(
-            t("company_label"),
-            placeholder=t("company_placeholder"),
+            ui.company_label,
+            placeholder=ui.company_placeholder,
         )
         url = st.text_input(
-            t("url_label"),
-            placeholder=t("url_placeholder"),
+            ui.url_label,
+            placeholder=ui.url_placeholder,
         )
         language = st.radio(
-            t("report_lang_label"),
+            ui.report_lang_label,
             options=["한국어", "English"],
             horizontal=True,
             help="Choose the language for the entire analysis and investment memo.",
@@ -1578,68 +1429,78 @@ if st.session_state.phase == "form":
                 help="Requires Strategic Insight.",
             )
         uploaded_files = st.file_uploader(
-            t("docs_label"),
+            ui.docs_label,
             type=["pdf"],
             accept_multiple_files=True,
-            help=t("docs_help"),
+            help=ui.docs_help,
         )
         auto_approve = st.checkbox(
-            t("auto_approve_label"),
+            ui.auto_approve_label,
             value=False,
-            help=t("auto_approve_help"),
+            help=ui.auto_approve_help,
         )
         st.markdown("")
-        st.caption(t("cost_caption"))
+        st.caption(ui.cost_caption)
+        # Stripped once per rerun; reused by the analysis runner below
+        company_s = (company or "").strip()
+        url_s = (url or "").strip()
         run = st.button(
-            t("run_btn"),
+            ui.run_btn,
             type="primary",
-            disabled=not ((company or "").strip() and (url or "").strip()),
+            disabled=not (company_s and url_s),
             use_container_width=True,
         )
 
     with col_pipeline:
-        st.markdown(t("pipeline_heading"))
-        st.caption(t("pipeline_caption"))
-        st.graphviz_chart(PIPELINE_GRAPH, use_container_width=True)
+        st.markdown(ui.pipeline_heading)
+        st.caption(ui.pipeline_caption)
+        _svg = _pipeline_svg()
+        if _svg:
+            st.markdown(_svg, unsafe_allow_html=True)
+        else:
+            st.graphviz_chart(PIPELINE_GRAPH, use_container_width=True)
 
     st.divider()
 
     # ── Agent Directory ───────────────────────────────────────────────────────
-    st.markdown(t("directory_heading"))
-    st.caption(t("directory_caption"))
+    st.markdown(ui.directory_heading)
+    st.caption(ui.directory_caption)
     st.markdown("")
 
-    active_phases = _get_agent_phases(st.session_state.get("ui_lang", "en"))
-    tabs = st.tabs([p["label"] for p in active_phases])
-    for tab, phase in zip(tabs, active_phases):
-        with tab:
-            st.markdown(
-                f"<p style='color:{phase['color']};font-size:0.9rem'>{phase['description']}</p>",
-                unsafe_allow_html=True,
-            )
-            st.markdown("")
-            n = len(phase["agents"])
-            cols = st.columns(min(n, 2))
-            for i, agent in enumerate(phase["agents"]):
-                with cols[i % 2]:
-                    render_agent_card(agent)
+    active_phases = get_agent_phases(st.session_state.get("ui_lang", "en"))
+    # A horizontal radio rather than st.tabs: tabs run every tab's body on each
+    # rerun, this only renders the cards of the selected phase.
+    _phase_idx = st.radio(
+        "Phase",
+        options=range(len(active_phases)),
+        format_func=lambda i: active_phases[i]["label"],
+        horizontal=True,
+        label_visibility="collapsed",
+        key="directory_phase",
+    )
+    phase = active_phases[_phase_idx]
+    st.markdown(
+        f"<p style='color:{phase['color']};font-size:0.9rem'>{phase['description']}</p>",
+        unsafe_allow_html=True,
+    )
+    st.markdown("")
+    st.markdown(phase["cards_html"], unsafe_allow_html=True)
 
     # ── Global Queue ──────────────────────────────────────────────────────────
     queue_items = load_queue()
     if queue_items:
         st.divider()
-        st.markdown(t("queue_heading"))
+        st.markdown(ui.queue_heading)
         for qi in queue_items:
             qi_progress = qi.get("progress") or []
             qi_start = qi.get("start_time") or time.time()
             qi_elapsed = time.time() - qi_start
 
             completed_w = sum(NODE_WEIGHTS.get(n, 0) for n in set(qi_progress))
-            total_w = sum(NODE_WEIGHTS.values())
-            qi_pct = min(int(completed_w / total_w * 100), 100) if total_w else 0
+            qi_pct = min(int(completed_w / _TOTAL_NODE_WEIGHT * 100), 100)
 
             # ETA
-            frac = completed_w / total_w if total_w else 0
+            frac = completed_w / _TOTAL_NODE_WEIGHT
             if frac > 0.02:
                 est_total = qi_elapsed / frac
                 remaining = max(0, est_total - qi_elapsed)
@@ -1650,11 +1511,11 @@ if st.session_state.phase == "form":
 
             _qi_st = qi.get("status", "")
             if _qi_st == "checkpoint":
-                qi_status = t("checkpoint_paused")
+                qi_status = ui.checkpoint_paused
             elif _qi_st == "running" or _qi_st == "approved":
-                qi_status = t("queue_status_running")
+                qi_status = ui.queue_status_running
             else:
-                qi_status = t("queue_status_queued")
+                qi_status = ui.queue_status_queued
             qi_company = qi.get("company") or qi.get("id", "")[:8]
 
             c1, c2, c3, c4, c5 = st.columns([2, 1, 1, 1.2, 0.8])
@@ -1669,7 +1530,7 @@ if st.session_state.phase == "form":
             with c5:
                 qi_id = qi.get("id", "")
                 if qi_id in st.session_state.active_jobs:
-                    if st.button(t("queue_view_btn"), key=f"qv_{qi_id}"):
+                    if st.button(ui.queue_view_btn, key=f"qv_{qi_id}"):
                         st.session_state.viewing_job = qi_id
                         # Look up company for this job
                         st.session_state.company = qi_company
@@ -1677,14 +1538,26 @@ if st.session_state.phase == "form":
                         st.rerun()
 
     # ── Analysis runner ───────────────────────────────────────────────────────
-    if run and company.strip() and url.strip():
-        tmp_dir = tempfile.mkdtemp()
-        doc_paths: list[str] = []
-        for f in (uploaded_files or []):
+    if run and company_s and url_s:
+        _sweep_workdirs()
+        workdir = _job_workdir()
+        tmp_dir = workdir.name
+
+        def _save_upload(f) -> str:
             dest = os.path.join(tmp_dir, f.name)
-            with open(dest, "wb") as out:
-                out.write(f.getbuffer())
-            doc_paths.append(dest)
+            f.seek(0)
+            with open(dest, "wb", buffering=1 << 20) as out:
+                shutil.copyfileobj(f, out, 1 << 20)  # 1 MB chunks
+            return dest
+
+        # I/O-bound — write multiple uploads concurrently (a lone file is
+        # written inline; a pool buys nothing there)
+        doc_paths: list[str] = []
+        if len(uploaded_files or ()) > 1:
+            with ThreadPoolExecutor(max_workers=min(4, len(uploaded_files))) as pool:
+                doc_paths = list(pool.map(_save_upload, uploaded_files))
+        elif uploaded_files:
+            doc_paths = [_save_upload(uploaded_files[0])]
 
         job_id = str(uuid.uuid4())
         # Map display label to canonical language string
@@ -1699,7 +1572,6 @@ if st.session_state.phase == "form":
         effective_mode = st.session_state.get("analysis_mode", "due-diligence")
         custom_mode_key: str | None = None
         if effective_mode == "custom":
-            from config import register_custom_mode, unregister_custom_mode
             _p1_map = {
                 "market_analysis": st.session_state.get("c_market_analysis", False),
                 "competitor_analysis": st.session_state.get("c_competitor_analysis", False),
@@ -1742,8 +1614,8 @@ if st.session_state.phase == "form":
                 st.stop()
 
         initial_state = {
-            "company_name": company.strip(),
-            "company_url": url.strip(),
+            "company_name": company_s,
+            "company_url": url_s,
             "uploaded_docs": doc_paths,
             "is_public": is_public_value,
             "ticker": None,
@@ -1784,29 +1656,30 @@ if st.session_state.phase == "form":
             "checkpoint_feedback": None,
             "auto_approve": auto_approve,
             # Bookkeeping
-            "messages": [],
             "errors": [],
             "current_phase": "init",
         }
 
-        update_job(job_id, {
-            "status": "running",
-            "progress": [],
-            "error": None,
-            "start_time": time.time(),
-            "company": company.strip(),
-        })
-
-        t_thread = threading.Thread(
-            target=_analysis_worker,
-            args=(job_id, initial_state, company.strip(), tmp_dir),
-            daemon=True,
-        )
-        t_thread.start()
+        try:
+            update_job(job_id, {
+                "status": "queued",
+                "progress": [],
+                "error": None,
+                "start_time": time.time(),
+                "company": company_s,
+            })
+
+            _analysis_queue().submit(
+                job_id, _analysis_worker,
+                job_id, initial_state, company_s, workdir,
+            )
+        except Exception:
+            workdir.cleanup()  # never reached a worker
+            raise
 
         st.session_state.active_jobs.append(job_id)
         st.session_state.viewing_job = job_id
-        st.session_state.company = company.strip()
+        st.session_state.company = company_s
         st.session_state.phase = "running"
         st.rerun()
 
@@ -1820,11 +1693,12 @@ elif st.session_state.phase == "running":
 
     # ── Job picker (if user has multiple active jobs) ──────────────────────
     active_jobs = st.session_state.active_jobs
+    _jobs_this_run: dict[str, dict] = {}  # each job is read at most once per rerun
     if len(active_jobs) > 1:
         # Build label → job_id mapping
         _picker_labels = {}
         for _jid in active_jobs:
-            _jdata = read_job(_jid)
+            _jdata = _jobs_this_run[_jid] = read_job(_jid)
             _jcompany = _jdata.get("company") or _jid[:8]
             _jstatus = _jdata.get("status", "unknown")
             _picker_labels[f"{_jcompany} ({_jstatus})"] = _jid
@@ -1833,7 +1707,7 @@ elif st.session_state.phase == "running":
             list(_picker_labels.keys())[0] if _picker_labels else "",
         )
         _selected_label = st.selectbox(
-            t("job_picker_label"),
+            ui.job_picker_label,
             options=list(_picker_labels.keys()),
             index=list(_picker_labels.keys()).index(_current_label) if _current_label in _picker_labels else 0,
             key="job_picker",
@@ -1841,7 +1715,7 @@ elif st.session_state.phase == "running":
         _selected_jid = _picker_labels[_selected_label]
         if _selected_jid != job_id:
             st.session_state.viewing_job = _selected_jid
-            _sel_data = read_job(_selected_jid)
+            _sel_data = _jobs_this_run[_selected_jid]
             st.session_state.company = _sel_data.get("company") or ""
             st.rerun()
 
@@ -1849,26 +1723,23 @@ elif st.session_state.phase == "running":
         st.session_state.phase = "form"
         st.rerun()
 
-    job = read_job(job_id)
+    job = _jobs_this_run.get(job_id) or read_job(job_id)
 
     if job["status"] == "complete":
-        storage_path = job.get("pdf_path", "")
-        pdf_bytes = download_pdf(storage_path) if storage_path else b""
-        if not pdf_bytes:
-            pdf_bytes = b""
         st.session_state.results[job_id] = {
             "result": {
                 "final_report":   job.get("final_report", ""),
-                "recommendation": job.get("recommendation", "WATCH"),
+                "recommendation": job.get("recommendation"),
                 "token_usage":    job.get("token_usage", {}),
             },
-            "pdf_bytes": pdf_bytes,
+            "pdf_path": job.get("pdf_path", ""),
             "pptx_path": job.get("pptx_path", ""),
             "docx_path": job.get("docx_path", ""),
             "company": job.get("company") or company,
             "agent_outputs": job.get("agent_outputs") or {},
+            "pdf_status": job.get("pdf_status"),
+            "start_time": job.get("start_time"),
         }
-        st.session_state.history_pdf_cache[job_id] = pdf_bytes
         st.session_state.phase = "results"
         st.rerun()
 
@@ -1877,7 +1748,7 @@ elif st.session_state.phase == "running":
         # Remove failed job from active list
         if job_id in st.session_state.active_jobs:
             st.session_state.active_jobs.remove(job_id)
-        if st.button(t("try_again_btn")):
+        if st.button(ui.try_again_btn):
             st.session_state.viewing_job = None
             st.session_state.phase = "form"
             st.rerun()
@@ -1886,7 +1757,7 @@ elif st.session_state.phase == "running":
         st.warning("⛔ Analysis was cancelled.")
         if job_id in st.session_state.active_jobs:
             st.session_state.active_jobs.remove(job_id)
-        if st.button(t("try_again_btn")):
+        if st.button(ui.try_again_btn):
             st.session_state.viewing_job = None
             st.session_state.phase = "form"
             st.rerun()
@@ -1895,14 +1766,14 @@ elif st.session_state.phase == "running":
         # ── Human checkpoint review screen ────────────────────────────────
         checkpoint_phase = job.get("checkpoint_phase", "")
         _phase_labels = {
-            "phase1": t("checkpoint_phase1_title"),
-            "phase2": t("checkpoint_phase2_title"),
-            "phase3": t("checkpoint_phase3_title"),
+            "phase1": ui.checkpoint_phase1_title,
+            "phase2": ui.checkpoint_phase2_title,
+            "phase3": ui.checkpoint_phase3_title,
         }
         _phase_desc = {
-            "phase1": t("checkpoint_phase1_desc"),
-            "phase2": t("checkpoint_phase2_desc"),
-            "phase3": t("checkpoint_phase3_desc"),
+            "phase1": ui.checkpoint_phase1_desc,
+            "phase2": ui.checkpoint_phase2_desc,
+            "phase3": ui.checkpoint_phase3_desc,
         }
         phase_title = _phase_labels.get(checkpoint_phase, checkpoint_phase)
         phase_desc = _phase_desc.get(checkpoint_phase, "")
@@ -1919,12 +1790,11 @@ elif st.session_state.phase == "running":
         progress = job.get("progress") or []
         start_time = job.get("start_time") or time.time()
         elapsed_sec = time.time() - start_time
-        _node_labels = _NODE_LABELS_KO if st.session_state.get("ui_lang") == "ko" else _NODE_LABELS_EN
+        _node_labels = _NODE_LABELS.get(st.session_state.get("ui_lang"), _NODE_LABELS_EN)
 
         unique_nodes = set(progress)
         completed_weight = sum(NODE_WEIGHTS.get(n, 0) for n in unique_nodes)
-        total_weight = sum(NODE_WEIGHTS.values())
-        pct = min(completed_weight / total_weight, 1.0)
+        pct = min(completed_weight / _TOTAL_NODE_WEIGHT, 1.0)
 
         def _fmt_time_cp(seconds: float) -> str:
             seconds = int(seconds)
@@ -1938,15 +1808,13 @@ elif st.session_state.phase == "running":
             done=len(progress),
             total=len(_node_labels),
             elapsed=_fmt_time_cp(elapsed_sec),
-            eta=t("checkpoint_paused"),
+            eta=ui.checkpoint_paused,
         ))
 
         # Show token cost
         token_usage_cp = job.get("token_usage") or {}
         if token_usage_cp:
-            total_cost = sum(v.get("cost_usd", 0) for v in token_usage_cp.values())
-            total_in = sum(v.get("input_tokens", 0) for v in token_usage_cp.values())
-            total_out = sum(v.get("output_tokens", 0) for v in token_usage_cp.values())
+            total_in, total_out, total_cost = _usage_totals(token_usage_cp)
             st.caption(t("api_cost", cost=total_cost, inp=total_in, out=total_out))
 
         st.divider()
@@ -1960,8 +1828,8 @@ elif st.session_state.phase == "running":
 
         # Feedback text area
         feedback_text = st.text_area(
-            t("checkpoint_feedback_label"),
-            placeholder=t("checkpoint_feedback_placeholder"),
+            ui.checkpoint_feedback_label,
+            placeholder=ui.checkpoint_feedback_placeholder,
             height=100,
             key=f"cp_feedback_{job_id}_{checkpoint_phase}",
         )
@@ -1969,7 +1837,7 @@ elif st.session_state.phase == "running":
         # Action buttons
         col_approve, col_cancel = st.columns([1, 1])
         with col_approve:
-            if st.button(t("checkpoint_approve_btn"), type="primary", use_container_width=True,
+            if st.button(ui.checkpoint_approve_btn, type="primary", use_container_width=True,
                          key=f"cp_approve_{job_id}"):
                 update_job(job_id, {
                     "status": "approved",
@@ -1977,7 +1845,7 @@ elif st.session_state.phase == "running":
                 })
                 st.rerun()
         with col_cancel:
-            if st.button(t("checkpoint_cancel_btn"), use_container_width=True,
+            if st.button(ui.checkpoint_cancel_btn, use_container_width=True,
                          key=f"cp_cancel_{job_id}"):
                 update_job(job_id, {"status": "cancelled"})
                 if job_id in st.session_state.active_jobs:
@@ -1987,32 +1855,26 @@ elif st.session_state.phase == "running":
                 st.rerun()
 
     elif job["status"] == "queued":
-        # Waiting for a semaphore slot — show queue message
+        # Waiting for a worker slot — show queue message
         _q_hdr, _q_lang, _q_back = st.columns([4, 0.7, 1])
         with _q_hdr:
             st.markdown(t("queued_heading", company))
-            st.caption(t("queued_caption"))
+            st.caption(ui.queued_caption)
         with _q_lang:
             _lang_toggle("queued")
         with _q_back:
             st.markdown("")
-            if st.button(t("back_to_form_btn"), key="back_form_queued"):
+            if st.button(ui.back_to_form_btn, key="back_form_queued"):
                 st.session_state.phase = "form"
                 st.rerun()
-        st.info(t("queued_info"))
-        elapsed_sec = time.time() - (job.get("start_time") or time.time())
-        st.caption(t("waiting_caption", int(elapsed_sec)))
-        time.sleep(5)
-        st.rerun()
+        _queued_status(job_id)
 
     else:
         # Still running — show live progress and poll
-        _node_labels = _NODE_LABELS_KO if st.session_state.get("ui_lang") == "ko" else _NODE_LABELS_EN
-
         _run_hdr, _run_lang, _run_cancel, _run_back, _run_hist = st.columns([3.5, 0.7, 0.8, 1, 0.8])
         with _run_hdr:
             st.markdown(t("analyzing", company))
-            st.caption(t("running_caption"))
+            st.caption(ui.running_caption)
         with _run_lang:
             _lang_toggle("running")
         with _run_cancel:
@@ -2026,128 +1888,19 @@ elif st.session_state.phase == "running":
                 st.rerun()
         with _run_back:
             st.markdown("")
-            if st.button(t("back_to_form_btn"), key="back_form_running"):
+            if st.button(ui.back_to_form_btn, key="back_form_running"):
                 st.session_state.phase = "form"
                 st.rerun()
         with _run_hist:
             st.markdown("")
-            if st.button(t("history_btn"), use_container_width=True, key="hist_running"):
+            if st.button(ui.history_btn, use_container_width=True, key="hist_running"):
                 st.session_state.phase = "history"
                 st.rerun()
 
         st.divider()
 
-        progress    = job.get("progress") or []
-        start_time  = job.get("start_time") or time.time()
-        elapsed_sec = time.time() - start_time
-
-        # ── Progress calculation ───────────────────────────────────────────
-        # Use set so feedback-loop reruns don't double-count weights
-        unique_nodes = set(progress)
-        completed_weight = sum(NODE_WEIGHTS.get(n, 0) for n in unique_nodes)
-        total_weight     = sum(NODE_WEIGHTS.values())
-        pct = min(completed_weight / total_weight, 1.0)  # cap at 100%
-
-        # Elapsed + estimated remaining
-        def _fmt_time(seconds: float) -> str:
-            seconds = int(seconds)
-            if seconds < 60:
-                return f"{seconds}s"
-            return f"{seconds // 60}m {seconds % 60:02d}s"
-
-        elapsed_str = _fmt_time(elapsed_sec)
-        if pct > 0.02:
-            est_total  = elapsed_sec / pct
-            remaining  = max(0, est_total - elapsed_sec)
-            eta_str    = t("eta_remaining", _fmt_time(remaining))
-        else:
-            eta_str = t("eta_estimating")
-
-        # ── Progress bar + stats row ───────────────────────────────────────
-        steps_done  = len(progress)
-        steps_total = len(_node_labels)
-        st.progress(pct, text=t(
-            "progress_text",
-            pct=int(pct * 100),
-            done=steps_done,
-            total=steps_total,
-            elapsed=elapsed_str,
-            eta=eta_str,
-        ))
-
-        # ── Live cost tracker ──────────────────────────────────────────────
-        token_usage = job.get("token_usage") or {}
-        total_cost  = sum(v.get("cost_usd", 0)       for v in token_usage.values())
-        total_in    = sum(v.get("input_tokens", 0)    for v in token_usage.values())
-        total_out   = sum(v.get("output_tokens", 0)   for v in token_usage.values())
-        if token_usage:
-            st.caption(t("api_cost", cost=total_cost, inp=total_in, out=total_out))
-
-        st.markdown("")
-
-        # ── Completed steps ────────────────────────────────────────────────
-        _PHASE1_AGENTS = [
-            "market_analysis", "competitor_analysis", "financial_analysis",
-            "tech_analysis", "legal_regulatory", "team_analysis",
-        ]
-        _PHASE2_AGENTS = ["ra_synthesis", "risk_assessment"]
-
-        for node in progress:
-            # Skip non-node entries (critique_router:pass, budget_cap:*, etc.)
-            if ":" in node:
-                route_label = node.split(":", 1)[1]
-                st.write(f"↳ {route_label}")
-                continue
-
-            label = _node_labels.get(node, node.replace("_", " ").title())
-            # Show per-phase cost for parallel steps
-            if node == "phase1_parallel":
-                phase_cost = sum(token_usage.get(a, {}).get("cost_usd", 0) for a in _PHASE1_AGENTS)
-                st.write(f"✓ {label}  —  ${phase_cost:.4f}")
-            elif node == "phase2_parallel":
-                phase_cost = sum(token_usage.get(a, {}).get("cost_usd", 0) for a in _PHASE2_AGENTS)
-                st.write(f"✓ {label}  —  ${phase_cost:.4f}")
-            elif node not in ("input_processor", "phase1_aggregator", "phase2_aggregator", "phase1_restart"):
-                node_cost = token_usage.get(node, {}).get("cost_usd", 0)
-                if node_cost:
-                    st.write(f"✓ {label}  —  ${node_cost:.4f}")
-                else:
-                    st.write(f"✓ {label}")
-            else:
-                st.write(f"✓ {label}")
-
-        # ── Current step spinner ───────────────────────────────────────────
-        # Map: after this node completes, what runs next?
-        _NEXT_STEP = {
-            "input_processor":    "phase1_parallel",
-            "phase1_parallel":    "phase1_aggregator",
-            "phase1_aggregator":  "phase2_parallel",
-            "phase2_parallel":    "strategic_insight",
-            "strategic_insight":  "phase2_aggregator",
-            "phase2_aggregator":  "review_agent",
-            "review_agent":       "critique_agent",
-            "critique_agent":     "dd_questions",       # default if pass
-            "selective_rerun":    "review_agent",       # second review
-            "phase1_restart":     "phase1_parallel",    # full restart
-            "dd_questions":       "report_structure",
-            "report_structure":   "report_writer",
-        }
-        last_real = ""
-        for n in reversed(progress):
-            if ":" not in n:  # skip critique_router:conditional etc
-                last_real = n
-                break
-        next_node = _NEXT_STEP.get(last_real, "")
-        if next_node and next_node in _node_labels:
-            st.write(f"⏳ {_node_labels[next_node]}…")
-        elif last_real == "report_writer":
-            st.write("⏳ Generating documents…")
-        else:
-            st.write("⏳ Processing…")
-
-        # Poll every 3 seconds
-        time.sleep(3)
-        st.rerun()
+        # Re-executes on its own every 3 seconds without rerunning the page
+        _running_progress(job_id)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -2157,26 +1910,21 @@ elif st.session_state.phase == "results":
     _viewing = st.session_state.viewing_job or ""
     _job_data = st.session_state.results.get(_viewing, {})
     result:  dict = _job_data.get("result") or {}
-    _pdf_bytes_result: bytes = _job_data.get("pdf_bytes") or b""
     company: str  = _job_data.get("company") or st.session_state.company
-    rec = (result.get("recommendation") or "WATCH").upper()
+    rec = (result.get("recommendation") or "N/A").upper()
 
-    badge_class = {
-        "INVEST": "invest-badge",
-        "WATCH":  "watch-badge",
-        "PASS":   "pass-badge",
-    }.get(rec, "watch-badge")
 
     rec_desc = {
-        "INVEST": t("invest_desc"),
-        "WATCH":  t("watch_desc"),
-        "PASS":   t("pass_desc"),
+        "INVEST": ui.invest_desc,
+        "WATCH":  ui.watch_desc,
+        "PASS":   ui.pass_desc,
     }.get(rec, "")
 
     _res_hdr, _res_lang = st.columns([5, 1])
     with _res_hdr:
         st.markdown(f"### {company}")
-        st.markdown(f'<div class="{badge_class}">{rec}</div>', unsafe_allow_html=True)
+        st.markdown(_RESULT_BADGE_HTML.get(rec) or f'<div class="na-badge">{escape(rec)}</div>',
+                    unsafe_allow_html=True)
         st.caption(rec_desc)
     with _res_lang:
         st.markdown("")
@@ -2185,8 +1933,17 @@ elif st.session_state.phase == "results":
 
     _cname = company.replace(" ", "_")
     col_dl, col_pptx, col_docx, col_reset, col_hist = st.columns([1, 1, 1, 1, 1])
+    _pdf_rendering = report_files_pending(_job_data)
     with col_dl:
-        if _pdf_bytes_result:
+        _pdf_storage = _job_data.get("pdf_path") or ""
+        _pdf_bytes_result = (
+            _fetch_report_file(_pdf_storage) if _pdf_storage and not _pdf_rendering else None
+        )
+        if _pdf_storage and not _pdf_rendering:
+            st.session_state.history_pdf_fetched[_viewing] = _pdf_bytes_result is not None
+        if _pdf_rendering:
+            st.caption(ui.pdf_rendering)
+        elif _pdf_bytes_result:
             st.download_button(
                 label="⬇️ PDF",
                 data=_pdf_bytes_result,
@@ -2198,7 +1955,7 @@ elif st.session_state.phase == "results":
     with col_pptx:
         _pptx_storage = _job_data.get("pptx_path") or ""
         if _pptx_storage:
-            _pptx_bytes = download_file(_pptx_storage)
+            _pptx_bytes = _fetch_report_file(_pptx_storage)
             if _pptx_bytes:
                 st.download_button(
                     label="⬇️ PPTX",
@@ -2210,7 +1967,7 @@ elif st.session_state.phase == "results":
     with col_docx:
         _docx_storage = _job_data.get("docx_path") or ""
         if _docx_storage:
-            _docx_bytes = download_file(_docx_storage)
+            _docx_bytes = _fetch_report_file(_docx_storage)
             if _docx_bytes:
                 st.download_button(
                     label="⬇️ DOCX",
@@ -2220,14 +1977,14 @@ elif st.session_state.phase == "results":
                     use_container_width=True,
                 )
     with col_reset:
-        if st.button(t("analyze_another_btn"), use_container_width=True):
+        if st.button(ui.analyze_another_btn, use_container_width=True):
             if _viewing in st.session_state.active_jobs:
                 st.session_state.active_jobs.remove(_viewing)
             st.session_state.viewing_job = None
             st.session_state.phase = "form"
             st.rerun()
     with col_hist:
-        if st.button(t("history_btn"), use_container_width=True, key="hist_results"):
+        if st.button(ui.history_btn, use_container_width=True, key="hist_results"):
             st.session_state.phase = "history"
             st.rerun()
 
@@ -2236,39 +1993,33 @@ elif st.session_state.phase == "results":
     # ── Token usage & cost breakdown ───────────────────────────────────────────
     token_usage: dict = result.get("token_usage") or {}
     if token_usage:
-        total_in   = sum(v.get("input_tokens",  0) for v in token_usage.values())
-        total_out  = sum(v.get("output_tokens", 0) for v in token_usage.values())
-        total_cost = sum(v.get("cost_usd",      0) for v in token_usage.values())
+        total_in, total_out, total_cost = _usage_totals(token_usage)
 
         with st.expander(t("token_expander", total_cost), expanded=False):
-            st.caption(t("token_caption"))
+            st.caption(ui.token_caption)
             st.markdown("")
 
             # Agent labels in the active language
             _agent_labels = _AGENT_LABELS_KO if st.session_state.get("ui_lang") == "ko" else _AGENT_LABELS_EN
 
-            # Table rows in display order
-            rows = []
-            for key in _AGENT_ORDER:
-                if key not in token_usage:
-                    continue
-                v = token_usage[key]
-                rows.append({
-                    t("agent_col"):         _agent_labels.get(key, key),
-                    t("input_tokens_col"):  f"{v.get('input_tokens',  0):,}",
-                    t("output_tokens_col"): f"{v.get('output_tokens', 0):,}",
-                    t("cost_col"):          f"${v.get('cost_usd', 0):.4f}",
-                })
-
-            # Summary row
-            rows.append({
-                t("agent_col"):         t("total_label"),
-                t("input_tokens_col"):  f"**{total_in:,}**",
-                t("output_tokens_col"): f"**{total_out:,}**",
-                t("cost_col"):          f"**${total_cost:.4f}**",
-            })
-
-            st.table(rows)
+            # Columnar table in display order + summary row; numbers stay numeric
+            # and are formatted client-side by column_config.
+            _keys = [k for k in _AGENT_ORDER if k in token_usage]
+            st.dataframe(
+                {
+                    ui.agent_col:         [_agent_labels.get(k, k) for k in _keys] + [ui.total_label],
+                    ui.input_tokens_col:  [token_usage[k].get("input_tokens", 0) for k in _keys] + [total_in],
+                    ui.output_tokens_col: [token_usage[k].get("output_tokens", 0) for k in _keys] + [total_out],
+                    ui.cost_col:          [token_usage[k].get("cost_usd", 0) for k in _keys] + [total_cost],
+                },
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    ui.input_tokens_col:  st.column_config.NumberColumn(format="%d"),
+                    ui.output_tokens_col: st.column_config.NumberColumn(format="%d"),
+                    ui.cost_col:          st.column_config.NumberColumn(format="$%.4f"),
+                },
+            )
 
     st.divider()
 
@@ -2276,7 +2027,7 @@ elif st.session_state.phase == "results":
     if final_report.strip():
         st.markdown(final_report)
     else:
-        st.info(t("no_report"))
+        st.info(ui.no_report)
 
     # ── Agent Outputs ─────────────────────────────────────────────────────────
     _ao = _job_data.get("agent_outputs") or {}
@@ -2285,6 +2036,11 @@ elif st.session_state.phase == "results":
         st.markdown(f"### {t('agent_outputs_heading')}")
         _render_agent_outputs(_ao, st.session_state.get("ui_lang", "en"))
 
+    # The memo is shown as soon as the job completes; poll until the report
+    # files have been rendered, then swap in the download buttons.
+    if _pdf_rendering:
+        _report_files_poll(_viewing)
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # SCREEN 4 — HISTORY
@@ -2292,19 +2048,19 @@ elif st.session_state.phase == "results":
 elif st.session_state.phase == "history":
     _hist_hdr, _hist_lang = st.columns([5, 1])
     with _hist_hdr:
-        st.markdown(t("history_title"))
-        st.caption(t("history_caption"))
+        st.markdown(ui.history_title)
+        st.caption(ui.history_caption)
     with _hist_lang:
         _lang_toggle("history")
 
     # Check if any active job is still running
-    _back_label = t("back_btn")
+    _back_label = ui.back_btn
     _back_phase = "form"
     _viewing = st.session_state.get("viewing_job")
     if _viewing and _viewing in st.session_state.active_jobs:
         _vj = read_job(_viewing)
         if _vj.get("status") in ("running", "queued"):
-            _back_label = t("back_running_btn")
+            _back_label = ui.back_running_btn
             _back_phase = "running"
     if st.button(_back_label):
         st.session_state.phase = _back_phase
@@ -2314,20 +2070,11 @@ elif st.session_state.phase == "history":
     history = load_history()
 
     if not history:
-        st.info(t("no_history"))
+        st.info(ui.no_history)
     else:
-        badge_css = {
-            "INVEST": ("background:#dcfce7;color:#15803d", "INVEST"),
-            "WATCH":  ("background:#fef3c7;color:#b45309", "WATCH"),
-            "PASS":   ("background:#fee2e2;color:#b91c1c", "PASS"),
-        }
         for entry in history:
-            rec    = (entry.get("recommendation") or "WATCH").upper()
-            style, label = badge_css.get(rec, badge_css["WATCH"])
-            badge_html = (
-                f"<span style='{style};padding:3px 12px;border-radius:8px;"
-                f"font-weight:700;font-size:0.85rem'>{label}</span>"
-            )
+            rec    = (entry.get("recommendation") or "N/A").upper()
+            badge_html = _HISTORY_BADGE_HTML.get(rec, _HISTORY_BADGE_HTML["N/A"])
             col_name, col_rec, col_date, col_dl, col_view = st.columns([2.5, 1, 1.5, 0.8, 0.8])
             with col_name:
                 st.markdown(f"**{entry.get('company', '—')}**")
@@ -2337,20 +2084,21 @@ elif st.session_state.phase == "history":
                 st.caption(entry.get("date", ""))
             with col_dl:
                 job_id   = entry.get("id", "")
-                pdf_bytes = st.session_state.history_pdf_cache.get(job_id)
-                if pdf_bytes is None:
-                    storage_path = entry.get("pdf_path", "")
-                    if storage_path:
-                        try:
-                            pdf_bytes = download_pdf(storage_path)
-                            if pdf_bytes:
-                                st.session_state.history_pdf_cache[job_id] = pdf_bytes
-                        except Exception:
-                            pdf_bytes = None
-                if pdf_bytes:
+                storage_path = entry.get("pdf_path", "")
+                # Downloaded on demand, not for every row on every rerun.
+                # None = not fetched yet, False = fetch failed (don't retry).
+                fetched = st.session_state.history_pdf_fetched.get(job_id)
+                pdf_bytes = _fetch_report_file(storage_path) if fetched else None
+                if fetched is None and storage_path:
+                    if st.button(ui.pdf_prepare_btn, key=f"prep_{job_id}", use_container_width=True):
+                        st.session_state.history_pdf_fetched[job_id] = (
+                            _fetch_report_file(storage_path) is not None
+                        )
+                        st.rerun()
+                elif pdf_bytes:
                     fname = f"dd_{entry.get('company','report').replace(' ','_')}.pdf"
                     st.download_button(
-                        label=t("pdf_btn"),
+                        label=ui.pdf_btn,
                         data=pdf_bytes,
                         file_name=fname,
                         mime="application/pdf",
@@ -2358,23 +2106,24 @@ elif st.session_state.phase == "history":
                         use_container_width=True,
                     )
                 else:
-                    st.caption(t("pdf_unavail"))
+                    st.caption(ui.pdf_unavail)
             with col_view:
-                if st.button(t("view_details_btn"), key=f"view_{job_id}", use_container_width=True):
+                if st.button(ui.view_details_btn, key=f"view_{job_id}", use_container_width=True):
                     # Load full job from Supabase and navigate to results screen
                     _hist_job = read_job(job_id)
-                    _hist_pdf = pdf_bytes or b""
                     st.session_state.results[job_id] = {
                         "result": {
                             "final_report":   _hist_job.get("final_report", ""),
-                            "recommendation": _hist_job.get("recommendation", "WATCH"),
+                            "recommendation": _hist_job.get("recommendation"),
                             "token_usage":    _hist_job.get("token_usage", {}),
                         },
-                        "pdf_bytes": _hist_pdf,
+                        "pdf_path": storage_path,
                         "pptx_path": _hist_job.get("pptx_path", ""),
                         "docx_path": _hist_job.get("docx_path", ""),
                         "company": _hist_job.get("company") or entry.get("company", ""),
                         "agent_outputs": _hist_job.get("agent_outputs") or {},
+                        "pdf_status": _hist_job.get("pdf_status"),
+                        "start_time": _hist_job.get("start_time"),
                     }
                     st.session_state.viewing_job = job_id
                     st.session_state.phase = "results"
@@ -1,4 +1,6 @@
 import os
+from functools import lru_cache
+
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -7,6 +9,9 @@ load_dotenv()
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 MODEL_NAME = "claude-sonnet-4-6"
 MAX_TOKENS = 16000
+# Per-request timeout (seconds) for Anthropic calls; streamed responses reset
+# it on every chunk, so it bounds a stalled connection, not a long answer
+ANTHROPIC_TIMEOUT_SEC = float(os.getenv("ANTHROPIC_TIMEOUT_SEC", "180"))
 
 # Hard cost cap per analysis (USD). Pipeline aborts early if exceeded.
 MAX_COST_PER_ANALYSIS = 7.00
@@ -45,6 +50,10 @@ CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", "./checkpoints.db")
 # Output
 REPORTS_DIR = os.getenv("REPORTS_DIR", "./reports")
 
+# Phase 1 result cache (graph/agent_cache.py) — off unless a TTL is set
+AGENT_CACHE_DIR = os.getenv("AGENT_CACHE_DIR", "./outputs/.agent_cache")
+AGENT_CACHE_TTL_SEC = int(os.getenv("AGENT_CACHE_TTL_SEC", "0"))
+
 # ── Analysis Modes ────────────────────────────────────────────────────────
 MODE_REGISTRY = {
     "due-diligence": {
@@ -183,11 +192,14 @@ def unregister_custom_mode(mode_key: str = "custom") -> None:
     MODE_REGISTRY.pop(mode_key, None)
 
 
-def validate_config() -> list[str]:
-    """Return list of missing required config keys."""
-    missing = []
-    if not ANTHROPIC_API_KEY:
-        missing.append("ANTHROPIC_API_KEY")
-    if not TAVILY_API_KEY:
-        missing.append("TAVILY_API_KEY")
-    return missing
+# Keys the pipeline can't run without (values read once above, after load_dotenv)
+_REQUIRED_KEYS = {
+    "ANTHROPIC_API_KEY": ANTHROPIC_API_KEY,
+    "TAVILY_API_KEY": TAVILY_API_KEY,
+}
+
+
+@lru_cache(maxsize=1)
+def validate_config() -> tuple[str, ...]:
+    """Return the missing required config keys (fixed after import, so memoized)."""
+    return tuple(name for name, value in _REQUIRED_KEYS.items() if not value)
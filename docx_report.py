@@ -113,7 +113,7 @@ def generate_docx(state: dict[str, Any], job_id: str,
     output_path = str(reports_dir / f"{job_id}.docx")
 
     company = state.get("company_name") or "Unknown Company"
-    recommendation = (state.get("recommendation") or "WATCH").upper()
+    recommendation = (state.get("recommendation") or "N/A").upper()
 
     doc = Document()
 
@@ -130,8 +130,10 @@ def generate_docx(state: dict[str, Any], job_id: str,
         run.font.color.rgb = RGBColor(0x16, 0xA3, 0x4A)
     elif "PASS" in recommendation:
         run.font.color.rgb = RGBColor(0xDC, 0x26, 0x26)
-    else:
+    elif "WATCH" in recommendation:
         run.font.color.rgb = RGBColor(0xD9, 0x77, 0x06)
+    else:
+        run.font.color.rgb = RGBColor(0x64, 0x74, 0x8B)
 
     p2 = doc.add_paragraph()
     p2.alignment = WD_ALIGN_PARAGRAPH.CENTER
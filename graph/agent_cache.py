@@ -0,0 +1,98 @@
+"""Opt-in disk cache for Phase 1 agent results.
+
+Phase 1 agents only read the company inputs (name, URL, public/private flag,
+language, uploaded docs), so re-running the same company — dev iteration, or a
+retry after a late-phase failure — can reuse their output instead of paying
+for the LLM calls again. Off unless AGENT_CACHE_TTL_SEC > 0.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any
+
+from config import AGENT_CACHE_DIR, AGENT_CACHE_TTL_SEC
+
+log = logging.getLogger(__name__)
+
+ENABLED = AGENT_CACHE_TTL_SEC > 0
+
+# State fields a Phase 1 agent's output depends on (preprocessed_docs derives
+# from uploaded_docs, which are keyed by content below)
+_KEY_FIELDS = ("company_name", "company_url", "is_public", "language")
+
+
+@lru_cache(maxsize=64)
+def _file_digest(path: str, size: int, mtime_ns: int) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _doc_meta(path: str) -> dict:
+    try:
+        st = os.stat(path)
+        return {"path": path, "sha256": _file_digest(path, st.st_size, st.st_mtime_ns),
+                "size": st.st_size}
+    except OSError:
+        return {"path": path, "sha256": f"missing:{os.path.basename(path)}", "size": 0}
+
+
+def docs_meta(paths: list[str]) -> list[dict]:
+    """Hash each uploaded doc once ({path, sha256, size}), in parallel for multi-file uploads."""
+    if len(paths) <= 1:
+        return [_doc_meta(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(4, len(paths))) as pool:
+        return list(pool.map(_doc_meta, paths))
+
+
+def _docs_digest(state: Any) -> list[str]:
+    """Content hashes of the uploaded docs (path/order-independent)."""
+    meta = state.get("uploaded_docs_meta")
+    if meta is None:
+        meta = docs_meta(state.get("uploaded_docs") or [])
+    return sorted(m["sha256"] for m in meta)
+
+
+def cache_key(agent_name: str, state: Any) -> str:
+    payload = {k: state.get(k) for k in _KEY_FIELDS}
+    payload["agent"] = agent_name
+    payload["docs"] = _docs_digest(state)
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _path(key: str) -> str:
+    return os.path.join(AGENT_CACHE_DIR, f"{key}.json")
+
+
+def load(key: str) -> dict | None:
+    """Cached agent result for `key`, or None if absent/expired/unreadable."""
+    path = _path(key)
+    try:
+        if time.time() - os.path.getmtime(path) > AGENT_CACHE_TTL_SEC:
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def store(key: str, result: dict) -> None:
+    """Persist an agent result. Side-effect only — failures are logged."""
+    try:
+        os.makedirs(AGENT_CACHE_DIR, exist_ok=True)
+        payload = json.dumps(result, ensure_ascii=False, default=str)
+        tmp = f"{_path(key)}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp, _path(key))  # atomic — concurrent readers never see a partial file
+    except Exception as exc:
+        log.warning("[agent-cache] Failed to store %s: %s", key[:12], exc)
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-import operator
 from typing import Annotated, TypedDict
-from langgraph.graph.message import add_messages
+
+_MAX_ERRORS = 100
+
+
+def _cap_errors(left: list[str], right: list[str]) -> list[str]:
+    """Append-reducer for `errors`, keeping only the most recent _MAX_ERRORS entries."""
+    return (left + right)[-_MAX_ERRORS:]
 
 
 class DueDiligenceState(TypedDict):
@@ -11,6 +16,7 @@ class DueDiligenceState(TypedDict):
     company_url: str | None
     uploaded_docs: list[str]          # local file paths to PDFs/Excel
     preprocessed_docs: dict | None    # {agent_name: [preprocessed_md_paths]}
+    uploaded_docs_meta: list[dict] | None  # [{path, sha256, size}] — hashed once in input_processor
     is_public: bool | None            # True = public, False = private, None = unknown
     ticker: str | None                # resolved ticker symbol (public companies only)
 
@@ -70,7 +76,7 @@ class DueDiligenceState(TypedDict):
     auto_approve: bool                # True = skip human checkpoints
 
     # ── Shared bookkeeping ────────────────────────────────────────────────
-    messages: Annotated[list, add_messages]
-    errors: Annotated[list[str], operator.add]
+    errors: Annotated[list[str], _cap_errors]
+    fatal_error: str | None           # set by a parallel phase on an unrecoverable agent error
     current_phase: str
     language: str                     # "English" | "Korean"
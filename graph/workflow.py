@@ -10,14 +10,22 @@ Graph topology is built dynamically by build_graph(mode).
 """
 from __future__ import annotations
 
+import atexit
 import logging
+import sqlite3
+import threading
 import time as _time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from functools import lru_cache, partial
 from typing import Any
 
+import anthropic
 from langgraph.graph import StateGraph, START, END
+from langgraph.checkpoint.base import WRITES_IDX_MAP
 from langgraph.checkpoint.sqlite import SqliteSaver
 
+from graph import agent_cache
 from graph.state import DueDiligenceState
 from config import CHECKPOINT_DB_PATH, MODE_REGISTRY
 from tools.doc_preprocessor import preprocess_documents
@@ -38,19 +46,26 @@ from agents.phase2 import (
 from agents.phase3 import review_agent, critique_agent, dd_questions
 from agents.phase4 import report_structure, report_writer
 from agents.phase5 import codex_verification
-from agents.base import get_and_reset_usage
+from agents.base import cancel_scope, get_client, usage_scope
 from tools.executor import reset_tool_cache
 from agents.context import (
     slim_market_analysis, slim_competitor, slim_financial_analysis,
     slim_tech, slim_legal_regulatory, slim_team, compact,
 )
-from config import ANTHROPIC_API_KEY, MODEL_NAME
+from config import MODEL_NAME
 
 log = logging.getLogger(__name__)
 
 
 _AGENT_TIMEOUT_SEC = 600  # 10-minute timeout per agent
 
+# One long-lived pool shared by every parallel phase (and by concurrent
+# analyses in the Streamlit app) instead of a fresh executor per phase call.
+# Agent calls are blocking HTTP, which releases the GIL, so threads are a fit;
+# token usage is counted in a ContextVar that usage_scope() gives each agent
+# run (see _run_agent_with_usage), so reusing workers is safe.
+_AGENT_POOL = ThreadPoolExecutor(max_workers=12, thread_name_prefix="dd-agent")
+
 # ── Agent function registries ─────────────────────────────────────────────────
 # Maps agent name (as used in MODE_REGISTRY) → run function
 
@@ -97,8 +112,11 @@ def _save_agent_output(company_name: str, agent_name: str, result: dict) -> None
         out_dir = _os.path.join("outputs", slug)
         _os.makedirs(out_dir, exist_ok=True)
         path = _os.path.join(out_dir, f"{agent_name}.json")
+        # Serialize first, then write once — json.dump() streams to the file
+        # in many small chunks. Keep all JSON persistence on this pattern.
+        payload = _json.dumps(result, ensure_ascii=False, indent=2)
         with open(path, "w", encoding="utf-8") as f:
-            _json.dump(result, f, ensure_ascii=False, indent=2)
+            f.write(payload)
         log.info("[disk] Saved %s → %s", agent_name, path)
     except Exception as exc:
         log.warning("[disk] Failed to save %s: %s", agent_name, exc)
@@ -106,13 +124,9 @@ def _save_agent_output(company_name: str, agent_name: str, result: dict) -> None
 
 def _run_agent_with_usage(fn, state: Any) -> tuple[dict, dict]:
     """Run an agent function and return (result, token_usage) tuple."""
-    try:
+    # Scoped counter: a crashed agent's partial usage is dropped with its scope
+    with usage_scope() as usage:
         result = fn(state)
-    except Exception:
-        # Capture any tokens consumed before the crash
-        get_and_reset_usage()
-        raise
-    usage = get_and_reset_usage()
     # Persist to disk for crash resilience and human review
     company = state.get("company_name", "unknown") if isinstance(state, dict) else "unknown"
     for key, value in result.items():
@@ -121,6 +135,140 @@ def _run_agent_with_usage(fn, state: Any) -> tuple[dict, dict]:
     return result, usage
 
 
+# ── Bounded dispatch (replaces fixed batches + stagger sleeps) ───────────────
+
+class _StartRateLimiter:
+    """Token bucket of capacity 1: agent starts are spaced `interval` seconds
+    apart process-wide (covers concurrent analyses), instead of fixed sleeps."""
+
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = _time.monotonic()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self._interval
+        if delay > 0:
+            _time.sleep(delay)
+
+
+_START_LIMITER = _StartRateLimiter(float(_os.getenv("AGENT_START_INTERVAL_SEC", "1")))
+# Phase 1 agents hit Tavily hard; keep them at the old batch width by default
+_PHASE1_CONCURRENCY = int(_os.getenv("PHASE1_CONCURRENCY", "2"))
+# Wall-clock cap for one parallel phase, time queued for a pool thread
+# included — the pool is shared, so a busy pool can't stall a phase forever
+_PHASE_TIMEOUT_SEC = int(_os.getenv("PHASE_TIMEOUT_SEC", "2400"))
+
+
+# Errors every other agent in the phase would hit too (bad/revoked API key) —
+# stop the phase instead of waiting for each of them to fail on its own
+_FATAL_AGENT_ERRORS = (anthropic.AuthenticationError, anthropic.PermissionDeniedError)
+
+
+def _timed_out(name: str, limit: int = _AGENT_TIMEOUT_SEC) -> Future:
+    future: Future = Future()
+    future.set_exception(TimeoutError(f"{name} timed out after {limit}s"))
+    return future
+
+
+def _run_agent_started(started: dict, cancel: threading.Event, name: str,
+                       fn, state: Any) -> tuple[dict, dict]:
+    """Pool entry point: record when the agent actually starts, then run it
+    under `cancel` so the dispatcher can stop it between turns."""
+    started[name] = _time.monotonic()
+    with cancel_scope(cancel):
+        return _run_agent_with_usage(fn, state)
+
+
+_QUEUED_POLL_SEC = 1.0  # re-check deadlines while some agents still wait for a pool thread
+
+
+def _run_agents_bounded(named_fns: list[tuple[str, Any]], state: Any, max_concurrent: int):
+    """Yield (name, future) as agents finish, keeping at most `max_concurrent`
+    in flight — the next agent starts as soon as a slot frees up.
+
+    An agent still running _AGENT_TIMEOUT_SEC after it started, or still
+    unfinished (queued or running) _PHASE_TIMEOUT_SEC after dispatch began,
+    is yielded as a future raising TimeoutError so the phase can move on.
+    Its thread can't be killed, so its cancel Event is set and run_agent
+    stops before the next API or tool call; agents not yet dispatched by the
+    phase deadline are yielded as timed out without starting. Breaking out
+    of the loop stops dispatch and cancels everything still in flight.
+    """
+    todo = iter(named_fns)
+    in_flight: dict = {}
+    started: dict[str, float] = {}
+    cancels: dict[str, threading.Event] = {}
+    phase_deadline = _time.monotonic() + _PHASE_TIMEOUT_SEC
+
+    def _deadline(name: str) -> float:
+        if name in started:
+            return min(phase_deadline, started[name] + _AGENT_TIMEOUT_SEC)
+        return phase_deadline
+
+    def _start_next() -> None:
+        if _time.monotonic() >= phase_deadline:
+            return  # the rest are yielded as timed out below
+        item = next(todo, None)
+        if item is not None:
+            name, fn = item
+            _START_LIMITER.acquire()
+            cancels[name] = threading.Event()
+            future = _AGENT_POOL.submit(_run_agent_started, started, cancels[name], name, fn, state)
+            in_flight[future] = name
+
+    for _ in range(max(max_concurrent, 1)):
+        _start_next()
+    try:
+        while in_flight:
+            timeout = max(0.0, min(map(_deadline, in_flight.values())) - _time.monotonic())
+            if any(n not in started for n in in_flight.values()):
+                timeout = min(timeout, _QUEUED_POLL_SEC)
+            done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+            now = _time.monotonic()
+            expired = [f for f, n in in_flight.items() if f not in done and _deadline(n) <= now]
+            for future in expired:
+                cancels[in_flight[future]].set()
+                future.cancel()  # drops it if still queued; else run_agent stops at its next turn
+            for future in (*done, *expired):
+                name = in_flight.pop(future)
+                _start_next()
+                if future in done:
+                    yield name, future
+                else:
+                    agent_limited = name in started and started[name] + _AGENT_TIMEOUT_SEC <= now
+                    yield name, _timed_out(name, _AGENT_TIMEOUT_SEC if agent_limited else _PHASE_TIMEOUT_SEC)
+        for name, _fn in todo:
+            yield name, _timed_out(name, _PHASE_TIMEOUT_SEC)
+    finally:
+        for future, name in in_flight.items():
+            cancels[name].set()
+            future.cancel()  # no-op for agents already running
+
+
+def _fatal_router(state: DueDiligenceState) -> str:
+    """Conditional edge after a parallel phase: end the run on a fatal agent error."""
+    return "fatal" if state.get("fatal_error") else "ok"
+
+
+def has_phase3_input(state: DueDiligenceState) -> bool:
+    """True if any Phase 1/2 agent of the run's mode produced output to review."""
+    cfg = MODE_REGISTRY.get(state.get("mode", "due-diligence"), MODE_REGISTRY["due-diligence"])
+    keys = (*cfg["phase1_agents"], *cfg["phase2_parallel"], *cfg.get("phase2_sequential", []))
+    return any(state.get(k) for k in keys)
+
+
+def _phase3_router(state: DueDiligenceState) -> str:
+    """Skip the Phase 3 LLM reviewers when there is nothing to review."""
+    if has_phase3_input(state):
+        return "run"
+    log.warning("[phase3] No Phase 1/2 output — skipping review agents")
+    return "skip"
+
+
 # ── Node implementations ──────────────────────────────────────────────────────
 
 def _detect_company_type(company_name: str) -> tuple[bool, str | None]:
@@ -172,6 +320,8 @@ def input_processor(state: DueDiligenceState) -> dict:
     # This ensures agents read FULL content, not just first ~6 pages.
     preprocessed_docs = None
     uploaded = state.get("uploaded_docs") or []
+    # Hash once here for the agent cache's keys (skipped when the cache is off)
+    uploaded_docs_meta = agent_cache.docs_meta(uploaded) if agent_cache.ENABLED else None
     if uploaded:
         try:
             company_slug = _re.sub(r"[^\w\-]", "_", state.get("company_name", "unknown").strip())[:60]
@@ -192,13 +342,14 @@ def input_processor(state: DueDiligenceState) -> dict:
         "ticker": ticker,
         "mode": mode,
         "preprocessed_docs": preprocessed_docs,
+        "uploaded_docs_meta": uploaded_docs_meta,
         "feedback_loop_count": 0,
         "weak_sections": [],
     }
 
 
 def phase1_parallel(state: DueDiligenceState) -> dict:
-    """Run Phase 1 agents (dynamic per mode) in batches of 2."""
+    """Run Phase 1 agents (dynamic per mode), at most _PHASE1_CONCURRENCY at a time."""
     mode = state.get("mode", "due-diligence")
     cfg = MODE_REGISTRY[mode]
     agent_names = cfg["phase1_agents"]
@@ -208,30 +359,39 @@ def phase1_parallel(state: DueDiligenceState) -> dict:
     errors = []
     agent_usage: dict[str, dict] = {}
 
-    # Run in batches of 2 to avoid overwhelming free-tier Tavily rate limits
-    batch_size = 2
-    for batch_start in range(0, len(agent_fns), batch_size):
-        batch_fns = agent_fns[batch_start:batch_start + batch_size]
-        batch_names = agent_names[batch_start:batch_start + batch_size]
-
-        if batch_start > 0:
-            _time.sleep(5)  # pause between batches for rate limit recovery
-
-        future_to_name: dict = {}
-        with ThreadPoolExecutor(max_workers=batch_size) as executor:
-            for fn, name in zip(batch_fns, batch_names):
-                future_to_name[executor.submit(_run_agent_with_usage, fn, state)] = name
-
-            for future in as_completed(future_to_name):
-                name = future_to_name[future]
-                try:
-                    result, usage = future.result(timeout=_AGENT_TIMEOUT_SEC)
-                    merged.update(result)
-                    agent_usage[name] = usage
-                    log.info("[phase1] %s: input=%d, output=%d", name, usage.get('input_tokens', 0), usage.get('output_tokens', 0))
-                except Exception as exc:
-                    errors.append(f"{name} failed: {exc}")
-                    log.error("[phase1] %s FAILED: %s", name, exc)
+    # Cache is only consulted on a first pass: codex-FAIL reruns (output
+    # already set) and feedback-loop restarts must produce fresh results.
+    cache_keys: dict[str, str] = {}
+    named_fns = []
+    first_pass = not state.get("feedback_loop_count")
+    for name, fn in zip(agent_names, agent_fns):
+        if agent_cache.ENABLED:
+            cache_keys[name] = agent_cache.cache_key(name, state)
+            cached = agent_cache.load(cache_keys[name]) if first_pass and state.get(name) is None else None
+            if cached is not None:
+                merged.update(cached)
+                agent_usage[name] = {"input_tokens": 0, "output_tokens": 0}
+                log.info("[phase1] %s: cache hit", name)
+                continue
+        named_fns.append((name, fn))
+
+    # Bounded to avoid overwhelming free-tier Tavily rate limits
+    for name, future in _run_agents_bounded(named_fns, state, _PHASE1_CONCURRENCY):
+        try:
+            result, usage = future.result()
+            merged.update(result)
+            agent_usage[name] = usage
+            if name in cache_keys:
+                agent_cache.store(cache_keys[name], result)
+            log.info("[phase1] %s: input=%d, output=%d", name, usage.get('input_tokens', 0), usage.get('output_tokens', 0))
+        except _FATAL_AGENT_ERRORS as exc:
+            errors.append(f"{name} failed: {exc}")
+            merged["fatal_error"] = f"{name}: {exc}"
+            log.error("[phase1] %s FATAL — stopping phase: %s", name, exc)
+            break
+        except Exception as exc:
+            errors.append(f"{name} failed: {exc}")
+            log.error("[phase1] %s FAILED: %s", name, exc)
 
     merged["__agent_usage__"] = agent_usage
     if errors:
@@ -337,8 +497,7 @@ def phase1_aggregator(state: DueDiligenceState) -> dict:
     phase1_tensions = []
     phase1_gaps = []
     try:
-        import anthropic
-        client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+        client = get_client()
         lang = state.get("language", "English")
         n_agents = len(active_agents)
         resp = client.messages.create(
@@ -395,21 +554,18 @@ def phase2_parallel(state: DueDiligenceState) -> dict:
     errors = []
     agent_usage: dict[str, dict] = {}
 
-    future_to_name: dict = {}
-    with ThreadPoolExecutor(max_workers=max(len(agent_fns), 1)) as executor:
-        for i, (fn, name) in enumerate(zip(agent_fns, agent_names)):
-            if i > 0:
-                _time.sleep(3)
-            future_to_name[executor.submit(_run_agent_with_usage, fn, state)] = name
-
-        for future in as_completed(future_to_name):
-            name = future_to_name[future]
-            try:
-                result, usage = future.result(timeout=_AGENT_TIMEOUT_SEC)
-                merged.update(result)
-                agent_usage[name] = usage
-            except Exception as exc:
-                errors.append(f"{name} failed: {exc}")
+    named_fns = list(zip(agent_names, agent_fns))
+    for name, future in _run_agents_bounded(named_fns, state, len(named_fns)):
+        try:
+            result, usage = future.result()
+            merged.update(result)
+            agent_usage[name] = usage
+        except _FATAL_AGENT_ERRORS as exc:
+            errors.append(f"{name} failed: {exc}")
+            merged["fatal_error"] = f"{name}: {exc}"
+            break
+        except Exception as exc:
+            errors.append(f"{name} failed: {exc}")
 
     merged["__agent_usage__"] = agent_usage
     if errors:
@@ -418,35 +574,21 @@ def phase2_parallel(state: DueDiligenceState) -> dict:
     return merged
 
 
-def strategic_insight_node(state: DueDiligenceState) -> dict:
-    """Run strategic_insight sequentially (needs ra_synthesis + risk_assessment)."""
-    return strategic_insight.run(state)
+# Single-agent nodes are the agents' own run functions — a wrapper that only
+# forwarded `state` added a call frame per node and nothing else.
+strategic_insight_node = strategic_insight.run  # needs ra_synthesis + risk_assessment
+review_agent_node      = review_agent.run
+critique_agent_node    = critique_agent.run
+dd_questions_node      = dd_questions.run
+report_structure_node  = report_structure.run
+report_writer_node     = report_writer.run
 
 
 def phase2_aggregator(state: DueDiligenceState) -> dict:
+    """Phase marker step for app.py's driver; not a node in the compiled graph."""
     return {"current_phase": "phase3"}
 
 
-def review_agent_node(state: DueDiligenceState) -> dict:
-    return review_agent.run(state)
-
-
-def critique_agent_node(state: DueDiligenceState) -> dict:
-    return critique_agent.run(state)
-
-
-def dd_questions_node(state: DueDiligenceState) -> dict:
-    return dd_questions.run(state)
-
-
-def report_structure_node(state: DueDiligenceState) -> dict:
-    return report_structure.run(state)
-
-
-def report_writer_node(state: DueDiligenceState) -> dict:
-    return report_writer.run(state)
-
-
 def codex_verify_phase1_node(state: DueDiligenceState) -> dict:
     """Run Phase 1 codex verification. On retry (prev FAIL), force PASS."""
     prev = state.get("verification_phase1")
@@ -500,6 +642,18 @@ def _codex_router(verification_key: str):
     return router
 
 
+def _input_router(state: DueDiligenceState) -> str:
+    """Stop before Phase 1 when there is no company to analyse.
+
+    Other input_processor errors (bad mode → default, preprocessing failure →
+    raw docs) are recoverable, so only a missing company name ends the run.
+    """
+    if not (state.get("company_name") or "").strip():
+        log.warning("[input-router] no company name — ending run before Phase 1")
+        return "invalid"
+    return "ok"
+
+
 # ── Checkpoint nodes (human review pause points) ─────────────────────────────
 # These are marker nodes; the actual pausing logic lives in server.py's
 # streaming loop, which checks for these node names and waits for approval.
@@ -521,23 +675,22 @@ def checkpoint_phase3_node(state: DueDiligenceState) -> dict:
 
 # ── Feedback loop nodes ───────────────────────────────────────────────────────
 
+_CRITIQUE_CRITERIA = (
+    "logic", "completeness", "accuracy", "narrative_bias", "insight_effectiveness",
+)
+
+
 def critique_router(state: DueDiligenceState) -> str:
     """Conditional edge: route based on critique scores."""
-    scores = state.get("critique_result") or {}
-    total = scores.get("total_score", 0)
-    criteria = [
-        scores.get("logic", 0),
-        scores.get("completeness", 0),
-        scores.get("accuracy", 0),
-        scores.get("narrative_bias", 0),
-        scores.get("insight_effectiveness", 0),
-    ]
     loop_count = state.get("feedback_loop_count", 0)
-
     if loop_count >= 2:
         log.info("Critique router: safety cap reached (loop_count=%d), passing", loop_count)
         return "pass"
 
+    scores = state.get("critique_result") or {}
+    total = scores.get("total_score", 0)
+    criteria = [scores.get(k, 0) for k in _CRITIQUE_CRITERIA]
+
     low = [c for c in criteria if c < 5]
     if total >= 35 and all(c >= 7 for c in criteria):
         log.info("Critique router: PASS (total=%d, all >= 7)", total)
@@ -578,19 +731,29 @@ def selective_rerun(state: DueDiligenceState) -> dict:
         "weak_sections": list(weak_agents),
     }
 
+    # Each weak agent is re-run from the same state with its own brief — they
+    # don't read each other's output, so run them side by side
+    named_fns = []
     for agent_name in weak_agents:
         if agent_name not in agent_map:
             log.warning("Selective rerun: unknown agent '%s' — skipping", agent_name)
             continue
         log.info("Selective rerun: re-running %s (loop %d)", agent_name, loop_count)
+        brief = revision_briefs.get(agent_name, "")
+        named_fns.append((agent_name, partial(agent_map[agent_name], revision_brief=brief)))
+
+    # Usage accrues on pool threads, so it travels back in-band
+    agent_usage: dict[str, dict] = {}
+    for agent_name, future in _run_agents_bounded(named_fns, state, len(named_fns)):
         try:
-            brief = revision_briefs.get(agent_name, "")
-            result = agent_map[agent_name](state, revision_brief=brief)
+            result, usage = future.result()
             merged.update(result)
+            agent_usage[agent_name] = usage
         except Exception as exc:
             log.warning("Selective rerun: %s failed: %s", agent_name, exc)
             merged.setdefault("errors", []).append(f"selective_rerun {agent_name} failed: {exc}")
 
+    merged["__agent_usage__"] = agent_usage
     return merged
 
 
@@ -621,7 +784,94 @@ def phase1_restart(state: DueDiligenceState) -> dict:
 
 # ── Graph builder ─────────────────────────────────────────────────────────────
 
+class _GroupCommitSqliteSaver(SqliteSaver):
+    """SqliteSaver that defers the commit of pending task writes.
+
+    Each superstep issues put_writes for every task and then a put for the
+    checkpoint. put_writes leaves its rows in the open transaction; the
+    put that ends the superstep commits them together with the checkpoint,
+    so there is one commit per step and nothing stays uncommitted (or holds
+    the WAL write lock) while the next node runs. A step that ends in a node
+    error or interrupt gets no put, so those special writes (and a failing
+    put_writes) commit at once; a crash mid-step loses only that step's
+    pending writes. flush() commits anything still pending and also runs at
+    interpreter exit.
+
+    cursor() mirrors SqliteSaver.cursor() from langgraph-checkpoint-sqlite
+    (self.lock, self.setup(), put_writes writing through cursor()).
+    """
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        super().__init__(conn)
+        self._deferring = threading.local()
+
+    @contextmanager
+    def cursor(self, transaction: bool = True):
+        with self.lock:
+            self.setup()
+            cur = self.conn.cursor()
+            try:
+                yield cur
+            finally:
+                if transaction and not getattr(self._deferring, "active", False):
+                    self.conn.commit()
+                cur.close()
+
+    def put_writes(self, config, writes, task_id: str, *args, **kwargs) -> None:
+        # Error/interrupt/resume writes may be the last thing a step records
+        self._deferring.active = not any(w[0] in WRITES_IDX_MAP for w in writes)
+        try:
+            super().put_writes(config, writes, task_id, *args, **kwargs)
+        except BaseException:
+            self.flush()  # don't leave earlier writes in an open transaction
+            raise
+        finally:
+            self._deferring.active = False
+
+    def flush(self) -> None:
+        with self.lock:
+            self.conn.commit()
+
+
+@lru_cache(maxsize=None)
+def _checkpointer() -> SqliteSaver:
+    """Process-wide SqliteSaver on one explicitly tuned connection.
+
+    WAL + synchronous=NORMAL drops the per-commit fsync (a checkpoint is
+    written after every node), and busy_timeout waits out lock contention
+    instead of failing with SQLITE_BUSY.
+    """
+    conn = sqlite3.connect(CHECKPOINT_DB_PATH, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    saver = _GroupCommitSqliteSaver(conn)
+    atexit.register(saver.flush)  # writes of a step that never reached its put
+    return saver
+
+
+# Compiled graphs for built-in modes, keyed on (mode, use_checkpointing)
+_compiled_graphs: dict[tuple[str, bool], Any] = {}
+
+
 def build_graph(mode: str = "due-diligence", use_checkpointing: bool = True):
+    """Return the compiled graph for `mode`, compiling it on first use.
+
+    Built-in modes are compiled once per process and reused by every run
+    (runs are told apart by thread_id). custom-* modes are registered per
+    run, so they are always compiled fresh and never retained.
+    """
+    key = (mode, use_checkpointing)
+    graph = _compiled_graphs.get(key)
+    if graph is None:
+        graph = _compile_graph(mode, use_checkpointing)
+        if not mode.startswith("custom-"):
+            graph = _compiled_graphs.setdefault(key, graph)
+    return graph
+
+
+def _compile_graph(mode: str, use_checkpointing: bool):
     """Build and compile a mode-specific LangGraph StateGraph.
 
     The graph topology varies by mode:
@@ -650,7 +900,6 @@ def build_graph(mode: str = "due-diligence", use_checkpointing: bool = True):
     builder.add_node("phase1_aggregator",  phase1_aggregator)
     builder.add_node("adaptive_phase2_context", adaptive_phase2_context_node)
     builder.add_node("phase2_parallel",    phase2_parallel)
-    builder.add_node("phase2_aggregator",  phase2_aggregator)
     builder.add_node("report_structure",   report_structure_node)
     builder.add_node("report_writer",      report_writer_node)
 
@@ -668,8 +917,14 @@ def build_graph(mode: str = "due-diligence", use_checkpointing: bool = True):
 
     # ── Phase 1 edges ────────────────────────────────────────────────────
     builder.add_edge(START,                "input_processor")
-    builder.add_edge("input_processor",    "phase1_parallel")
-    builder.add_edge("phase1_parallel",    "phase1_cross_check")
+    builder.add_conditional_edges(
+        "input_processor", _input_router,
+        {"ok": "phase1_parallel", "invalid": END},
+    )
+    builder.add_conditional_edges(
+        "phase1_parallel", _fatal_router,
+        {"ok": "phase1_cross_check", "fatal": END},
+    )
     builder.add_edge("phase1_cross_check", "phase1_aggregator")
     builder.add_edge("phase1_aggregator",  "codex_verify_phase1")
 
@@ -681,16 +936,15 @@ def build_graph(mode: str = "due-diligence", use_checkpointing: bool = True):
     builder.add_edge("checkpoint_phase1", "adaptive_phase2_context")
     builder.add_edge("adaptive_phase2_context", "phase2_parallel")
 
-    # ── Phase 2 sequential (strategic_insight) ────────────────────────────
+    # ── Phase 2 sequential (strategic_insight) → codex verification ──────
+    phase2_next = "strategic_insight" if has_strategic else "codex_verify_phase2"
+    builder.add_conditional_edges(
+        "phase2_parallel", _fatal_router,
+        {"ok": phase2_next, "fatal": END},
+    )
     if has_strategic:
         builder.add_node("strategic_insight", strategic_insight_node)
-        builder.add_edge("phase2_parallel",   "strategic_insight")
-        builder.add_edge("strategic_insight",  "phase2_aggregator")
-    else:
-        builder.add_edge("phase2_parallel",    "phase2_aggregator")
-
-    # ── Phase 2 → codex verification ──────────────────────────────────────
-    builder.add_edge("phase2_aggregator", "codex_verify_phase2")
+        builder.add_edge("strategic_insight",  "codex_verify_phase2")
 
     # Determine Phase 3 entry point (varies by mode)
     if has_review:
@@ -707,7 +961,13 @@ def build_graph(mode: str = "due-diligence", use_checkpointing: bool = True):
         _codex_router("verification_phase2"),
         {"pass": "checkpoint_phase2", "fail": "phase2_parallel"},
     )
-    builder.add_edge("checkpoint_phase2", phase3_entry)
+    if phase3_entry == "report_structure":
+        builder.add_edge("checkpoint_phase2", phase3_entry)
+    else:
+        builder.add_conditional_edges(
+            "checkpoint_phase2", _phase3_router,
+            {"run": phase3_entry, "skip": "report_structure"},
+        )
 
     # ── Phase 3 — dynamic chain → codex_verify_phase3 → report_structure ─
     phase3_exit = "codex_verify_phase3" if has_phase3_agents else "report_structure"
@@ -788,7 +1048,6 @@ def build_graph(mode: str = "due-diligence", use_checkpointing: bool = True):
 
     # ── Compile ───────────────────────────────────────────────────────────
     if use_checkpointing:
-        checkpointer = SqliteSaver.from_conn_string(CHECKPOINT_DB_PATH)
-        return builder.compile(checkpointer=checkpointer)
+        return builder.compile(checkpointer=_checkpointer())
     else:
         return builder.compile()
@@ -3,7 +3,9 @@ from __future__ import annotations
 
 import os
 import sys
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -90,14 +92,39 @@ def main(
         )
         raise typer.Exit(code=1)
 
+    # ── Build graph in the background ──────────────────────────────────────
+    # Importing graph.workflow (agents, langgraph, anthropic) and opening the
+    # checkpointer takes ~1-2 s — overlap it with doc checks and the banner.
+    built: dict = {}
+
+    def _build_graph() -> None:
+        try:
+            from graph.workflow import build_graph
+            built["graph"] = build_graph(mode=mode, use_checkpointing=not no_checkpoint)
+        except BaseException as exc:  # re-raised on the main thread below
+            built["error"] = exc
+
+    build_thread = threading.Thread(target=_build_graph, name="dd-build-graph", daemon=True)
+    build_thread.start()
+
     # ── Validate doc paths ─────────────────────────────────────────────────
-    valid_docs = []
-    for doc in docs:
+    def _resolve_doc(doc: str) -> str | None:
         path = Path(doc)
-        if not path.exists():
+        return str(path.resolve()) if path.exists() else None
+
+    # Each check is a stat() round trip — overlap them on network mounts
+    if len(docs) > 1:
+        with ThreadPoolExecutor(max_workers=min(16, len(docs))) as pool:
+            resolved = list(pool.map(_resolve_doc, docs))
+    else:
+        resolved = [_resolve_doc(doc) for doc in docs]
+
+    valid_docs = []
+    for doc, doc_path in zip(docs, resolved):
+        if doc_path is None:
             console.print(f"[yellow]Warning:[/yellow] Document not found, skipping: {doc}")
         else:
-            valid_docs.append(str(path.resolve()))
+            valid_docs.append(doc_path)
 
     # ── Build initial state ────────────────────────────────────────────────
     initial_state = {
@@ -139,7 +166,6 @@ def main(
         "feedback_loop_count": 0,
         "weak_sections": [],
         # Bookkeeping
-        "messages": [],
         "errors": [],
         "current_phase": "init",
         "language": "English",
@@ -169,21 +195,36 @@ def main(
     )
     console.print()
 
-    # ── Import graph (deferred to avoid slow startup) ──────────────────────
-    from graph.workflow import build_graph
-
-    graph = build_graph(mode=mode, use_checkpointing=not no_checkpoint)
+    # ── Wait for the background build (usually done by now) ───────────────
+    build_thread.join()
+    if "error" in built:
+        raise built["error"]
+    graph = built["graph"]
     config = {"configurable": {"thread_id": run_id}}
 
+    # ── Output path ────────────────────────────────────────────────────────
+    # Resolved up front so the memo can be written as soon as it exists
+    if output:
+        out_path = Path(output)
+    else:
+        reports_dir = Path(REPORTS_DIR)
+        reports_dir.mkdir(parents=True, exist_ok=True)
+        safe_name = "".join(c if c.isalnum() else "_" for c in company)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        out_path = reports_dir / f"{safe_name}_{timestamp}.md"
+
     # ── Run the graph with progress display ───────────────────────────────
-    final_state = None
+    # stream_mode="updates" yields each node's own update, not the full state,
+    # so merge them (errors is an add-reducer field — accumulate it)
+    final_state: dict = {}
+    errors: list[str] = []
+    written_memo = None
     phase_messages = {
         "input_processor": "Initializing analysis...",
         "phase1_parallel": "Phase 1: Running 6 research agents in parallel (Market, Competitors, Financial, Tech, Legal, Team)...",
         "phase1_aggregator": "Phase 1 complete. Aggregating context...",
         "phase2_parallel": "Phase 2: Synthesizing (R&A Synthesis + Risk Assessment in parallel)...",
         "strategic_insight": "Phase 2: Strategic Insight (rendering recommendation)...",
-        "phase2_aggregator": "Phase 2 complete. Aggregating...",
         "review_agent": "Phase 3: Review Agent (verifying claims)...",
         "critique_agent": "Phase 3: Critique Agent (scoring 5 criteria)...",
         "selective_rerun": "Feedback Loop: Re-running weak agents...",
@@ -201,14 +242,26 @@ def main(
         transient=False,
     ) as progress:
         task = progress.add_task("Starting...", total=None)
+        last_msg = None
 
         try:
             for event in graph.stream(initial_state, config=config, stream_mode="updates"):
-                for node_name in event:
-                    msg = phase_messages.get(node_name, f"Running {node_name}...")
-                    progress.update(task, description=msg)
-                    # Capture latest state
-                    final_state = event[node_name]
+                for node_name, update in event.items():
+                    # Repaint only when the phase text changes (codex/checkpoint
+                    # nodes and retries map to the same line repeatedly)
+                    msg = phase_messages.get(node_name)
+                    if msg and msg != last_msg:
+                        progress.update(task, description=msg)
+                        last_msg = msg
+                    if not update:
+                        continue
+                    errors.extend(update.get("errors") or [])
+                    final_state.update(update)
+                    # Save the memo while final verification is still running
+                    # (a verification retry rewrites it)
+                    if node_name == "report_writer" and update.get("final_report"):
+                        written_memo = update["final_report"]
+                        out_path.write_text(written_memo, encoding="utf-8")
 
         except Exception as e:
             progress.update(task, description=f"[red]Error: {e}[/red]")
@@ -218,6 +271,12 @@ def main(
                 traceback.print_exc()
             raise typer.Exit(code=1)
 
+        finally:
+            # Commit checkpoints the saver is still holding (resume needs them)
+            flush = getattr(graph.checkpointer, "flush", None)
+            if flush:
+                flush()
+
     if not final_state:
         console.print("[red]No output produced.[/red]")
         raise typer.Exit(code=1)
@@ -245,7 +304,6 @@ def main(
         console.print()
 
     # ── Print errors if any ────────────────────────────────────────────────
-    errors = final_state.get("errors", [])
     if errors:
         console.print("[yellow]Warnings / non-fatal errors:[/yellow]")
         for err in errors:
@@ -256,17 +314,9 @@ def main(
     if final_memo:
         console.print(Markdown(final_memo))
 
-    # ── Save to file ───────────────────────────────────────────────────────
-    if output:
-        out_path = Path(output)
-    else:
-        reports_dir = Path(REPORTS_DIR)
-        reports_dir.mkdir(parents=True, exist_ok=True)
-        safe_name = "".join(c if c.isalnum() else "_" for c in company)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        out_path = reports_dir / f"{safe_name}_{timestamp}.md"
-
-    out_path.write_text(final_memo or "", encoding="utf-8")
+    # ── Save to file (already done during the run unless the memo changed) ─
+    if final_memo != written_memo:
+        out_path.write_text(final_memo or "", encoding="utf-8")
     console.print(f"\n[green]Memo saved to:[/green] {out_path}")
     console.print(f"[dim]Thread ID (use --thread-id to resume): {run_id}[/dim]")
 
@@ -6,6 +6,7 @@ import os
 import re
 import urllib.request
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -125,6 +126,38 @@ STRENGTH_KEYWORDS = {
     "revenue growth", "margin", "cash flow",
 }
 
+# ── Precompiled patterns (hot per-line paths) ────────────────────────────────
+_RE_HTML_TAG = re.compile(r"<[^>]+>")
+_RE_NONWORD = re.compile(r"\W+")
+# XML specials and **bold** in one alternation; *italic* runs as a second pass
+# over the result so its lookarounds see "</b>" rather than the bold's "**"
+# (see _md_inline)
+_RE_ESCAPE_BOLD = re.compile(r"[&<>]|\*\*(.+?)\*\*")
+_RE_ITALIC = re.compile(r"(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)")
+_XML_ESCAPES = {"&": "&amp;", "<": "&lt;", ">": "&gt;"}
+_RE_MARKUP_CHAR = re.compile(r"[&<>*]")  # cheap pre-check: most lines need no rewriting
+# "**Recommendation:**" header or "...recommendation...: INVEST|WATCH|PASS"
+_RE_REC_LINE = re.compile(
+    r"\*\*Recommendation[:\s]\*\*|recommendation.*:\s*(?:INVEST|WATCH|PASS)",
+    re.IGNORECASE,
+)
+_RE_REC_WORD = re.compile(r"\b(INVEST|WATCH|PASS)\b", re.IGNORECASE)
+_RE_TABLE_SEP = re.compile(r"^\|[\s\-:|]+\|$")
+_RE_CHART_REVENUE = re.compile(
+    r'(20\d{2})[^\d]*?(?:매출|revenue)[^\d]*?([\d,]+(?:\.\d+)?)\s*(?:억|백만|B|M)',
+    re.IGNORECASE,
+)
+_RE_CHART_RISK_ROW = re.compile(r'\|\s*([^|]{3,30}?)\s*\|\s*(\d)\s*\|\s*(\d)\s*\|')
+# Bullet classification: keyword alternations scanned in C. _RE_BULLET_KIND
+# finds the leftmost keyword of either kind (risk first on ties), so a plain
+# bullet costs one scan instead of one per category.
+_RE_RISK = re.compile("|".join(map(re.escape, sorted(RISK_KEYWORDS))), re.IGNORECASE)
+_RE_BULLET_KIND = re.compile(
+    f"(?P<BulletRisk>{_RE_RISK.pattern})"
+    f"|(?P<BulletStrength>{'|'.join(map(re.escape, sorted(STRENGTH_KEYWORDS)))})",
+    re.IGNORECASE,
+)
+
 
 def _rec_color(recommendation: str) -> colors.Color:
     rec = (recommendation or "").upper()
@@ -197,6 +230,8 @@ class _CalloutBox(Flowable):
 class _BookmarkDocTemplate(BaseDocTemplate):
     """Extends BaseDocTemplate to add PDF outline (bookmark) entries."""
 
+    _OUTLINE_LEVELS = {"H1": 0, "H2": 1, "H3": 2}
+
     def __init__(self, filename: str, **kw):
         super().__init__(filename, **kw)
         self._bookmark_key_counter: dict[str, int] = {}
@@ -204,15 +239,14 @@ class _BookmarkDocTemplate(BaseDocTemplate):
         self._font_bold = kw.pop("font_bold", "Helvetica-Bold")
 
     def afterFlowable(self, flowable):
+        # Called for every flowable laid out — keep the non-heading path cheap
         if not isinstance(flowable, Paragraph):
             return
-        style_name = flowable.style.name
-        level_map = {"H1": 0, "H2": 1, "H3": 2}
-        level = level_map.get(style_name)
+        level = self._OUTLINE_LEVELS.get(flowable.style.name)
         if level is None:
             return
-        text = re.sub(r"<[^>]+>", "", flowable.getPlainText())
-        key_base = re.sub(r"\W+", "_", text.lower())[:40]
+        text = _RE_HTML_TAG.sub("", flowable.getPlainText())
+        key_base = _RE_NONWORD.sub("_", text.lower())[:40]
         count = self._bookmark_key_counter.get(key_base, 0)
         self._bookmark_key_counter[key_base] = count + 1
         key = f"{key_base}_{count}"
@@ -244,8 +278,11 @@ def _page_footer(canvas, doc):
 
 # ── Style helpers ────────────────────────────────────────────────────────────
 
+@lru_cache(maxsize=4)
 def _build_styles(font_regular: str = "Helvetica",
                   font_bold: str = "Helvetica-Bold") -> dict[str, ParagraphStyle]:
+    """Base styles per font pair, built once and shared — treat as read-only
+    (per-use variants are derived with `parent=` instead of mutating)."""
     base = getSampleStyleSheet()
     styles: dict[str, ParagraphStyle] = {}
 
@@ -340,6 +377,14 @@ def _build_styles(font_regular: str = "Helvetica",
         spaceBefore=10,
         spaceAfter=10,
     )
+    # Recommendation callouts — one per verdict, colored by _rec_bg/_rec_color
+    for rec in ("INVEST", "WATCH", "PASS"):
+        styles[f"Callout{rec}"] = ParagraphStyle(
+            f"Callout{rec}",
+            parent=styles["Callout"],
+            backColor=_rec_bg(rec),
+            textColor=_rec_color(rec),
+        )
     styles["CalloutBody"] = ParagraphStyle(
         "CalloutBody",
         parent=base["Normal"],
@@ -412,12 +457,29 @@ def _build_styles(font_regular: str = "Helvetica",
 
 # ── Inline markdown helper ───────────────────────────────────────────────────
 
+def _escape_bold_sub(m: re.Match) -> str:
+    bold = m.group(1)
+    if bold is None:
+        return _XML_ESCAPES[m.group()]
+    return f"<b>{_RE_ESCAPE_BOLD.sub(_escape_bold_sub, bold)}</b>"  # inner text: escapes only
+
+
 def _md_inline(text: str) -> str:
-    """Escape XML special chars then convert **bold** and *italic* to tags."""
-    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-    text = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text)
-    text = re.sub(r"(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)", r"<i>\1</i>", text)
-    return text
+    """Escape XML special chars and convert **bold** / *italic* to tags (two passes)."""
+    if not _RE_MARKUP_CHAR.search(text):
+        return text
+    text = _RE_ESCAPE_BOLD.sub(_escape_bold_sub, text)
+    return _RE_ITALIC.sub(r"<i>\1</i>", text)
+
+
+def _bullet_style(content: str) -> str:
+    """Style name for a bullet: risk keywords win over strength keywords."""
+    m = _RE_BULLET_KIND.search(content)
+    if m is None:
+        return "Bullet"
+    if m.lastgroup == "BulletStrength" and _RE_RISK.search(content, m.start() + 1):
+        return "BulletRisk"
+    return m.lastgroup
 
 
 def _safe_para(text: str, style: ParagraphStyle) -> Paragraph:
@@ -425,7 +487,7 @@ def _safe_para(text: str, style: ParagraphStyle) -> Paragraph:
     try:
         return Paragraph(text, style)
     except Exception:
-        plain = re.sub(r"<[^>]+>", "", text)
+        plain = _RE_HTML_TAG.sub("", text)
         return Paragraph(plain, style)
 
 
@@ -503,28 +565,72 @@ def _build_table(table_lines: list[str], styles: dict[str, ParagraphStyle],
 
 # ── Markdown parser ──────────────────────────────────────────────────────────
 
-def _parse_markdown(md: str, styles: dict[str, ParagraphStyle],
-                    font_regular: str, font_bold: str,
-                    page_width: float) -> list:
-    """Convert markdown string to a list of ReportLab flowables."""
-    flowables = []
-    lines = md.splitlines()
-    in_code_block = False
-    i = 0
-    avail_width = page_width - 1.8 * inch  # minus margins
+def _md_blocks(md: str):
+    """Yield (kind, payload) per markdown block, skipping fenced code.
 
-    while i < len(lines):
-        line = lines[i]
+    Runs of blockquote (">") or table ("|") lines are yielded once as
+    (marker, [stripped lines]); everything else as ("", line). A
+    recommendation line never opens a run — it renders as a callout.
+    """
+    run_kind, run = "", []
+    in_code_block = False
+    for line in md.splitlines():
+        stripped = line.strip()
+        if run:
+            if stripped.startswith(run_kind):
+                run.append(stripped)
+                continue
+            yield run_kind, run
+            run_kind, run = "", []
 
         # Code fence — skip
-        if line.strip().startswith("```"):
+        if stripped.startswith("```"):
             in_code_block = not in_code_block
-            i += 1
             continue
         if in_code_block:
-            i += 1
             continue
 
+        if stripped[:1] in (">", "|") and not _RE_REC_LINE.search(line):
+            run_kind, run = stripped[0], [stripped]
+            continue
+        yield "", line
+    if run:
+        yield run_kind, run
+
+
+def _parse_markdown(md: str, styles: dict[str, ParagraphStyle],
+                    font_regular: str, font_bold: str,
+                    page_width: float, flowables: list | None = None) -> list:
+    """Convert markdown string to ReportLab flowables.
+
+    Appends to `flowables` (e.g. the document story) when given; returns it.
+    """
+    if flowables is None:
+        flowables = []
+    avail_width = page_width - 1.8 * inch  # minus margins
+
+    for kind, block in _md_blocks(md):
+        # Callout block: lines starting with > (blockquote)
+        if kind == ">":
+            quote_text = _md_inline(" ".join(q.lstrip(">").strip() for q in block))
+            flowables.append(Spacer(1, 4))
+            flowables.append(_CalloutBox(
+                quote_text, styles["CalloutBody"], avail_width,
+            ))
+            flowables.append(Spacer(1, 6))
+            continue
+
+        # Markdown table
+        if kind == "|":
+            table_lines = [t for t in block if not _RE_TABLE_SEP.match(t)]
+            if table_lines:
+                flowables.extend(_build_table(table_lines, styles,
+                                              font_regular, font_bold))
+            continue
+
+        line = block
+        stripped = line.strip()
+
         # H1 — with gold horizontal rule
         if line.startswith("# "):
             text = _md_inline(line[2:].strip())
@@ -533,7 +639,6 @@ def _parse_markdown(md: str, styles: dict[str, ParagraphStyle],
                 width="100%", thickness=2,
                 color=COLOR_SECTION_RULE, spaceAfter=8,
             ))
-            i += 1
             continue
 
         # H2 — with thin gray rule
@@ -544,87 +649,39 @@ def _parse_markdown(md: str, styles: dict[str, ParagraphStyle],
                 width="100%", thickness=0.5,
                 color=COLOR_HR, spaceAfter=4,
             ))
-            i += 1
             continue
 
         # H3
         if line.startswith("### "):
             text = _md_inline(line[4:].strip())
             flowables.append(_safe_para(text, styles["H3"]))
-            i += 1
             continue
 
-        # Recommendation callout line
-        if re.search(r"\*\*Recommendation[:\s]\*\*", line, re.IGNORECASE) or \
-           re.search(r"recommendation.*:\s*(INVEST|WATCH|PASS)", line, re.IGNORECASE):
-            rec_match = re.search(r"\b(INVEST|WATCH|PASS)\b", line, re.IGNORECASE)
-            rec = rec_match.group(1).upper() if rec_match else "WATCH"
-            bg = _rec_bg(rec)
-            fg = _rec_color(rec)
-            style = ParagraphStyle(
-                "CalloutDyn",
-                parent=styles["Callout"],
-                backColor=bg,
-                textColor=fg,
-            )
+        # Recommendation callout line (a header without a verdict renders as text)
+        rec_match = _RE_REC_WORD.search(line) if _RE_REC_LINE.search(line) else None
+        if rec_match:
+            rec = rec_match.group(1).upper()
             flowables.append(Spacer(1, 6))
-            flowables.append(_safe_para(f"Recommendation: {rec}", style))
-            flowables.append(Spacer(1, 6))
-            i += 1
-            continue
-
-        # Callout block: lines starting with > (blockquote)
-        if line.strip().startswith(">"):
-            quote_lines = []
-            while i < len(lines) and lines[i].strip().startswith(">"):
-                quote_lines.append(lines[i].strip().lstrip(">").strip())
-                i += 1
-            quote_text = _md_inline(" ".join(quote_lines))
-            flowables.append(Spacer(1, 4))
-            flowables.append(_CalloutBox(
-                quote_text, styles["CalloutBody"], avail_width,
-            ))
+            flowables.append(_safe_para(f"Recommendation: {rec}", styles[f"Callout{rec}"]))
             flowables.append(Spacer(1, 6))
             continue
 
-        # Markdown table
-        if "|" in line and line.strip().startswith("|"):
-            table_lines = []
-            while i < len(lines) and "|" in lines[i] and lines[i].strip().startswith("|"):
-                stripped = lines[i].strip()
-                if not re.match(r"^\|[\s\-:|]+\|$", stripped):
-                    table_lines.append(stripped)
-                i += 1
-            if table_lines:
-                flowables.extend(_build_table(table_lines, styles,
-                                              font_regular, font_bold))
-            continue
-
         # Bullet
         if line.startswith("- ") or line.startswith("* "):
             content = line[2:].strip()
-            lower = content.lower()
             inline = _md_inline(content)
-            if any(k in lower for k in RISK_KEYWORDS):
-                flowables.append(_safe_para(f"• {inline}", styles["BulletRisk"]))
-            elif any(k in lower for k in STRENGTH_KEYWORDS):
-                flowables.append(_safe_para(f"• {inline}", styles["BulletStrength"]))
-            else:
-                flowables.append(_safe_para(f"• {inline}", styles["Bullet"]))
-            i += 1
+            flowables.append(_safe_para(f"• {inline}", styles[_bullet_style(content)]))
             continue
 
         # Blank line → small spacer
-        if not line.strip():
+        if not stripped:
             flowables.append(Spacer(1, 6))
-            i += 1
             continue
 
         # Plain text
-        text = _md_inline(line.strip())
+        text = _md_inline(stripped)
         if text:
             flowables.append(_safe_para(text, styles["Body"]))
-        i += 1
 
     return flowables
 
@@ -634,8 +691,12 @@ def _parse_markdown(md: str, styles: dict[str, ParagraphStyle],
 def _build_cover(company: str, recommendation: str, styles: dict,
                  page_width: float, page_height: float,
                  language: str = "English",
-                 mode: str = "due-diligence") -> list:
-    """Build a dark navy cover page matching the reference design. Mode-adaptive."""
+                 mode: str = "due-diligence",
+                 flowables: list | None = None) -> list:
+    """Build a dark navy cover page matching the reference design. Mode-adaptive.
+
+    Appends to `flowables` (e.g. the document story) when given; returns it.
+    """
     rec = (recommendation or "").upper()
 
     # Mode-specific cover title
@@ -673,13 +734,14 @@ def _build_cover(company: str, recommendation: str, styles: dict,
     mode_labels = _REC_LABELS.get(mode, _REC_LABELS["due-diligence"])
     rec_label = mode_labels.get(rec, rec) if rec else ""
 
-    # Default recommendation for due-diligence if empty
+    # Due-diligence always shows a badge; a missing verdict reads N/A
     if not rec_label and mode == "due-diligence":
-        rec_label = "CONDITIONAL PROCEED"
+        rec_label = "N/A"
 
     from reportlab.platypus import NextPageTemplate
 
-    flowables: list = []
+    if flowables is None:
+        flowables = []
 
     flowables.append(Spacer(1, 2.2 * inch))
 
@@ -787,10 +849,7 @@ def _generate_charts(report_text: str, output_dir: str) -> list[str]:
         os.makedirs(output_dir, exist_ok=True)
 
         # 1. Revenue trend
-        revenue_years = re.findall(
-            r'(20\d{2})[^\d]*?(?:매출|revenue)[^\d]*?([\d,]+(?:\.\d+)?)\s*(?:억|백만|B|M)',
-            report_text, re.IGNORECASE
-        )
+        revenue_years = _RE_CHART_REVENUE.findall(report_text)
         if len(revenue_years) >= 3:
             years = [int(y[0]) for y in revenue_years]
             vals = [float(y[1].replace(',', '')) for y in revenue_years]
@@ -806,10 +865,7 @@ def _generate_charts(report_text: str, output_dir: str) -> list[str]:
             charts.append(path)
 
         # 2. Risk matrix
-        risk_rows = re.findall(
-            r'\|\s*([^|]{3,30}?)\s*\|\s*(\d)\s*\|\s*(\d)\s*\|',
-            report_text
-        )
+        risk_rows = _RE_CHART_RISK_ROW.findall(report_text)
         risk_data = [
             (r[0].strip(), int(r[1]), int(r[2]))
             for r in risk_rows
@@ -870,10 +926,6 @@ def generate_pdf(state: dict[str, Any], job_id: str, output_dir: str | None = No
     language = state.get("language", "English")
     mode = state.get("mode", "due-diligence")
 
-    # Default recommendation for due-diligence if not set
-    if not recommendation and mode == "due-diligence":
-        recommendation = "WATCH"
-
     if language.lower() == "korean":
         font_regular, font_bold = _setup_korean_fonts()
     else:
@@ -918,18 +970,18 @@ def generate_pdf(state: dict[str, Any], job_id: str, output_dir: str | None = No
     charts_dir = str(reports_dir / f"{job_id}_charts")
     chart_paths = _generate_charts(final_report_md, charts_dir)
 
-    # Cover page
-    story.extend(_build_cover(
+    # Cover page and body are appended straight into the story
+    _build_cover(
         company, recommendation, styles,
-        page_size[0], page_size[1], language, mode,
-    ))
+        page_size[0], page_size[1], language, mode, story,
+    )
 
     # Body: parse markdown report
     if final_report_md.strip():
-        story.extend(_parse_markdown(
+        _parse_markdown(
             final_report_md, styles,
-            font_regular, font_bold, page_size[0],
-        ))
+            font_regular, font_bold, page_size[0], story,
+        )
     else:
         story.append(_safe_para("No report content was generated.", styles["Body"]))
 
@@ -29,7 +29,9 @@ def _rec_color(rec: str) -> RGBColor:
         return COLOR_INVEST
     if "WATCH" in r:
         return COLOR_WATCH
-    return COLOR_PASS
+    if "PASS" in r:
+        return COLOR_PASS
+    return COLOR_MUTED
 
 
 def _safe_str(val: Any, default: str = "N/A") -> str:
@@ -70,7 +72,7 @@ def _add_title_slide(prs: Presentation, company: str, recommendation: str) -> No
     p.alignment = PP_ALIGN.CENTER
 
     # Recommendation badge
-    rec = (recommendation or "WATCH").upper()
+    rec = (recommendation or "N/A").upper()
     txBox = slide.shapes.add_textbox(Inches(3), Inches(4), Inches(4), Inches(0.8))
     tf = txBox.text_frame
     p = tf.paragraphs[0]
@@ -169,7 +171,7 @@ def generate_pptx(state: dict[str, Any], job_id: str, output_dir: str | None = N
     output_path = str(reports_dir / f"{job_id}.pptx")
 
     company = state.get("company_name") or "Unknown Company"
-    recommendation = state.get("recommendation") or "WATCH"
+    recommendation = state.get("recommendation") or "N/A"
 
     prs = Presentation()
     prs.slide_width = Inches(10)
@@ -15,7 +15,6 @@ import uvicorn
 from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
 from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, StreamingResponse
 
-import pdf_report
 from config import validate_config, register_custom_mode, unregister_custom_mode, MODE_REGISTRY
 from graph.workflow import build_graph
 
@@ -74,7 +73,7 @@ def _run_analysis(job_id: str, company: str, url: str, doc_paths: list[str],
     custom_mode_key: str | None = job.get("custom_mode_key")
 
     try:
-        graph = build_graph(mode=mode, use_checkpointing=False)
+        graph = build_graph(mode=mode, use_checkpointing=False)  # cached per built-in mode
         initial_state = {
             "company_name": company,
             "company_url": url or None,
@@ -122,7 +121,6 @@ def _run_analysis(job_id: str, company: str, url: str, doc_paths: list[str],
             "checkpoint_feedback": None,
             "auto_approve": auto_approve,
             # Bookkeeping
-            "messages": [],
             "errors": [],
             "current_phase": "init",
             "language": "English",
@@ -168,8 +166,10 @@ def _run_analysis(job_id: str, company: str, url: str, doc_paths: list[str],
                 # Reset for next checkpoint
                 job["checkpoint_action"] = "proceed"
 
-        # Generate PDF
-        recommendation = merged.get("recommendation") or "WATCH"
+        # Generate PDF (reportlab imported on first use, not at server boot)
+        import pdf_report
+
+        recommendation = merged.get("recommendation")
         pdf_path = pdf_report.generate_pdf(merged, job_id)
 
         verification = merged.get("verification_result") or {}
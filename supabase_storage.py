@@ -5,16 +5,38 @@ Requires SUPABASE_URL and SUPABASE_SERVICE_KEY in environment or Streamlit secre
 """
 from __future__ import annotations
 
+import copy
 import json
 import os
+import threading
 import time
 import logging
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:  # optional speedup — stdlib json is the fallback
+    orjson = None
 
 _client = None
 
 _STALE_JOB_TIMEOUT_SEC = 5400  # 90 minutes
 
 
+def _dumps(obj) -> str:
+    """Serialize to a JSON string (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _loads(text: str | bytes):
+    """Parse a JSON string (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
 def _get_client():
     """Lazy-init singleton Supabase client (service-role key)."""
     global _client
@@ -59,21 +81,105 @@ _JOB_DEFAULTS = {
 }
 
 
-def read_job(job_id: str) -> dict:
-    """Read job state from the jobs table. Auto-expires stale running jobs."""
+# Process-local job cache: job_id → (monotonic fetch time, parsed row).
+# update_job writes through, so in-process writers (the pipeline thread and
+# the UI) always see their own updates; the TTL only bounds how stale a row
+# changed by another process can get. Saves a round-trip + JSON parse on the
+# UI poll loop and the pipeline's per-step cancel checks. Bounded as an LRU —
+# rows carry agent_outputs + final_report, so keep only recently used jobs.
+_JOB_CACHE_TTL_SEC = 5.0
+_JOB_CACHE_MAX_ENTRIES = 32
+_JOB_CACHE: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_JOB_CACHE_LOCK = threading.Lock()
+
+
+def _cache_store(job_id: str, row: dict) -> None:
+    """Insert/refresh a cache entry and evict the least recently used. Hold _JOB_CACHE_LOCK."""
+    _JOB_CACHE[job_id] = (time.monotonic(), row)
+    _JOB_CACHE.move_to_end(job_id)
+    while len(_JOB_CACHE) > _JOB_CACHE_MAX_ENTRIES:
+        _JOB_CACHE.popitem(last=False)
+
+
+def _cached_job(job_id: str) -> dict | None:
+    with _JOB_CACHE_LOCK:
+        hit = _JOB_CACHE.get(job_id)
+        if hit and time.monotonic() - hit[0] < _JOB_CACHE_TTL_SEC:
+            _JOB_CACHE.move_to_end(job_id)
+            return copy.deepcopy(hit[1])
+    return None
+
+
+def _fetch_job(job_id: str) -> dict | None:
+    sb = _get_client()
+    resp = sb.table("jobs").select("*").eq("id", job_id).maybe_single().execute()
+    if not resp.data:
+        return None
+    data = resp.data
+    # JSONB columns come back as dicts/lists already from supabase-py
+    if isinstance(data.get("progress"), str):
+        data["progress"] = _loads(data["progress"])
+    if isinstance(data.get("token_usage"), str):
+        data["token_usage"] = _loads(data["token_usage"])
+    if isinstance(data.get("agent_outputs"), str):
+        data["agent_outputs"] = _loads(data["agent_outputs"])
+    with _JOB_CACHE_LOCK:
+        _cache_store(job_id, copy.deepcopy(data))
+    return data
+
+
+# Columns that change while a run is in flight. agent_outputs/final_report are
+# only written together with a status/checkpoint transition (or after the run
+# completes), so while those are unchanged an expired cache entry can be
+# revalidated with just these columns instead of re-downloading the full row.
+_JOB_LIVE_COLUMNS = ("status,progress,error,start_time,token_usage,"
+                     "checkpoint_phase,checkpoint_feedback")
+_JOB_LIVE_STATUSES = ("queued", "running", "checkpoint")
+
+
+def _revalidate_job(job_id: str) -> dict | None:
+    """Refresh an expired in-flight cache entry from its live columns only."""
+    with _JOB_CACHE_LOCK:
+        hit = _JOB_CACHE.get(job_id)
+        cached = copy.deepcopy(hit[1]) if hit else None
+    if not cached or cached.get("status") not in _JOB_LIVE_STATUSES:
+        return None
     try:
         sb = _get_client()
-        resp = sb.table("jobs").select("*").eq("id", job_id).maybe_single().execute()
-        if resp.data:
-            data = resp.data
-            # JSONB columns come back as dicts/lists already from supabase-py
-            if isinstance(data.get("progress"), str):
-                data["progress"] = json.loads(data["progress"])
-            if isinstance(data.get("token_usage"), str):
-                data["token_usage"] = json.loads(data["token_usage"])
-            if isinstance(data.get("agent_outputs"), str):
-                data["agent_outputs"] = json.loads(data["agent_outputs"])
+        resp = sb.table("jobs").select(_JOB_LIVE_COLUMNS).eq("id", job_id).maybe_single().execute()
+    except Exception:
+        return None  # e.g. optional checkpoint columns missing — do a full fetch
+    live = resp.data
+    if (not live or live.get("status") != cached.get("status")
+            or live.get("checkpoint_phase") != cached.get("checkpoint_phase")):
+        return None
+    for col in ("progress", "token_usage"):
+        if isinstance(live.get(col), str):
+            live[col] = _loads(live[col])
+    cached.update(live)
+    with _JOB_CACHE_LOCK:
+        _cache_store(job_id, copy.deepcopy(cached))
+    return cached
+
 
+def report_files_pending(job: dict) -> bool:
+    """True while a completed job's report files may still be rendering.
+
+    Rows whose optional pdf_status column was stripped (schema mismatch) count
+    as pending until a pdf_path shows up. Either way the wait is bounded by
+    start_time, so a render that died with its process reads as failed.
+    """
+    if job.get("pdf_path") or job.get("pdf_status") not in ("rendering", None):
+        return False
+    start = job.get("start_time") or 0
+    return bool(start) and time.time() - start < _STALE_JOB_TIMEOUT_SEC
+
+
+def read_job(job_id: str) -> dict:
+    """Read job state from the jobs table. Auto-expires stale running jobs."""
+    try:
+        data = _cached_job(job_id) or _revalidate_job(job_id) or _fetch_job(job_id)
+        if data:
             # Auto-expire stale jobs
             if data.get("status") in ("running", "queued"):
                 start = data.get("start_time") or 0
@@ -83,43 +189,67 @@ def read_job(job_id: str) -> dict:
                         "Analysis timed out or the server was restarted mid-run. "
                         "Please submit again."
                     )
+            elif data.get("pdf_status") == "rendering" and not report_files_pending(data):
+                data["pdf_status"] = "failed"
             return data
     except Exception as exc:
         logging.warning("read_job failed for job: %s", exc)
     return dict(_JOB_DEFAULTS)
 
 
+def read_job_status(job_id: str) -> str | None:
+    """Return only the job's status, without fetching or parsing the full row.
+
+    The pipeline thread is the sole writer of progress/token_usage/agent_outputs
+    and already holds them in memory — it only needs to poll for UI-driven
+    status changes (cancel/approve).
+    """
+    with _JOB_CACHE_LOCK:
+        hit = _JOB_CACHE.get(job_id)
+        if hit and time.monotonic() - hit[0] < _JOB_CACHE_TTL_SEC:
+            return hit[1].get("status")  # read in place — no need to copy the row
+    try:
+        sb = _get_client()
+        resp = sb.table("jobs").select("status").eq("id", job_id).maybe_single().execute()
+        if resp.data:
+            return resp.data.get("status")
+    except Exception as exc:
+        logging.warning("read_job_status failed for job: %s", exc)
+    return None
+
+
 _JOBS_KNOWN_COLUMNS = {
     "id", "status", "progress", "error", "start_time", "pdf_path",
     "recommendation", "final_report", "token_usage", "company",
     "pptx_path", "docx_path", "agent_outputs",
-    "checkpoint_phase", "checkpoint_feedback",
+    "checkpoint_phase", "checkpoint_feedback", "pdf_status",
 }
 
 
-def update_job(job_id: str, updates: dict) -> None:
-    """Upsert job state into the jobs table."""
-    sb = _get_client()
-    row = {"id": job_id}
-    row.update(updates)
+def _cache_merge(job_id: str, updates: dict) -> None:
+    """Apply a successful write to the cached row (if we hold one)."""
+    with _JOB_CACHE_LOCK:
+        hit = _JOB_CACHE.get(job_id)
+        if hit:
+            hit[1].update(copy.deepcopy(updates))
+            _cache_store(job_id, hit[1])
 
-    # Ensure JSONB fields are serialized properly
-    for key in ("progress", "token_usage", "agent_outputs"):
-        if key in row and not isinstance(row[key], str):
-            row[key] = json.dumps(row[key], ensure_ascii=False)
 
+def _upsert_job_row(sb, job_id: str, row: dict, updates: dict) -> None:
+    """Upsert one jobs row, retrying without optional columns on schema errors."""
     try:
         sb.table("jobs").upsert(row, on_conflict="id").execute()
+        _cache_merge(job_id, updates)
     except Exception as first_err:
         err_msg = str(first_err).lower()
         # Only strip columns if the error is column-related (schema mismatch)
         if "column" in err_msg or "schema" in err_msg or "could not find" in err_msg:
             optional_cols = ["agent_outputs", "docx_path", "pptx_path", "company",
-                             "checkpoint_phase", "checkpoint_feedback"]
-            for col in optional_cols:
-                row.pop(col, None)
+                             "checkpoint_phase", "checkpoint_feedback", "pdf_status"]
+            row = {k: v for k, v in row.items() if k not in optional_cols}
             try:
                 sb.table("jobs").upsert(row, on_conflict="id").execute()
+                _cache_merge(job_id, {k: v for k, v in updates.items() if k not in optional_cols})
                 return
             except Exception:
                 pass
@@ -127,11 +257,49 @@ def update_job(job_id: str, updates: dict) -> None:
         raise
 
 
+_DURABLE_WRITE_ATTEMPTS = 3
+
+
+def update_job(job_id: str, updates: dict, durable: bool = False) -> None:
+    """Upsert job state into the jobs table.
+
+    Progress ticks are best-effort: every tick resends the full progress list,
+    so a failed write is logged and the next one catches up. Durable writes —
+    any status transition, and the terminal complete/error write — are retried
+    with backoff and re-raised if they still fail.
+    """
+    durable = durable or "status" in updates
+    sb = _get_client()
+    row = {"id": job_id}
+    row.update(updates)
+
+    # Ensure JSONB fields are serialized properly
+    for key in ("progress", "token_usage", "agent_outputs"):
+        if key in row and not isinstance(row[key], str):
+            row[key] = _dumps(row[key])
+
+    attempts = _DURABLE_WRITE_ATTEMPTS if durable else 1
+    for attempt in range(attempts):
+        try:
+            _upsert_job_row(sb, job_id, row, updates)
+            return
+        except Exception as exc:
+            if not durable:
+                logging.warning("update_job progress write skipped for %s: %s", job_id, exc)
+                return
+            if attempt == attempts - 1:
+                raise
+            time.sleep(0.5 * 2 ** attempt)
+
+
+_ACTIVE_STATUSES = ["running", "queued", "checkpoint", "approved"]
+
+
 def load_queue() -> list[dict]:
     """Load all active jobs (running/queued/checkpoint/approved)."""
     try:
         sb = _get_client()
-        _active = ["running", "queued", "checkpoint", "approved"]
+        _active = _ACTIVE_STATUSES
         # Try with company column; fall back without it if column doesn't exist yet
         try:
             resp = (
@@ -152,27 +320,36 @@ def load_queue() -> list[dict]:
         rows = resp.data or []
         for row in rows:
             if isinstance(row.get("progress"), str):
-                row["progress"] = json.loads(row["progress"])
+                row["progress"] = _loads(row["progress"])
             if isinstance(row.get("token_usage"), str):
-                row["token_usage"] = json.loads(row["token_usage"])
+                row["token_usage"] = _loads(row["token_usage"])
         return rows
     except Exception:
         return []
 
 
 def cleanup_stale_jobs() -> int:
-    """Cancel all running/queued/checkpoint jobs (used on app startup after reboot)."""
+    """Cancel all running/queued/checkpoint jobs (used on app startup after reboot).
+
+    Also fails report renders orphaned by the restart, so their results
+    screens stop waiting for a PDF.
+    """
     try:
         sb = _get_client()
+        # One set-based UPDATE instead of a select plus one round-trip per job
         resp = (
             sb.table("jobs")
-            .select("id")
-            .in_("status", ["running", "queued", "checkpoint", "approved"])
+            .update({"status": "cancelled"})
+            .in_("status", _ACTIVE_STATUSES)
             .execute()
         )
         rows = resp.data or []
-        for row in rows:
-            sb.table("jobs").update({"status": "cancelled"}).eq("id", row["id"]).execute()
+        try:
+            sb.table("jobs").update({"pdf_status": "failed"}).eq("pdf_status", "rendering").execute()
+        except Exception:
+            pass  # optional pdf_status column missing
+        with _JOB_CACHE_LOCK:
+            _JOB_CACHE.clear()
         return len(rows)
     except Exception:
         return 0
@@ -180,25 +357,53 @@ def cleanup_stale_jobs() -> int:
 
 # ── History ──────────────────────────────────────────────────────────────────
 
+# History is append-only from this process's point of view: save_history_entry
+# adds its entry to the cached list instead of forcing a full re-query, and
+# the TTL picks up entries written by other processes. The cache is kept
+# oldest-first so saving a new entry is an append; load_history reverses
+# its copy. A re-saved id replaces its cached row in place.
+_HISTORY_CACHE_TTL_SEC = 30.0
+_history_cache: tuple[float, list[dict]] | None = None
+_HISTORY_LOCK = threading.Lock()
+
+
 def load_history() -> list[dict]:
     """Load all history entries, newest first."""
+    global _history_cache
+    with _HISTORY_LOCK:
+        if _history_cache and time.monotonic() - _history_cache[0] < _HISTORY_CACHE_TTL_SEC:
+            return _history_cache[1][::-1]
     try:
         sb = _get_client()
         resp = (
             sb.table("history")
             .select("*")
-            .order("created_at", desc=True)
+            .order("created_at", desc=False)
             .execute()
         )
-        return resp.data or []
+        rows = resp.data or []
     except Exception:
         return []
+    with _HISTORY_LOCK:
+        _history_cache = (time.monotonic(), rows)
+    return rows[::-1]
 
 
 def save_history_entry(entry: dict) -> None:
-    """Insert a new history entry."""
+    """Insert or update a history entry (keyed on id)."""
     sb = _get_client()
-    sb.table("history").upsert(entry, on_conflict="id").execute()
+    resp = sb.table("history").upsert(entry, on_conflict="id").execute()
+    # The returned row carries the server-side created_at the full load sorts on
+    row = dict((resp.data or [entry])[0])
+    with _HISTORY_LOCK:
+        if _history_cache:
+            rows = _history_cache[1]
+            for i, cached in enumerate(rows):
+                if cached.get("id") == row.get("id"):
+                    rows[i] = row  # upsert keeps created_at, so the position holds
+                    break
+            else:
+                rows.append(row)
 
 
 # ── File storage ─────────────────────────────────────────────────────────────
@@ -4,12 +4,23 @@ from __future__ import annotations
 import json
 from typing import Any
 
-import edgar
-
 from config import EDGAR_USER_AGENT
 
-# Set user agent once at import time
-edgar.set_identity(EDGAR_USER_AGENT)
+_edgar = None
+
+
+def _get_edgar():
+    """Import edgartools on first SEC call, not when the agents are imported.
+
+    It pulls in a heavy pandas/pyarrow stack that only US-listed companies
+    ever use. The user agent is set once, on that first import.
+    """
+    global _edgar
+    if _edgar is None:
+        import edgar
+        edgar.set_identity(EDGAR_USER_AGENT)
+        _edgar = edgar
+    return _edgar
 
 
 def get_sec_filings(ticker: str, form_type: str = "10-K", count: int = 3) -> list[dict[str, Any]]:
@@ -24,7 +35,7 @@ def get_sec_filings(ticker: str, form_type: str = "10-K", count: int = 3) -> lis
         List of dicts with keys: form, filed, period, description, text_excerpt.
     """
     try:
-        company = edgar.Company(ticker)
+        company = _get_edgar().Company(ticker)
         filings = company.get_filings(form=form_type).latest(count)
         results = []
         for filing in filings:
@@ -60,7 +71,7 @@ def get_company_facts(ticker: str) -> dict[str, Any]:
     Returns a dict with company info and available financial concepts.
     """
     try:
-        company = edgar.Company(ticker)
+        company = _get_edgar().Company(ticker)
         facts: dict[str, Any] = {
             "name": company.name,
             "cik": company.cik,
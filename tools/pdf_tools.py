@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import json
+import os
+from functools import lru_cache
 from typing import Any
 
 import fitz  # PyMuPDF
@@ -10,6 +12,16 @@ import fitz  # PyMuPDF
 _MAX_TEXT_CHARS = 18_000  # keep under the 20K tool result cap in base.py
 
 
+@lru_cache(maxsize=8)
+def _page_texts(file_path: str, size: int, mtime_ns: int) -> tuple[str, ...]:
+    """Per-page text, parsed once per file version and shared across agents/calls."""
+    doc = fitz.open(file_path)
+    try:
+        return tuple(page.get_text() for page in doc)
+    finally:
+        doc.close()
+
+
 def extract_pdf_text(file_path: str, page_range: str | None = None) -> dict[str, Any]:
     """Extract text from a PDF file.
 
@@ -24,54 +36,51 @@ def extract_pdf_text(file_path: str, page_range: str | None = None) -> dict[str,
         to call again with page_range for remaining pages.
     """
     try:
-        doc = fitz.open(file_path)
-        try:
-            total_pages = len(doc)
-
-            # Parse page range
-            pages_to_extract: list[int]
-            if page_range is None:
-                pages_to_extract = list(range(total_pages))
-            else:
-                pages_to_extract = _parse_page_range(page_range, total_pages)
-
-            texts = []
-            last_extracted = 0
-            total_chars = 0
-            for page_num in pages_to_extract:
-                if 0 <= page_num < total_pages:
-                    page = doc[page_num]
-                    page_text = f"[Page {page_num + 1}]\n{page.get_text()}"
-                    if total_chars + len(page_text) > _MAX_TEXT_CHARS and texts:
-                        # Would exceed limit — stop here and warn
-                        remaining_start = page_num + 1  # 0-indexed
-                        remaining_end = pages_to_extract[-1] + 1
-                        return {
-                            "file": file_path,
-                            "total_pages": total_pages,
-                            "extracted_pages": [p + 1 for p in pages_to_extract[:len(texts)]],
-                            "text": "\n\n".join(texts),
-                            "warning": (
-                                f"DOCUMENT TOO LARGE — only extracted pages 1-{page_num}. "
-                                f"Pages {remaining_start + 1}-{remaining_end} were NOT read. "
-                                f"You MUST call extract_pdf_text again with "
-                                f"page_range=\"{remaining_start + 1}-{remaining_end}\" "
-                                f"to read the remaining pages. Do NOT skip them — they may "
-                                f"contain critical data (investment rounds, valuations, etc.)."
-                            ),
-                        }
-                    texts.append(page_text)
-                    total_chars += len(page_text)
-                    last_extracted = page_num
-
-            return {
-                "file": file_path,
-                "total_pages": total_pages,
-                "extracted_pages": [p + 1 for p in pages_to_extract],
-                "text": "\n\n".join(texts),
-            }
-        finally:
-            doc.close()
+        st = os.stat(file_path)
+        page_texts = _page_texts(file_path, st.st_size, st.st_mtime_ns)
+        total_pages = len(page_texts)
+
+        # Parse page range
+        pages_to_extract: list[int]
+        if page_range is None:
+            pages_to_extract = list(range(total_pages))
+        else:
+            pages_to_extract = _parse_page_range(page_range, total_pages)
+
+        texts = []
+        last_extracted = 0
+        total_chars = 0
+        for page_num in pages_to_extract:
+            if 0 <= page_num < total_pages:
+                page_text = f"[Page {page_num + 1}]\n{page_texts[page_num]}"
+                if total_chars + len(page_text) > _MAX_TEXT_CHARS and texts:
+                    # Would exceed limit — stop here and warn
+                    remaining_start = page_num + 1  # 0-indexed
+                    remaining_end = pages_to_extract[-1] + 1
+                    return {
+                        "file": file_path,
+                        "total_pages": total_pages,
+                        "extracted_pages": [p + 1 for p in pages_to_extract[:len(texts)]],
+                        "text": "\n\n".join(texts),
+                        "warning": (
+                            f"DOCUMENT TOO LARGE — only extracted pages 1-{page_num}. "
+                            f"Pages {remaining_start + 1}-{remaining_end} were NOT read. "
+                            f"You MUST call extract_pdf_text again with "
+                            f"page_range=\"{remaining_start + 1}-{remaining_end}\" "
+                            f"to read the remaining pages. Do NOT skip them — they may "
+                            f"contain critical data (investment rounds, valuations, etc.)."
+                        ),
+                    }
+                texts.append(page_text)
+                total_chars += len(page_text)
+                last_extracted = page_num
+
+        return {
+            "file": file_path,
+            "total_pages": total_pages,
+            "extracted_pages": [p + 1 for p in pages_to_extract],
+            "text": "\n\n".join(texts),
+        }
     except Exception as e:
         return {"file": file_path, "error": str(e)}
 
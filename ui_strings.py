@@ -0,0 +1,197 @@
+"""UI strings for the Streamlit app (English + Korean).
+
+Kept out of app.py so the tables are built once per process on import
+instead of on every Streamlit rerun.
+"""
+from types import MappingProxyType, SimpleNamespace
+
+# ── UI Translations ────────────────────────────────────────────────────────────
+
+_UI_SOURCE = {
+    "en": {
+        "app_title":            "## 📊 Due Diligence Agent",
+        "app_subtitle":         "Submit a company → 15 AI agents analyze it in 4 phases → human review at every stage → full investment memo + PDF",
+        "history_btn":          "🕐 History",
+        "form_heading":         "#### Submit a Company",
+        "company_label":        "Company Name",
+        "company_placeholder":  "e.g. Apple, OpenAI, Stripe",
+        "url_label":            "Website URL *(optional — improves research quality)*",
+        "url_placeholder":      "https://example.com",
+        "report_lang_label":    "Report Language",
+        "docs_label":           "Supporting Documents *(optional)*",
+        "docs_help":            "Pitch decks, 10-Ks, annual reports, etc.",
+        "cost_caption":         "Typical cost: **$1 – $5 per analysis** · 15 agents · claude-sonnet-4-6 · $3/M input · $15/M output",
+        "run_btn":              "🔍  Run Due Diligence",
+        "pipeline_heading":     "#### Agent Pipeline Flow",
+        "pipeline_caption":     "Each phase pauses for **human review** (pink octagons) before proceeding. Orchestrator scores agents, revises weak ones (red dashed).",
+        "directory_heading":    "#### Agent Directory",
+        "directory_caption":    "Click any agent to see its methodology and data sources.",
+        "analyzing":            "## 📊 Analyzing {}…",
+        "running_caption":      "Running in the background — you can navigate away and come back at any time.",
+        "api_cost":             "**API cost so far: ${cost:.4f}**  ·  {inp:,} input tokens  ·  {out:,} output tokens  ·  Pricing: $3/M input · $15/M output (claude-sonnet-4-6)",
+        "queued_heading":       "## 📊 {} — Queued",
+        "queued_caption":       "Two analyses are already running. Yours will start automatically when a slot opens.",
+        "queued_info":          "**Your analysis is in the queue.**\n\nThe server allows 2 simultaneous analyses to avoid API rate limits. You're **#{}** in line — this page will update automatically when it starts.",
+        "waiting_caption":      "Waiting… {}s in queue",
+        "analysis_failed":      "**Analysis failed:** {}",
+        "try_again_btn":        "← Try Again",
+        "invest_desc":          "Strong investment opportunity with compelling fundamentals.",
+        "watch_desc":           "Interesting opportunity — monitor for further developments.",
+        "pass_desc":            "Risks outweigh opportunities at this time.",
+        "download_btn":         "⬇️  Download PDF Report",
+        "analyze_another_btn":  "🔄  Analyze Another Company",
+        "pdf_rendering":        "⏳ Preparing PDF…",
+        "token_expander":       "Token Usage & Cost  —  **${:.4f} total**",
+        "token_caption":        "Pricing: claude-sonnet-4-6 · $3.00 / 1M input tokens · $15.00 / 1M output tokens",
+        "no_report":            "No report content was generated.",
+        "agent_col":            "Agent",
+        "input_tokens_col":     "Input tokens",
+        "output_tokens_col":    "Output tokens",
+        "cost_col":             "Cost (USD)",
+        "total_label":          "**TOTAL**",
+        "history_title":        "## 🕐 Analysis History",
+        "history_caption":      "All due diligence reports generated so far.",
+        "back_btn":             "← Back",
+        "back_running_btn":     "← Back to Running Analysis",
+        "no_history":           "No analyses yet. Submit a company on the main page to get started.",
+        "pdf_btn":              "⬇️ PDF",
+        "pdf_unavail":          "PDF unavailable",
+        "pdf_prepare_btn":      "📄 Get PDF",
+        "password_label":       "Password",
+        "password_placeholder": "Enter password to continue",
+        "unlock_btn":           "Unlock",
+        "wrong_password":       "Incorrect password.",
+        "lang_toggle":          "한국어",
+        "step_done":            "✓",
+        "step_running":         "⏳",
+        "progress_text":        "**{pct}%** — step {done} of {total}  ·  elapsed {elapsed}  ·  {eta}",
+        "eta_estimating":       "Estimating…",
+        "eta_remaining":        "~{} remaining",
+        "queue_heading":        "#### Active Analyses",
+        "queue_empty":          "No analyses running.",
+        "queue_status_running": "Running",
+        "queue_status_queued":  "Queued",
+        "queue_view_btn":       "View",
+        "queue_progress":       "{}%",
+        "queue_eta":            "~{} left",
+        "queue_started":        "Started {}s ago",
+        "back_to_form_btn":     "← Back to Form",
+        "job_picker_label":     "Switch analysis:",
+        "agent_outputs_heading":"📊 Agent Outputs",
+        "no_agent_outputs":     "No individual agent outputs available for this analysis.",
+        "view_details_btn":     "📄 Details",
+        "auto_approve_label":   "Skip human review (auto-approve all phases)",
+        "auto_approve_help":    "When checked, the pipeline runs straight through without pausing for review.",
+        "checkpoint_heading":   "🔍 {} — Review Required",
+        "checkpoint_phase1_title": "Phase 1 Complete: Research & Analysis",
+        "checkpoint_phase1_desc":  "6 research agents have finished. Review their outputs below before proceeding to synthesis.",
+        "checkpoint_phase2_title": "Phase 2 Complete: Synthesis",
+        "checkpoint_phase2_desc":  "R&A Synthesis, Risk Assessment, and Strategic Insight are complete. Review before proceeding to critique.",
+        "checkpoint_phase3_title": "Phase 3 Complete: Review & Critique",
+        "checkpoint_phase3_desc":  "Review, Critique, and DD Questions are complete. Review before generating the final report.",
+        "checkpoint_paused":       "⏸ Paused — awaiting review",
+        "checkpoint_feedback_label":      "Feedback (optional)",
+        "checkpoint_feedback_placeholder": "Add notes or adjustments for the next phase…",
+        "checkpoint_approve_btn":  "✅ Approve & Continue",
+        "checkpoint_cancel_btn":   "⛔ Cancel Analysis",
+    },
+    "ko": {
+        "app_title":            "## 📊 실사 에이전트",
+        "app_subtitle":         "기업을 입력하면 → AI 에이전트 15개가 4단계로 분석 → 매 단계 사람이 검토 → 투자 메모 + PDF 완성",
+        "history_btn":          "🕐 분석 기록",
+        "form_heading":         "#### 기업 분석 요청",
+        "company_label":        "기업명",
+        "company_placeholder":  "예: Apple, OpenAI, 카카오",
+        "url_label":            "공식 웹사이트 *(선택 — 분석 품질 향상)*",
+        "url_placeholder":      "https://example.com",
+        "report_lang_label":    "보고서 언어",
+        "docs_label":           "참고 문서 *(선택)*",
+        "docs_help":            "사업계획서, 10-K, 연간보고서 등 PDF",
+        "cost_caption":         "예상 비용: **분석당 $1 – $5** · 에이전트 15개 · claude-sonnet-4-6 · 입력 $3/M · 출력 $15/M",
+        "run_btn":              "🔍  실사 분석 시작",
+        "pipeline_heading":     "#### 에이전트 파이프라인",
+        "pipeline_caption":     "매 단계마다 **사람의 리뷰**(분홍 팔각형)를 거친 후 다음 단계로 진행. 오케스트레이터가 점수 평가 후 약한 에이전트 재실행(빨간 점선).",
+        "directory_heading":    "#### 에이전트 목록",
+        "directory_caption":    "에이전트를 클릭하면 분석 방법론과 데이터 소스를 확인할 수 있습니다.",
+        "analyzing":            "## 📊 {} 분석 중…",
+        "running_caption":      "백그라운드에서 실행 중 — 페이지를 벗어났다가 언제든 돌아올 수 있습니다.",
+        "api_cost":             "**현재 API 비용: ${cost:.4f}**  ·  입력 토큰 {inp:,}개  ·  출력 토큰 {out:,}개  ·  가격: 입력 $3/M · 출력 $15/M (claude-sonnet-4-6)",
+        "queued_heading":       "## 📊 {} — 대기 중",
+        "queued_caption":       "현재 2개의 분석이 실행 중입니다. 슬롯이 열리면 자동으로 시작됩니다.",
+        "queued_info":          "**분석이 대기열에 있습니다.**\n\nAPI 속도 제한을 방지하기 위해 서버는 최대 2개의 동시 분석을 허용합니다. 현재 대기 순번은 **{}번**입니다 — 시작되면 이 페이지가 자동으로 업데이트됩니다.",
+        "waiting_caption":      "대기 중… {}초 경과",
+        "analysis_failed":      "**분석 실패:** {}",
+        "try_again_btn":        "← 다시 시도",
+        "invest_desc":          "강력한 투자 기회 — 탄탄한 펀더멘털을 보유하고 있습니다.",
+        "watch_desc":           "흥미로운 기회 — 추가 동향을 모니터링하세요.",
+        "pass_desc":            "현재 시점에서 리스크가 기회를 초과합니다.",
+        "download_btn":         "⬇️  PDF 보고서 다운로드",
+        "analyze_another_btn":  "🔄  다른 기업 분석",
+        "pdf_rendering":        "⏳ PDF 생성 중…",
+        "token_expander":       "토큰 사용량 & 비용  —  **총 ${:.4f}**",
+        "token_caption":        "가격: claude-sonnet-4-6 · 입력 $3.00 / 1M 토큰 · 출력 $15.00 / 1M 토큰",
+        "no_report":            "생성된 보고서 내용이 없습니다.",
+        "agent_col":            "에이전트",
+        "input_tokens_col":     "입력 토큰",
+        "output_tokens_col":    "출력 토큰",
+        "cost_col":             "비용 (USD)",
+        "total_label":          "**합계**",
+        "history_title":        "## 🕐 분석 기록",
+        "history_caption":      "지금까지 생성된 모든 실사 보고서",
+        "back_btn":             "← 뒤로",
+        "back_running_btn":     "← 진행 중인 분석으로 돌아가기",
+        "no_history":           "아직 분석 내역이 없습니다. 메인 페이지에서 기업을 입력하여 시작하세요.",
+        "pdf_btn":              "⬇️ PDF",
+        "pdf_unavail":          "PDF 없음",
+        "pdf_prepare_btn":      "📄 PDF 받기",
+        "password_label":       "비밀번호",
+        "password_placeholder": "비밀번호를 입력하세요",
+        "unlock_btn":           "잠금 해제",
+        "wrong_password":       "비밀번호가 올바르지 않습니다.",
+        "lang_toggle":          "English",
+        "step_done":            "✓",
+        "step_running":         "⏳",
+        "progress_text":        "**{pct}%** — {done}/{total}단계  ·  경과 {elapsed}  ·  {eta}",
+        "eta_estimating":       "예상 중…",
+        "eta_remaining":        "~{} 남음",
+        "queue_heading":        "#### 진행 중인 분석",
+        "queue_empty":          "진행 중인 분석이 없습니다.",
+        "queue_status_running": "실행 중",
+        "queue_status_queued":  "대기 중",
+        "queue_view_btn":       "보기",
+        "queue_progress":       "{}%",
+        "queue_eta":            "~{} 남음",
+        "queue_started":        "{}초 전 시작",
+        "back_to_form_btn":     "← 입력 폼으로",
+        "job_picker_label":     "분석 전환:",
+        "agent_outputs_heading":"📊 에이전트 출력",
+        "no_agent_outputs":     "이 분석에 대한 개별 에이전트 출력이 없습니다.",
+        "view_details_btn":     "📄 상세",
+        "auto_approve_label":   "자동 승인 (단계별 리뷰 건너뛰기)",
+        "auto_approve_help":    "체크하면 리뷰 없이 전체 파이프라인이 자동으로 실행됩니다.",
+        "checkpoint_heading":   "🔍 {} — 리뷰 필요",
+        "checkpoint_phase1_title": "1단계 완료: 리서치 & 분석",
+        "checkpoint_phase1_desc":  "6개 리서치 에이전트가 완료되었습니다. 아래 결과를 검토한 후 종합 단계로 진행하세요.",
+        "checkpoint_phase2_title": "2단계 완료: 종합",
+        "checkpoint_phase2_desc":  "R&A 종합, 리스크 평가, 전략적 인사이트가 완료되었습니다. 비평 단계 진행 전 검토하세요.",
+        "checkpoint_phase3_title": "3단계 완료: 검토 & 비평",
+        "checkpoint_phase3_desc":  "검토, 비평, DD 질문서가 완료되었습니다. 최종 보고서 생성 전 검토하세요.",
+        "checkpoint_paused":       "⏸ 일시정지 — 리뷰 대기 중",
+        "checkpoint_feedback_label":      "피드백 (선택)",
+        "checkpoint_feedback_placeholder": "다음 단계를 위한 메모나 조정 사항을 입력하세요…",
+        "checkpoint_approve_btn":  "✅ 승인 & 계속",
+        "checkpoint_cancel_btn":   "⛔ 분석 취소",
+    },
+}
+
+
+# Read-only per-language tables with the English fallbacks merged in up front,
+# so t() resolves a key with a single lookup.
+UI_STRINGS = MappingProxyType({
+    lang: MappingProxyType({**_UI_SOURCE["en"], **{k: v for k, v in strings.items() if v}})
+    for lang, strings in _UI_SOURCE.items()
+})
+
+# Attribute-access views of the same tables (``ui.run_btn``) for the render
+# code; t() stays for strings that need .format() arguments.
+UI_NS = MappingProxyType({lang: SimpleNamespace(**strings) for lang, strings in UI_STRINGS.items()})